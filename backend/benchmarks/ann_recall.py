@@ -0,0 +1,120 @@
+"""
+Recall-vs-latency report for the pgvector ANN index against exact search.
+
+Samples stored embeddings as queries, computes the exact top-k with index scans disabled,
+then replays the same queries through the ANN index for each ef_search (HNSW) or
+probes (IVFFlat) value and reports recall@k with p50/p95 latency.
+
+Usage:
+    python benchmarks/ann_recall.py --queries 100 --k 10 --values 10,20,40,80,160
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from dudoxx.database.pgvector.database import SessionLocal, close_pgvector, get_settings
+from dudoxx.database.pgvector.models import Document
+
+
+async def sample_queries(db: AsyncSession, count: int) -> List[Tuple[Optional[str], List[float]]]:
+    rows = (
+        await db.execute(select(Document.context_id, Document.embedding).order_by(func.random()).limit(count))
+    ).all()
+    return [(context_id, list(embedding)) for context_id, embedding in rows]
+
+
+async def top_k(db: AsyncSession, embedding: Sequence[float], k: int, context_id: Optional[str]) -> Set[int]:
+    stmt = select(Document.id).order_by(Document.embedding.cosine_distance(embedding)).limit(k)
+    if context_id:
+        stmt = stmt.where(Document.context_id == context_id)
+    return set((await db.execute(stmt)).scalars().all())
+
+
+async def exact_top_k(
+    db: AsyncSession, embedding: Sequence[float], k: int, context_id: Optional[str]
+) -> Tuple[Set[int], float]:
+    start = time.perf_counter()
+    await db.execute(text("SET LOCAL enable_indexscan = off"))
+    ids = await top_k(db, embedding, k, context_id)
+    elapsed = time.perf_counter() - start
+    await db.rollback()
+    return ids, elapsed
+
+
+async def ann_top_k(
+    db: AsyncSession, setting: str, value: int, embedding: Sequence[float], k: int, context_id: Optional[str]
+) -> Tuple[Set[int], float]:
+    start = time.perf_counter()
+    await db.execute(text("SELECT set_config(:name, :value, true)"), {"name": setting, "value": str(value)})
+    ids = await top_k(db, embedding, k, context_id)
+    elapsed = time.perf_counter() - start
+    await db.rollback()
+    return ids, elapsed
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    index_type = get_settings().PGVECTOR_INDEX_TYPE.lower()
+    if index_type not in ("hnsw", "ivfflat"):
+        raise SystemExit("PGVECTOR_INDEX_TYPE must be hnsw or ivfflat to compare against exact search")
+    setting = "hnsw.ef_search" if index_type == "hnsw" else "ivfflat.probes"
+    values = [int(v) for v in args.values.split(",")]
+
+    async with SessionLocal() as db:
+        queries = await sample_queries(db, args.queries)
+        if not queries:
+            raise SystemExit("documents table is empty")
+
+        exact: List[Set[int]] = []
+        exact_latency: List[float] = []
+        for context_id, embedding in queries:
+            ids, elapsed = await exact_top_k(db, embedding, args.k, None if args.no_context else context_id)
+            exact.append(ids)
+            exact_latency.append(elapsed)
+
+        print(f"{len(queries)} queries, k={args.k}, index={index_type}")
+        print(f"{'setting':<22}{'recall@k':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        print(
+            f"{'exact':<22}{1.0:>10.3f}"
+            f"{percentile(exact_latency, 0.5) * 1000:>10.2f}{percentile(exact_latency, 0.95) * 1000:>10.2f}"
+        )
+
+        for value in values:
+            recalls: List[float] = []
+            latency: List[float] = []
+            for (context_id, embedding), truth in zip(queries, exact):
+                ids, elapsed = await ann_top_k(
+                    db, setting, value, embedding, args.k, None if args.no_context else context_id
+                )
+                latency.append(elapsed)
+                if truth:
+                    recalls.append(len(ids & truth) / len(truth))
+            print(
+                f"{f'{setting}={value}':<22}{statistics.mean(recalls):>10.3f}"
+                f"{percentile(latency, 0.5) * 1000:>10.2f}{percentile(latency, 0.95) * 1000:>10.2f}"
+            )
+    await close_pgvector()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--values", default="10,20,40,80,160", help="ef_search or probes values to sweep")
+    parser.add_argument("--no-context", action="store_true", help="search the whole table instead of per context")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Micro-benchmark of the chunking strategies on a large synthetic document.
+
+Compares the previous word-by-word packing loop with the character, token and
+structure chunkers, feeding the document page by page as ingestion does.
+
+Usage:
+    python benchmarks/chunking.py --pages 2000 --words-per-page 500
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List, Tuple
+
+from dudoxx.pgvector_rag.chunking import get_chunker
+
+
+def legacy_chunk_text(text: str, chunk_size: int = 1000) -> List[str]:
+    """The word-packing loop that RAGService._chunk_text used to run."""
+    words = text.split()
+    chunks = []
+    current_chunk = []
+    current_size = 0
+
+    for word in words:
+        word_size = len(word) + 1
+        if current_size + word_size > chunk_size:
+            if current_chunk:
+                chunks.append(" ".join(current_chunk))
+            current_chunk = [word]
+            current_size = word_size
+        else:
+            current_chunk.append(word)
+            current_size += word_size
+
+    if current_chunk:
+        chunks.append(" ".join(current_chunk))
+
+    return chunks
+
+
+def make_pages(pages: int, words_per_page: int) -> List[List[Tuple[str, str]]]:
+    rng = random.Random(0)
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 11))) for _ in range(5000)
+    ]
+    document = []
+    for page in range(pages):
+        blocks = [("section_header", f"Section {page}")]
+        for _ in range(5):
+            blocks.append(("text", " ".join(rng.choices(vocabulary, k=words_per_page // 5)) + "."))
+        document.append(blocks)
+    return document
+
+
+def timed(run: Callable[[], int]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    count = run()
+    return time.perf_counter() - start, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--words-per-page", type=int, default=500)
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages, args.words_per_page)
+    text = "\n".join("\n".join(text for _, text in blocks) for blocks in pages)
+    print(f"{args.pages} pages, {len(text) / 1e6:.1f} MB of text")
+
+    def streamed(strategy: str, size: int, overlap: int) -> Callable[[], int]:
+        def run() -> int:
+            chunker = get_chunker(strategy, size, overlap)
+            count = 0
+            for page_no, blocks in enumerate(pages, start=1):
+                count += sum(1 for _ in chunker.feed_blocks(blocks, page_no))
+            return count + sum(1 for _ in chunker.flush())
+
+        return run
+
+    cases = [
+        ("legacy word loop", lambda: len(legacy_chunk_text(text))),
+        ("character", streamed("character", 1000, 0)),
+        ("character+overlap", streamed("character", 1000, 100)),
+        ("structure", streamed("structure", 1000, 100)),
+    ]
+    try:
+        import tiktoken  # noqa: F401
+
+        cases.append(("token", streamed("token", 256, 32)))
+    except ImportError:
+        print("tiktoken not installed, skipping the token strategy")
+
+    print(f"{'strategy':<20}{'seconds':>10}{'MB/s':>10}{'chunks':>10}")
+    for name, run in cases:
+        elapsed, count = timed(run)
+        print(f"{name:<20}{elapsed:>10.3f}{len(text) / 1e6 / elapsed:>10.1f}{count:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Latency of drug_info with include_interactions=True: the summary and the
+interactions summary one after the other, as before, against both at once.
+
+Each round searches and embeds once, then times the two summaries run
+sequentially and concurrently on the same results, so the difference is the
+LLM fan-out alone. Needs DuckDuckGo and OpenAI access.
+
+Usage:
+    python benchmarks/duckduckgo_fanout.py --drug ibuprofen --rounds 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from dudoxx.services.duckduckgo_service import DuckDuckGOService
+
+SUMMARY_PROMPT = """
+Provide a comprehensive summary of the drug {query}, including the following information:
+1. Description
+2. Dosage
+3. Side effects
+
+Base your summary on the following information:
+{docs}
+
+Format the summary as a JSON object with the keys: description, dosage, side_effects.
+"""
+
+INTERACTIONS_PROMPT = """
+Summarize the drug interactions for {query} based on the following information:
+{docs}
+
+Provide the summary as a simple string.
+"""
+
+
+async def run(drug: str, rounds: int) -> None:
+    service = DuckDuckGOService()
+    query, interactions_query = f"{drug} drug information", f"{drug} drug interactions"
+    sequential, concurrent, retrieval = [], [], []
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            index = await service._index_snippets(await service._perform_search(query))
+            retrieval.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await service._generate_summary(query, index, SUMMARY_PROMPT)
+            await service._generate_summary(interactions_query, index, INTERACTIONS_PROMPT)
+            sequential.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await asyncio.gather(
+                service._generate_summary(query, index, SUMMARY_PROMPT),
+                service._generate_summary(interactions_query, index, INTERACTIONS_PROMPT),
+            )
+            concurrent.append(time.perf_counter() - start)
+    finally:
+        await service.close()
+
+    search = statistics.median(retrieval)
+    before, after = search + statistics.median(sequential), search + statistics.median(concurrent)
+    print(f"search + embed       {search * 1000:8.0f} ms")
+    print(f"summaries sequential {statistics.median(sequential) * 1000:8.0f} ms")
+    print(f"summaries concurrent {statistics.median(concurrent) * 1000:8.0f} ms")
+    print(
+        f"drug_info total      {before * 1000:8.0f} -> {after * 1000:.0f} ms ({(1 - after / before) * 100:.0f}% less)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drug", default="ibuprofen")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.drug, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Rows/sec of the binary COPY ingestion path against the ORM add_all path.
+
+Inserts random 1536-dimensional vectors into a scratch context for each mode,
+then deletes them again. No embedding API calls are made.
+
+Usage:
+    python benchmarks/ingest_copy.py --rows 5000 --batch-size 500
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import List
+
+import numpy as np
+
+from dudoxx.database.pgvector.database import close_pgvector, get_settings
+from dudoxx.pgvector_rag.vector_store import VectorStore
+
+DIMENSIONS = 1536
+
+
+async def timed_insert(store: VectorStore, mode: str, rows: int) -> float:
+    context_id = f"bench-{mode}-{uuid.uuid4()}"
+    texts: List[str] = [f"benchmark chunk {i} " * 20 for i in range(rows)]
+    metadatas = [{"source": "benchmark", "chunk": i, "context_id": context_id} for i in range(rows)]
+    embeddings = np.random.default_rng(0).random((rows, DIMENSIONS), dtype=np.float32).tolist()
+
+    start = time.perf_counter()
+    await store.insert_embeddings(texts, metadatas, embeddings, context_id=context_id, mode=mode)
+    elapsed = time.perf_counter() - start
+
+    await store.delete_documents(context_id)
+    return elapsed
+
+
+async def run(args: argparse.Namespace) -> None:
+    get_settings().PGVECTOR_COPY_BATCH_SIZE = args.batch_size
+    store = VectorStore()
+
+    print(f"{args.rows} rows, copy batch size {args.batch_size}")
+    print(f"{'mode':<8}{'seconds':>10}{'rows/sec':>12}")
+    for mode in ("orm", "copy"):
+        elapsed = await timed_insert(store, mode, args.rows)
+        print(f"{mode:<8}{elapsed:>10.2f}{args.rows / elapsed:>12.0f}")
+    await close_pgvector()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Per-request service overhead: constructing a service per request against
+looking up the app's shared instance in the ServiceRegistry.
+
+Construction builds the OpenAI, Deepgram, DuckDuckGo and Redis clients and the
+RAG chains.
+
+Usage:
+    python benchmarks/service_registry.py --iterations 50
+"""
+
+import argparse
+import time
+
+from dudoxx.app import SHARED_SERVICES
+from dudoxx.services.service_registry import ServiceRegistry
+
+
+def per_call_ms(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--skip", nargs="*", default=[], help="service class names to leave out")
+    args = parser.parse_args()
+
+    registry = ServiceRegistry()
+    print(f"{'service':<32}{'per request ms':>16}{'shared ms':>12}")
+    for service_type in SHARED_SERVICES:
+        name = f"{service_type.__module__.rsplit('.', 1)[-1]}.{service_type.__name__}"
+        if service_type.__name__ in args.skip or name in args.skip:
+            continue
+        constructed = per_call_ms(service_type, args.iterations)
+        registry.get(service_type)
+        shared = per_call_ms(lambda: registry.get(service_type), args.iterations)
+        print(f"{name:<32}{constructed:>16.2f}{shared:>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
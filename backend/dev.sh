@@ -24,6 +24,12 @@ while [ $# -gt 0 ]; do
         python -m dudoxx || { echo "Failed to run server"; exit 1; }
         set +x
         ;;
+    worker )  ## run a background job worker
+        maybe_install
+        set -x
+        python -m dudoxx.worker || { echo "Failed to run worker"; exit 1; }
+        set +x
+        ;;
     lint )  ## check for code issues
         maybe_install
         set -x
@@ -52,6 +58,7 @@ while [ $# -gt 0 ]; do
       echo "Available commands:"
       echo "  migrate      Apply the database migrations"
       echo "  run         Run the dev server"
+      echo "  worker      Run a background job worker"
       echo "  lint        Check for code issues"
       echo "  reformat    Automatically fix code issues"
       echo "  api-test    Run the API tests"
@@ -1,13 +1,24 @@
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_limiter import FastAPILimiter
-import redis.asyncio as redis
 from typing import List, Tuple, Optional, Dict
 from functools import lru_cache
 from contextlib import asynccontextmanager
 from dudoxx.database.sqlite.database import setup_sqlite
-from dudoxx.database.pgvector.database import setup_pgvector
-from dudoxx.routes import rag, drug, apikey, image, transcription, speech, deepgrame, rag_pgvector
+from dudoxx.database.pgvector.database import setup_pgvector, close_pgvector
+from dudoxx.services.service_registry import ServiceRegistry
+from dudoxx.services.web_rag_store_service import get_web_rag_store
+from dudoxx.services.upload_service import UploadLimitMiddleware
+from dudoxx.services.job_queue_service import get_job_queue
+from dudoxx.services.api_key_cache_service import get_api_key_cache, get_last_used_recorder
+from dudoxx.services.rate_limit_service import get_rate_limit_store
+from dudoxx.services.redis_service import close_connection_pools, get_local_cache
+from dudoxx.services import rag_service, rag_pgvector_service
+from dudoxx.services.duckduckgo_service import DuckDuckGOService
+from dudoxx.services.speech_service import SpeechService
+from dudoxx.services.transcription_service import TranscriptionService
+from dudoxx.services.deepgrame_service import DeepgramService
+from dudoxx.services.image_service import ImageService
+from dudoxx.routes import rag, drug, apikey, image, transcription, speech, deepgrame, rag_pgvector, tasks, cache
 from dudoxx.config import Settings
 
 
@@ -16,22 +27,55 @@ def get_settings() -> Settings:
     return Settings()
 
 
-async def setup_fastapi_ratelimiter() -> None:
-    settings: Settings = get_settings()
-    redis_connection: redis.Redis = redis.from_url(settings.redis_dns, encoding="utf-8", decode_responses=True)
-    await FastAPILimiter.init(redis_connection)
+# Services whose clients and chains are built once per worker and shared by all requests
+SHARED_SERVICES = [
+    rag_service.RAGService,
+    rag_pgvector_service.RAGService,
+    DuckDuckGOService,
+    SpeechService,
+    TranscriptionService,
+    DeepgramService,
+    ImageService,
+]
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await setup_fastapi_ratelimiter()
     setup_sqlite()
-    setup_pgvector()
+    await get_api_key_cache().start()
+    await get_local_cache().start()
+    await get_last_used_recorder().start()
+    await setup_pgvector()
+    await get_web_rag_store().start()
+    app.state.services = ServiceRegistry()
+    app.state.services.start(SHARED_SERVICES)
     yield
+    await app.state.services.close()
+    await get_job_queue().cache.close()
+    await get_web_rag_store().close()
+    await get_last_used_recorder().close()
+    await get_api_key_cache().close()
+    await get_local_cache().close()
+    await get_api_key_cache().redis_cache.close()
+    await get_rate_limit_store().redis_cache.close()
+    await close_pgvector()
+    await close_connection_pools()
 
 
 def create_app() -> FastAPI:
     app: FastAPI = FastAPI(lifespan=lifespan)
+    api_v1_prefix: str = "/api/v1"
+
+    # Added before CORS so 413 responses still carry the CORS headers
+    settings: Settings = get_settings()
+    app.add_middleware(
+        UploadLimitMiddleware,
+        limits={
+            f"{api_v1_prefix}/documents/upload": settings.UPLOAD_MAX_PDF_BYTES,
+            f"{api_v1_prefix}/transcribe/": settings.UPLOAD_MAX_AUDIO_BYTES,
+            f"{api_v1_prefix}/transcribe_audio": settings.UPLOAD_MAX_AUDIO_BYTES,
+        },
+    )
 
     app.add_middleware(
         CORSMiddleware,
@@ -45,7 +89,6 @@ def create_app() -> FastAPI:
     async def pong() -> Dict[str, str]:
         return {"ping": "pong!"}
 
-    api_v1_prefix: str = "/api/v1"
     routers: List[Tuple[APIRouter, str, Optional[str]]] = [
         (apikey.router, "api_key", None),
         (drug.router, "drug", None),
@@ -55,6 +98,8 @@ def create_app() -> FastAPI:
         (rag.router, "rag", "/rag"),
         (deepgrame.router, "deepgram", None),
         (rag_pgvector.router, "rag_pgvector", None),
+        (tasks.router, "tasks", None),
+        (cache.router, "cache", None),
     ]
 
     for router, tag, additional_prefix in routers:
@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Dict
 import os
 
 
@@ -10,7 +11,86 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "dudoxx"
     POSTGRES_HOST: str = "pg_vector"
     POSTGRES_PORT: int = 5432
+    PGVECTOR_POOL_SIZE: int = 10
+    PGVECTOR_MAX_OVERFLOW: int = 10
+    PGVECTOR_POOL_TIMEOUT: float = 30.0
+    PGVECTOR_POOL_RECYCLE: int = 1800
+    PGVECTOR_INGEST_MODE: str = "copy"  # copy or orm
+    PGVECTOR_COPY_BATCH_SIZE: int = 500
+    PDF_WORKERS: int = 2
+    PDF_JOB_TIMEOUT: float = 300.0
+    PDF_WORKER_MAX_BATCHES: int = 50  # recycle a worker process after this many INGEST_PAGE_WINDOW page batches
+    UPLOAD_DIR: str = "temp"  # must be storage shared with the job workers
+    UPLOAD_MAX_PDF_BYTES: int = 50 * 1024 * 1024
+    UPLOAD_MAX_AUDIO_BYTES: int = 25 * 1024 * 1024  # Whisper's own limit
+    SPEECH_OUTPUT_DIR: str = "temp/speech"  # shared with the API, which serves the files
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_BACKOFF_BASE: float = 5.0  # seconds before the first retry, doubled for each further one
+    JOB_BACKOFF_MAX: float = 300.0
+    JOB_VISIBILITY_TIMEOUT: float = 600.0  # idle seconds before a job of a dead worker is claimed by another
+    JOB_CONCURRENCY: Dict[str, int] = {
+        "ingest_document": 2,
+        "generate_speech": 4,
+        "transcribe_audio": 2,
+        "transcribe_deepgram": 2,
+    }  # concurrent jobs per type and worker process
+    CHUNK_STRATEGY: str = "character"  # character, token or structure
+    CHUNK_SIZE: int = 1000  # characters, for the character and structure strategies
+    CHUNK_OVERLAP: int = 100
+    CHUNK_TOKEN_SIZE: int = 256
+    CHUNK_TOKEN_OVERLAP: int = 32
+    CHUNK_ENCODING: str = "cl100k_base"
+    INGEST_PAGE_WINDOW: int = 8  # PDF pages converted per extraction step
+    INGEST_EMBED_BATCH_SIZE: int = 64
+    INGEST_EMBED_CONCURRENCY: int = 4
+    RETRIEVAL_MODE: str = "vector"  # vector or hybrid
+    HYBRID_CANDIDATES: int = 40  # rows taken from each of the full-text and vector rankings
+    HYBRID_RRF_K: int = 60
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95  # minimum cosine similarity to reuse an answer
+    SEMANTIC_CACHE_TTL: int = 24 * 3600
+    SEMANTIC_CACHE_SCAN_ENTRIES: int = 64  # questions kept and compared per context version, ~6 KB each
+    PGVECTOR_PARTITIONING: str = "none"  # none, list (one partition per context) or hash
+    PGVECTOR_HASH_PARTITIONS: int = 16
+    PGVECTOR_INDEX_TYPE: str = "hnsw"  # hnsw, ivfflat or none
+    PGVECTOR_HNSW_M: int = 16
+    PGVECTOR_HNSW_EF_CONSTRUCTION: int = 64
+    PGVECTOR_HNSW_EF_SEARCH: int = 40
+    PGVECTOR_IVFFLAT_LISTS: int = 100
+    PGVECTOR_IVFFLAT_PROBES: int = 10
+    WEB_RAG_INDEX_DIR: str = "data/web_rag_index"
+    WEB_RAG_SNAPSHOT_INTERVAL: float = 60.0  # seconds between persisting added snippets
+    WEB_RAG_MMAP: bool = True
+    WEB_RAG_IVF_MIN_VECTORS: int = 10000  # smaller snapshots use a flat index
+    WEB_RAG_NPROBE: int = 16
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
+    API_KEY_CACHE_SECRET: str = os.getenv("DDX_MMRAG_API_KEY_CACHE_SECRET", "")  # HMAC key, shared by all API processes
+    API_KEY_CACHE_TTL: int = 300  # seconds a verified key is trusted without bcrypt
+    API_KEY_CACHE_LOCAL_TTL: float = 30.0  # in-process tier, bounds revocation delay if a message is missed
+    API_KEY_CACHE_LOCAL_SIZE: int = 10000
+    API_KEY_LAST_USED_FLUSH_INTERVAL: float = 30.0
+    RATE_LIMIT_TIERS: Dict[str, float] = {
+        "standard": 1.0,
+        "premium": 10.0,
+        "unlimited": 0.0,
+    }  # multiplier on each route's limit per API key quota tier, 0 disables limiting
+    RATE_LIMIT_LOCAL_SHARE: float = 0.1  # share of a limit a process leases at once while well under it, at least 2
+    EMBEDDING_CACHE_LOCAL_SIZE: int = 4096  # in-process entries, ~6 KB each for 1536 dimensions
+    EMBEDDING_CACHE_TTL: int = 7 * 24 * 3600
+    DDG_SEARCH_CACHE_TTL: int = 24 * 3600  # DuckDuckGo results per normalised query
+    DDG_INFO_SOFT_TTL: float = 3600.0  # drug/disease info is refreshed in the background after this
+    DDG_INFO_HARD_TTL: int = 7 * 24 * 3600  # and served stale meanwhile for at most this long
+    DDG_INFO_LOCK_TTL: float = 120.0  # lease of the worker computing an entry
+    DDG_INFO_WAIT_TIMEOUT: float = 120.0  # how long other requests wait for it
+    DDG_BATCH_MAX_ITEMS: int = 50  # names per batch lookup request
+    DDG_BATCH_CONCURRENCY: int = 4  # lookups of one batch request running at once
+    REDIS_MAX_CONNECTIONS: int = 1000  # per process, shared by every Redis client
+    REDIS_SERIALIZER: str = "orjson"  # or "msgpack"
+    REDIS_COMPRESSION_THRESHOLD: int = 1024  # bytes; larger values are zstd-compressed, 0 disables compression
+    REDIS_COMPRESSION_LEVEL: int = 3
+    REDIS_LOCAL_CACHE_ENABLED: bool = False  # in-process tier for task status and drug/disease info reads
+    REDIS_LOCAL_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    REDIS_LOCAL_CACHE_TTL: float = 10.0  # bounds staleness if an invalidation message is missed
     redis_host: str = os.getenv("DDX_MMRAG_REDIS_HOST", "localhost")
     redis_port: int = int(os.getenv("DDX_MMRAG_REDIS_PORT", 6379))
     redis_dns: str = f"redis://{redis_host}:{redis_port}"
@@ -1,12 +1,16 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.exc import SQLAlchemyError
 from functools import lru_cache
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
+from pgvector.asyncpg import register_vector
+import hashlib
 import logging
-from typing import Generator
+import time
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
 
-from dudoxx.database.pgvector.models import Base
+from dudoxx.database.pgvector.models import Base, TEXT_SEARCH_CONFIG
 from dudoxx.config import Settings
 
 # Configure logging
@@ -22,45 +26,403 @@ def get_settings() -> Settings:
 def get_database_url() -> str:
     """Generate database URL from settings."""
     settings = get_settings()
-    return f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
+    return f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}"
 
 
-# Create engine with basic pooling configuration
-engine = create_engine(
+# Create async engine; every operation borrows its own connection from this pool
+engine = create_async_engine(
     get_database_url(),
-    pool_size=5,  # Reasonable default pool size
-    max_overflow=10,
+    pool_size=get_settings().PGVECTOR_POOL_SIZE,
+    max_overflow=get_settings().PGVECTOR_MAX_OVERFLOW,
+    pool_timeout=get_settings().PGVECTOR_POOL_TIMEOUT,
+    pool_recycle=get_settings().PGVECTOR_POOL_RECYCLE,
     pool_pre_ping=True,  # Helps detect stale connections
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codec(dbapi_connection, connection_record) -> None:
+    """Register the pgvector codec on every new asyncpg connection."""
+    try:
+        dbapi_connection.run_async(register_vector)
+    except ValueError:
+        # The extension does not exist yet; setup_pgvector creates it and recycles the pool
+        logger.warning("pgvector type not found, vector codec not registered on this connection")
+
+
 # Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+class PoolStats:
+    """Connection checkout counters for the pgvector pool."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = engine.sync_engine.pool
+        return {
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "checkouts": self.checkouts,
+            "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
 
 
-def get_db() -> Generator[Session, None, None]:
+pool_stats = PoolStats()
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return current pool size and connection wait-time statistics."""
+    return pool_stats.snapshot()
+
+
+@asynccontextmanager
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Borrow a session with its own pooled connection for a single operation."""
+    start = time.perf_counter()
+    async with SessionLocal() as session:
+        try:
+            await session.connection()
+            pool_stats.record_wait(time.perf_counter() - start)
+            yield session
+        except SQLAlchemyError as e:
+            logger.error(f"Database error: {str(e)}")
+            await session.rollback()
+            raise
+
+
+@asynccontextmanager
+async def get_raw_connection() -> AsyncIterator[Any]:
+    """Borrow the underlying asyncpg connection from the pool, e.g. for COPY."""
+    start = time.perf_counter()
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        pool_stats.record_wait(time.perf_counter() - start)
+        yield raw.driver_connection
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Get database session - compatible with FastAPI Depends."""
-    db = SessionLocal()
+    async with get_session() as session:
+        yield session
+
+
+VECTOR_INDEX_NAMES: Dict[str, str] = {
+    "hnsw": "documents_embedding_hnsw_idx",
+    "ivfflat": "documents_embedding_ivfflat_idx",
+}
+
+
+def _vector_index_options(index_type: str) -> List[str]:
+    """Return the storage options the configured ANN index should be built with."""
+    settings = get_settings()
+    if index_type == "hnsw":
+        return [f"m={settings.PGVECTOR_HNSW_M}", f"ef_construction={settings.PGVECTOR_HNSW_EF_CONSTRUCTION}"]
+    return [f"lists={settings.PGVECTOR_IVFFLAT_LISTS}"]
+
+
+def setup_fulltext_index(conn: Connection) -> None:
+    """Add the generated tsvector column and its GIN index to tables created before they existed."""
+    conn.execute(
+        text(
+            "ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_tsv tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', content)) STORED"
+        )
+    )
+    conn.execute(text("CREATE INDEX IF NOT EXISTS documents_content_tsv_idx ON documents USING gin (content_tsv)"))
+
+
+def setup_dedup_columns(conn: Connection) -> None:
+    """
+    Add document and chunk hash columns to tables created before they existed.
+
+    Rows stored earlier keep a NULL content_hash, which the unique index ignores.
+    """
+    conn.execute(text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS doc_id varchar"))
+    conn.execute(text("ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash varchar"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_documents_context_doc_id ON documents (context_id, doc_id)"))
+    conn.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_documents_context_content_hash "
+            "ON documents (context_id, content_hash)"
+        )
+    )
+
+
+def setup_vector_index(conn: Connection) -> None:
+    """
+    Create the configured ANN index on documents.embedding using cosine distance.
+
+    Indexes of the other type are dropped, and an existing index whose build options no longer
+    match the settings is rebuilt. IVFFlat picks its centroids from the rows present at build
+    time, so it should be (re)created once the table holds representative data.
+    """
+    index_type = get_settings().PGVECTOR_INDEX_TYPE.lower()
+    if index_type not in (*VECTOR_INDEX_NAMES, "none"):
+        raise ValueError(f"Unsupported PGVECTOR_INDEX_TYPE: {index_type}")
+
+    for other_type, other_name in VECTOR_INDEX_NAMES.items():
+        if other_type != index_type:
+            conn.execute(text(f"DROP INDEX IF EXISTS {other_name}"))
+
+    if index_type == "none":
+        return
+
+    index_name = VECTOR_INDEX_NAMES[index_type]
+    options = _vector_index_options(index_type)
+    current: Optional[List[str]] = conn.execute(
+        text("SELECT reloptions FROM pg_class WHERE relname = :name AND relkind IN ('i', 'I')"), {"name": index_name}
+    ).scalar()
+    if current is not None and sorted(current) == sorted(options):
+        return
+
+    if current is not None:
+        logger.info(f"Rebuilding {index_name}: options changed from {current} to {options}")
+        conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+
+    conn.execute(
+        text(
+            f"CREATE INDEX {index_name} ON documents "
+            f"USING {index_type} (embedding vector_cosine_ops) WITH ({', '.join(options)})"
+        )
+    )
+    logger.info(f"Created {index_type} index {index_name} with {options}")
+
+
+def _partitioning() -> str:
+    partitioning = get_settings().PGVECTOR_PARTITIONING.lower()
+    if partitioning not in ("none", "list", "hash"):
+        raise ValueError(f"Unsupported PGVECTOR_PARTITIONING: {partitioning}")
+    return partitioning
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def context_partition_name(context_id: str) -> str:
+    """Name of the list partition holding one context."""
+    return f"documents_ctx_{hashlib.sha1(context_id.encode('utf-8')).hexdigest()[:20]}"
+
+
+def _is_partitioned(conn: Connection) -> Optional[bool]:
+    """Whether documents is partitioned, or None if the table does not exist."""
+    relkind = conn.execute(text("SELECT relkind FROM pg_class WHERE relname = 'documents'")).scalar()
+    return None if relkind is None else relkind == "p"
+
+
+def _create_partitioned_documents(conn: Connection, partitioning: str) -> None:
+    """
+    Create documents partitioned on context_id.
+
+    Postgres requires a primary key on a partitioned table to include the partition key,
+    so ids come from a shared sequence and are indexed instead. Indexes created on the
+    parent (including the ANN index) are created on every partition automatically.
+    """
+    conn.execute(text("CREATE SEQUENCE IF NOT EXISTS documents_id_seq"))
+    conn.execute(
+        text(
+            f"""
+            CREATE TABLE documents (
+                id integer NOT NULL DEFAULT nextval('documents_id_seq'),
+                content text NOT NULL,
+                metadata_ jsonb,
+                embedding vector(1536),
+                context_id varchar,
+                doc_id varchar,
+                content_hash varchar,
+                content_tsv tsvector GENERATED ALWAYS AS (to_tsvector('{TEXT_SEARCH_CONFIG}', content)) STORED
+            ) PARTITION BY {partitioning.upper()} (context_id)
+            """
+        )
+    )
+    conn.execute(text("ALTER SEQUENCE documents_id_seq OWNED BY documents.id"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_documents_id ON documents (id)"))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_documents_context_id ON documents (context_id)"))
+
+    if partitioning == "list":
+        # Rows without a dedicated partition (e.g. no context) land here
+        conn.execute(text("CREATE TABLE documents_default PARTITION OF documents DEFAULT"))
+    else:
+        modulus = get_settings().PGVECTOR_HASH_PARTITIONS
+        for remainder in range(modulus):
+            conn.execute(
+                text(
+                    f"CREATE TABLE documents_hash_{remainder} PARTITION OF documents "
+                    f"FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+                )
+            )
+
+
+def _create_list_partition(conn: Connection, context_id: str) -> None:
+    conn.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {context_partition_name(context_id)} PARTITION OF documents "
+            f"FOR VALUES IN ({_quote_literal(context_id)})"
+        )
+    )
+
+
+def setup_partitioning(conn: Connection) -> None:
+    """
+    Create documents partitioned by context_id, migrating an existing unpartitioned table once.
+
+    Must run before create_all, which would otherwise create the plain table.
+    """
+    partitioning = _partitioning()
+    partitioned = _is_partitioned(conn)
+    if partitioning == "none":
+        if partitioned:
+            logger.warning("documents is partitioned but PGVECTOR_PARTITIONING is none; keeping partitions")
+        return
+    if partitioned:
+        return
+
+    if partitioned is None:
+        _create_partitioned_documents(conn, partitioning)
+        logger.info(f"Created documents with {partitioning} partitioning on context_id")
+        return
+
+    logger.info(f"Migrating documents to {partitioning} partitioning on context_id")
+    conn.execute(text("ALTER TABLE documents RENAME TO documents_unpartitioned"))
+    conn.execute(text("ALTER SEQUENCE documents_id_seq OWNED BY NONE"))
+    for index in (
+        "ix_documents_id",
+        "ix_documents_context_id",
+        "documents_content_tsv_idx",
+        *VECTOR_INDEX_NAMES.values(),
+    ):
+        conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+    _create_partitioned_documents(conn, partitioning)
+    if partitioning == "list":
+        contexts = conn.execute(
+            text("SELECT DISTINCT context_id FROM documents_unpartitioned WHERE context_id IS NOT NULL")
+        ).scalars()
+        for context_id in contexts:
+            _create_list_partition(conn, context_id)
+    existing = set(
+        conn.execute(
+            text("SELECT column_name FROM information_schema.columns WHERE table_name = 'documents_unpartitioned'")
+        ).scalars()
+    )
+    columns = ", ".join(
+        column
+        for column in ("id", "content", "metadata_", "embedding", "context_id", "doc_id", "content_hash")
+        if column in existing
+    )
+    conn.execute(text(f"INSERT INTO documents ({columns}) SELECT {columns} FROM documents_unpartitioned"))
+    conn.execute(text("DROP TABLE documents_unpartitioned"))
+
+
+_DOCUMENT_COLUMNS = "id, content, metadata_, embedding, context_id, doc_id, content_hash"
+
+
+def _list_partition_exists(conn: Connection, context_id: str) -> bool:
+    return bool(
+        conn.execute(
+            text(
+                "SELECT 1 FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'documents'::regclass AND c.relname = :name"
+            ),
+            {"name": context_partition_name(context_id)},
+        ).scalar()
+    )
+
+
+def _create_list_partition_from_default(conn: Connection, context_id: str) -> None:
+    """
+    Create a context's list partition, first moving any of its rows out of the default
+    partition, which would otherwise make Postgres refuse the new partition. Such rows
+    exist when another process wrote the context after its partition was dropped.
+    """
+    if _list_partition_exists(conn, context_id):
+        return
+    params = {"context_id": context_id}
+    conn.execute(
+        text(
+            f"CREATE TEMP TABLE documents_moving ON COMMIT DROP AS "
+            f"SELECT {_DOCUMENT_COLUMNS} FROM documents_default WHERE context_id = :context_id"
+        ),
+        params,
+    )
+    moved = conn.execute(text("SELECT count(*) FROM documents_moving")).scalar()
+    if moved:
+        logger.warning(f"Moving {moved} rows of context {context_id} from documents_default to its partition")
+        conn.execute(text("DELETE FROM documents_default WHERE context_id = :context_id"), params)
+    _create_list_partition(conn, context_id)
+    if moved:
+        conn.execute(
+            text(f"INSERT INTO documents ({_DOCUMENT_COLUMNS}) SELECT {_DOCUMENT_COLUMNS} FROM documents_moving")
+        )
+    conn.execute(text("DROP TABLE documents_moving"))
+
+
+async def ensure_context_partition(context_id: Optional[str]) -> None:
+    """
+    Create the list partition of a context before rows are written to it.
+
+    Checked in the catalog on every write rather than remembered per process, since
+    another process may have dropped the partition meanwhile.
+    """
+    if not context_id or _partitioning() != "list":
+        return
     try:
-        yield db
+        async with engine.begin() as conn:
+            await conn.run_sync(_create_list_partition_from_default, context_id)
     except SQLAlchemyError as e:
-        logger.error(f"Database error: {str(e)}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+        # Another worker may have created it concurrently
+        async with engine.connect() as conn:
+            exists = await conn.run_sync(_list_partition_exists, context_id)
+        if not exists:
+            raise e
+
+
+async def drop_context_partition(context_id: str) -> bool:
+    """Drop the list partition of a context. Returns False when partitions are not per context."""
+    if _partitioning() != "list":
+        return False
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP TABLE IF EXISTS {context_partition_name(context_id)}"))
+    return True
 
 
-def setup_pgvector() -> None:
-    """Initialize database and create tables."""
+async def setup_pgvector() -> None:
+    """Initialize database, create tables, the full-text index and the ANN index."""
     try:
-        # Create pgvector extension
-        with engine.connect() as conn:
-            conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector;"))
-            conn.commit()
+        async with engine.begin() as conn:
+            # Create pgvector extension
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector;"))
 
-        # Create tables
-        Base.metadata.create_all(engine)
+        # The vector codec could not be registered before the extension existed
+        await engine.dispose()
+
+        async with engine.begin() as conn:
+            # Create the partitioned table if configured, then any remaining tables
+            await conn.run_sync(setup_partitioning)
+            await conn.run_sync(Base.metadata.create_all)
+
+            # Create the full-text column and index, then create or update the vector index
+            await conn.run_sync(setup_fulltext_index)
+            await conn.run_sync(setup_dedup_columns)
+            await conn.run_sync(setup_vector_index)
         logger.info("Database setup completed successfully")
     except Exception as e:
         logger.error(f"Error setting up database: {str(e)}")
         raise
+
+
+async def close_pgvector() -> None:
+    """Close all pooled connections."""
+    await engine.dispose()
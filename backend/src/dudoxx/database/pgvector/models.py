@@ -1,11 +1,14 @@
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import declarative_base, deferred
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import Column, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, Computed, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 
 
 Base = declarative_base()
 
+# Text search configuration used for the generated content_tsv column and queries against it
+TEXT_SEARCH_CONFIG = "english"
+
 
 class Document(Base):
     """Document model for storing text chunks and their embeddings."""
@@ -17,3 +20,13 @@ class Document(Base):
     metadata_ = Column(JSONB, nullable=True)
     embedding = Column(Vector(1536))  # OpenAI embeddings are 1536 dimensions
     context_id = Column(String, nullable=True, index=True)
+    doc_id = Column(String, nullable=True)  # sha256 of the source file
+    content_hash = Column(String, nullable=True)  # sha256 of content, unique per context
+    # Generated by Postgres for full-text search; deferred so searches don't load it
+    content_tsv = deferred(Column(TSVECTOR, Computed(f"to_tsvector('{TEXT_SEARCH_CONFIG}', content)", persisted=True)))
+
+    __table_args__ = (
+        Index("documents_content_tsv_idx", "content_tsv", postgresql_using="gin"),
+        Index("ix_documents_context_doc_id", "context_id", "doc_id"),
+        Index("uq_documents_context_content_hash", "context_id", "content_hash", unique=True),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 import os
 
@@ -18,8 +18,17 @@ def get_db():
         db.close()
 
 
+def _add_missing_columns():
+    """create_all only creates tables; add columns introduced since a database was created."""
+    columns = {column["name"] for column in inspect(engine).get_columns("api_keys")}
+    with engine.begin() as connection:
+        if "quota_tier" not in columns:
+            connection.execute(text("ALTER TABLE api_keys ADD COLUMN quota_tier VARCHAR NOT NULL DEFAULT 'standard'"))
+
+
 def setup_sqlite():
     try:
         Base.metadata.create_all(bind=engine)
+        _add_missing_columns()
     except Exception as ex:
         raise SystemExit(1) from ex
@@ -12,3 +12,5 @@ class APIKey(Base):
     hashed_key = Column(String, unique=True, index=True)
     created_at = Column(DateTime, default=datetime.datetime.now(tz=datetime.timezone.utc))
     last_used = Column(DateTime, nullable=True)
+    # Selects the rate limit multiplier in Settings.RATE_LIMIT_TIERS
+    quota_tier = Column(String, nullable=False, default="standard", server_default="standard")
@@ -0,0 +1,6 @@
+class PdfConversionError(Exception):
+    """Raised when a PDF cannot be converted to text."""
+
+
+class PdfConversionTimeoutError(PdfConversionError):
+    """Raised when a PDF conversion job exceeds its time limit."""
@@ -0,0 +1,2 @@
+class UploadTooLargeError(Exception):
+    """Raised when an uploaded file exceeds the route's size limit."""
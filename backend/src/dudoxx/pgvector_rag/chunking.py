@@ -0,0 +1,288 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+# Docling item labels that open a new section in the structure-aware strategy
+HEADING_LABELS = {"title", "section_header", "page_header"}
+
+_WHITESPACE = (" ", "\n", "\t")
+
+
+@dataclass
+class Chunk:
+    """A chunk of text and the page it starts on."""
+
+    text: str
+    page: Optional[int] = None
+
+
+class BaseChunker(ABC):
+    """
+    Incremental chunker.
+
+    Text is fed page by page; chunks are yielded as soon as they are complete and
+    the open tail is kept until more text arrives or flush() is called.
+    """
+
+    def __init__(self, chunk_size: int, overlap: int = 0) -> None:
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= overlap < chunk_size:
+            raise ValueError("overlap must be between 0 and chunk_size")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    @abstractmethod
+    def feed(self, text: str, page: Optional[int] = None) -> Iterator[Chunk]:
+        """Add text and yield the chunks it completes."""
+
+    @abstractmethod
+    def flush(self) -> Iterator[Chunk]:
+        """Yield whatever text is still buffered."""
+
+    def feed_blocks(self, blocks: Sequence[Tuple[str, str]], page: Optional[int] = None) -> Iterator[Chunk]:
+        """Add (label, text) layout blocks; plain strategies only look at the text."""
+        return self.feed("\n".join(text for _, text in blocks), page)
+
+    def chunk(self, text: str) -> List[str]:
+        """Chunk a whole text at once."""
+        return [chunk.text for chunk in (*self.feed(text), *self.flush())]
+
+
+class _PageMarkers:
+    """Maps buffer offsets back to the page the text came from."""
+
+    def __init__(self) -> None:
+        self.markers: List[Tuple[int, Optional[int]]] = []
+
+    def add(self, offset: int, page: Optional[int]) -> None:
+        self.markers.append((offset, page))
+
+    def page_at(self, offset: int) -> Optional[int]:
+        page = None
+        for start, marker_page in self.markers:
+            if start > offset:
+                break
+            page = marker_page
+        return page
+
+    def shift(self, removed: int) -> None:
+        """Drop markers before the first `removed` offsets, keeping the one still in effect."""
+        current = self.page_at(removed)
+        self.markers = [(0, current)] + [(start - removed, page) for start, page in self.markers if start > removed]
+
+
+class CharacterChunker(BaseChunker):
+    """
+    Packs whitespace-separated words into chunks of at most chunk_size characters.
+
+    Cuts are found with str.rfind on the buffer instead of splitting the text into
+    words, so the Python-level work is per chunk rather than per word.
+    """
+
+    def __init__(self, chunk_size: int = 1000, overlap: int = 0) -> None:
+        super().__init__(chunk_size, overlap)
+        self._buffer = ""
+        self._pages = _PageMarkers()
+
+    def _cut(self, start: int) -> int:
+        end = start + self.chunk_size
+        cut = max(self._buffer.rfind(ws, start + 1, end + 1) for ws in _WHITESPACE)
+        # A single word longer than chunk_size is split hard
+        return cut if cut > start else end
+
+    def _next_start(self, start: int, cut: int) -> int:
+        if not self.overlap:
+            return cut
+        # Start the overlap on a word boundary inside the previous chunk
+        begin = max(start + 1, cut - self.overlap)
+        found = [i for i in (self._buffer.find(ws, begin, cut) for ws in _WHITESPACE) if i != -1]
+        return min(found) + 1 if found else cut
+
+    def _skip_whitespace(self, start: int) -> int:
+        while start < len(self._buffer) and self._buffer[start] in _WHITESPACE:
+            start += 1
+        return start
+
+    def feed(self, text: str, page: Optional[int] = None) -> Iterator[Chunk]:
+        if not text:
+            return
+        if self._buffer:
+            self._buffer += " "
+        self._pages.add(len(self._buffer), page)
+        self._buffer += text
+
+        start = self._skip_whitespace(0)
+        while len(self._buffer) - start > self.chunk_size:
+            cut = self._cut(start)
+            chunk = self._buffer[start:cut].strip()
+            if chunk:
+                yield Chunk(chunk, self._pages.page_at(start))
+            start = self._skip_whitespace(self._next_start(start, cut))
+
+        self._pages.shift(start)
+        self._buffer = self._buffer[start:]
+
+    def flush(self) -> Iterator[Chunk]:
+        chunk = self._buffer.strip()
+        page = self._pages.page_at(0)
+        self._buffer = ""
+        self._pages = _PageMarkers()
+        if chunk:
+            yield Chunk(chunk, page)
+
+
+class TokenChunker(BaseChunker):
+    """
+    Windows of chunk_size tokens with overlap tokens shared between neighbours.
+
+    Works with any tiktoken-compatible encoding (an object with encode and decode).
+    """
+
+    def __init__(self, chunk_size: int = 256, overlap: int = 0, encoding: Any = "cl100k_base") -> None:
+        super().__init__(chunk_size, overlap)
+        if isinstance(encoding, str):
+            import tiktoken
+
+            encoding = tiktoken.get_encoding(encoding)
+        self.encoding = encoding
+        self._tokens: List[int] = []
+        self._pages = _PageMarkers()
+
+    def feed(self, text: str, page: Optional[int] = None) -> Iterator[Chunk]:
+        if not text.strip():
+            return
+        if self._tokens:
+            text = "\n" + text
+        self._pages.add(len(self._tokens), page)
+        self._tokens.extend(self.encoding.encode(text, disallowed_special=()))
+
+        start = 0
+        step = self.chunk_size - self.overlap
+        while len(self._tokens) - start > self.chunk_size:
+            chunk = self.encoding.decode(self._tokens[start : start + self.chunk_size]).strip()
+            if chunk:
+                yield Chunk(chunk, self._pages.page_at(start))
+            start += step
+
+        self._pages.shift(start)
+        del self._tokens[:start]
+
+    def flush(self) -> Iterator[Chunk]:
+        chunk = self.encoding.decode(self._tokens).strip() if self._tokens else ""
+        page = self._pages.page_at(0)
+        self._tokens = []
+        self._pages = _PageMarkers()
+        if chunk:
+            yield Chunk(chunk, page)
+
+
+class StructureChunker(BaseChunker):
+    """
+    Keeps docling sections and paragraphs together.
+
+    A heading closes the current chunk, paragraphs are packed up to chunk_size
+    characters, each chunk is prefixed with its heading, and paragraphs that are
+    too long on their own fall back to character chunking.
+    """
+
+    def __init__(self, chunk_size: int = 1000, overlap: int = 0) -> None:
+        super().__init__(chunk_size, overlap)
+        self._heading = ""
+        self._paragraphs: List[str] = []
+        self._size = 0  # length of the paragraphs joined
+        self._carried = 0  # leading paragraphs carried over as overlap, already emitted
+        self._page: Optional[int] = None
+
+    def _limit(self) -> int:
+        """Room left for paragraphs once the heading prefix is added."""
+        return self.chunk_size - (len(self._heading) + 2 if self._heading else 0)
+
+    def _with_heading(self, body: str) -> str:
+        return f"{self._heading}\n\n{body}" if self._heading else body
+
+    def _reset(self) -> None:
+        self._paragraphs, self._size, self._carried = [], 0, 0
+
+    def _size_with(self, text: str) -> int:
+        return self._size + (2 if self._paragraphs else 0) + len(text)
+
+    def _emit(self) -> Iterator[Chunk]:
+        if len(self._paragraphs) <= self._carried:
+            # Nothing new since the last chunk
+            return
+        yield Chunk(self._with_heading("\n\n".join(self._paragraphs)), self._page)
+        # Carry the last paragraph into the next chunk when it fits in the overlap
+        last = self._paragraphs[-1]
+        self._reset()
+        if len(last) <= self.overlap:
+            self._paragraphs, self._size, self._carried = [last], len(last), 1
+
+    def _set_heading(self, text: str, page: Optional[int]) -> Iterator[Chunk]:
+        # A heading may take at most half a chunk as prefix; longer ones are chunked as
+        # text of their own and shortened to a prefix on a word boundary
+        room = self.chunk_size // 2 - 2
+        if len(text) <= room:
+            self._heading = text
+            return
+        splitter = CharacterChunker(self.chunk_size)
+        for piece in (*splitter.feed(text, page), *splitter.flush()):
+            yield Chunk(piece.text, page)
+        prefix = text[: room + 1].rsplit(None, 1)[0] if room > 0 else ""
+        self._heading = prefix if len(prefix) <= room else text[: max(room, 0)]
+
+    def _add_paragraph(self, text: str, page: Optional[int]) -> Iterator[Chunk]:
+        limit = self._limit()
+        if len(text) > limit:
+            yield from self._emit()
+            # The pieces overlap each other, a carried paragraph is not needed
+            self._reset()
+            splitter = CharacterChunker(limit, min(self.overlap, limit // 2))
+            for piece in (*splitter.feed(text, page), *splitter.flush()):
+                yield Chunk(self._with_heading(piece.text), page)
+            return
+
+        if self._size_with(text) > limit:
+            yield from self._emit()
+            if self._size_with(text) > limit:
+                # The carried overlap and this paragraph do not fit together
+                self._reset()
+        if not self._paragraphs or self._page is None:
+            self._page = page
+        self._size = self._size_with(text)
+        self._paragraphs.append(text)
+
+    def feed_blocks(self, blocks: Sequence[Tuple[str, str]], page: Optional[int] = None) -> Iterator[Chunk]:
+        for label, text in blocks:
+            text = text.strip()
+            if not text:
+                continue
+            if label in HEADING_LABELS:
+                yield from self._emit()
+                self._reset()
+                yield from self._set_heading(text, page)
+                self._page = page
+            else:
+                yield from self._add_paragraph(text, page)
+
+    def feed(self, text: str, page: Optional[int] = None) -> Iterator[Chunk]:
+        """Plain text has no layout labels; blank lines are treated as paragraph breaks."""
+        return self.feed_blocks([("paragraph", paragraph) for paragraph in text.split("\n\n")], page)
+
+    def flush(self) -> Iterator[Chunk]:
+        yield from self._emit()
+        self._heading = ""
+        self._reset()
+        self._page = None
+
+
+def get_chunker(strategy: str, chunk_size: int, overlap: int = 0, encoding: str = "cl100k_base") -> BaseChunker:
+    """Build a chunker for a strategy: character, token or structure."""
+    strategy = strategy.lower()
+    if strategy == "character":
+        return CharacterChunker(chunk_size, overlap)
+    if strategy == "token":
+        return TokenChunker(chunk_size, overlap, encoding)
+    if strategy == "structure":
+        return StructureChunker(chunk_size, overlap)
+    raise ValueError(f"Unsupported chunking strategy: {strategy}")
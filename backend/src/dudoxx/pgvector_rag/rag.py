@@ -1,8 +1,8 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional, AsyncIterator, Tuple
 from langchain_openai import ChatOpenAI
-from langchain.chains.conversational_retrieval.base import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
-from dudoxx.pgvector_rag.vector_store import VectorStore
+from langchain.chains.question_answering import load_qa_chain
+from langchain.chains.question_answering.stuff_prompt import PROMPT_SELECTOR
+from dudoxx.pgvector_rag.vector_store import CustomRetriever, VectorStore
 from dudoxx.config import Settings
 from functools import lru_cache
 
@@ -19,19 +19,37 @@ class RAGSystem:
         """Initialize RAG system with vector store and LLM."""
         self.vector_store = vector_store
         self.llm = ChatOpenAI(temperature=0, model_name="gpt-3.5-turbo", api_key=get_settings().OPENAI_API_KEY)
-        self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True, output_key="answer")
-        self.chain = ConversationalRetrievalChain.from_llm(
-            llm=self.llm,
-            retriever=self.vector_store.as_retriever(search_kwargs={"k": 4}),
-            memory=self.memory,
-            return_source_documents=True,
-            output_key="answer",
-        )
-
-    async def query(self, question: str) -> Dict[str, Any]:
-        """Query the RAG system with a question."""
+        # Built once and shared by every question; retrieval happens per question so the
+        # context and search knobs of concurrent requests never touch shared state
+        self.qa_chain = load_qa_chain(self.llm, chain_type="stuff")
+        # Same prompt the stuff chain uses, for the streaming path
+        self.qa_prompt = PROMPT_SELECTOR.get_prompt(self.llm)
+
+    def _retriever(self, context_id: Optional[str], search_kwargs: Optional[Dict[str, Any]]) -> CustomRetriever:
+        return self.vector_store.as_retriever(search_kwargs={"k": 4, **(search_kwargs or {})}, context_id=context_id)
+
+    async def query(
+        self, question: str, context_id: Optional[str] = None, search_kwargs: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Query the RAG system with a question within a context, optionally overriding the search kwargs."""
         try:
-            response = await self.chain.ainvoke({"question": question})
-            return {"answer": response.get("answer"), "source_documents": response.get("source_documents")}
+            documents = await self._retriever(context_id, search_kwargs).ainvoke(question)
+            response = await self.qa_chain.ainvoke({"input_documents": documents, "question": question})
+            return {"answer": response.get("output_text"), "source_documents": documents}
         except Exception as e:
             raise Exception(f"Error querying RAG system: {str(e)}")
+
+    async def astream(
+        self, question: str, context_id: Optional[str] = None, search_kwargs: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield ("documents", retrieved documents) once, then ("token", text) as the LLM generates."""
+        try:
+            documents = await self._retriever(context_id, search_kwargs).ainvoke(question)
+            yield "documents", documents
+
+            context = "\n\n".join(doc.page_content for doc in documents)
+            async for chunk in self.llm.astream(self.qa_prompt.format_messages(context=context, question=question)):
+                if chunk.content:
+                    yield "token", chunk.content
+        except Exception as e:
+            raise Exception(f"Error streaming from RAG system: {str(e)}")
@@ -3,13 +3,27 @@ from langchain_openai import OpenAIEmbeddings
 from langchain.schema import Document as LangchainDocument
 from langchain.schema.retriever import BaseRetriever
 
-from dudoxx.database.pgvector.models import Document as DocumentModel
+from dudoxx.database.pgvector.models import Document as DocumentModel, TEXT_SEARCH_CONFIG
 from dudoxx.config import Settings
 from functools import lru_cache
 from pydantic import Field
+from sqlalchemy import delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+import hashlib
 import json
+import numpy as np
 
-from dudoxx.database.pgvector.database import get_db
+from dudoxx.database.pgvector.database import (
+    drop_context_partition,
+    ensure_context_partition,
+    get_raw_connection,
+    get_session,
+)
+from dudoxx.services.embedding_cache_service import CachedEmbeddings
+from dudoxx.services.redis_service import RedisCacheService
+from dudoxx.services.semantic_cache_service import bump_context_version
 
 
 @lru_cache()
@@ -17,6 +31,11 @@ def get_settings() -> Settings:
     return Settings()
 
 
+def content_hash(chunk: str) -> str:
+    """Hash identifying a chunk's content within a context."""
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
 class CustomRetriever(BaseRetriever):
     """Custom retriever that works with our VectorStore."""
 
@@ -33,7 +52,12 @@ class CustomRetriever(BaseRetriever):
     ) -> List[LangchainDocument]:
         """Get documents relevant to the query."""
         return await self.vectorstore.similarity_search(
-            query, k=self.search_kwargs.get("k", 4), context_id=self.context_id
+            query,
+            k=self.search_kwargs.get("k", 4),
+            context_id=self.context_id,
+            ef_search=self.search_kwargs.get("ef_search"),
+            probes=self.search_kwargs.get("probes"),
+            mode=self.search_kwargs.get("mode"),
         )
 
     def _get_relevant_documents(
@@ -52,9 +76,10 @@ class VectorStore:
     def __init__(self, default_context_id: Optional[str] = None) -> None:
         """Initialize vector store with OpenAI embeddings and optional default context ID."""
         self.settings = get_settings()
-        self.embeddings = OpenAIEmbeddings(openai_api_key=self.settings.OPENAI_API_KEY)
-        self.db = next(get_db())
+        openai_embeddings = OpenAIEmbeddings(openai_api_key=self.settings.OPENAI_API_KEY)
+        self.embeddings = CachedEmbeddings(openai_embeddings, model=openai_embeddings.model)
         self.default_context_id = default_context_id
+        self.cache_service = RedisCacheService()
 
     def as_retriever(self, search_kwargs: Optional[dict] = None, context_id: Optional[str] = None) -> CustomRetriever:
         """Return a retriever interface with optional context isolation."""
@@ -63,7 +88,11 @@ class VectorStore:
         )
 
     async def add_documents(
-        self, texts: List[str], metadatas: Optional[List[Dict[str, Any]]] = None, context_id: Optional[str] = None
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        context_id: Optional[str] = None,
+        mode: Optional[str] = None,
     ) -> None:
         """Add documents to the vector store with context isolation."""
         if metadatas is None:
@@ -74,58 +103,265 @@ class VectorStore:
         if context_id:
             metadatas = [{**metadata, "context_id": context_id} for metadata in metadatas]
 
+        # Only embed chunks the context does not hold yet
+        new = await self.filter_new_chunks(texts, context_id)
+        if not new:
+            return
+        texts = [texts[i] for i in new]
+        metadatas = [metadatas[i] for i in new]
+
         embeddings = await self.embeddings.aembed_documents(texts)
+        await self.insert_embeddings(texts, metadatas, embeddings, context_id=context_id, mode=mode)
+
+    def _context_filter(self, context_id: Optional[str]):
+        return DocumentModel.context_id == context_id if context_id else DocumentModel.context_id.is_(None)
+
+    async def has_document(self, doc_id: str, context_id: Optional[str] = None) -> bool:
+        """Whether chunks of a document are already stored in the context."""
+        stmt = select(DocumentModel.id).where(self._context_filter(context_id), DocumentModel.doc_id == doc_id)
+        async with get_session() as session:
+            return (await session.execute(stmt.limit(1))).first() is not None
+
+    async def filter_new_chunks(
+        self, texts: List[str], context_id: Optional[str] = None, seen: Optional[set] = None
+    ) -> List[int]:
+        """
+        Return the positions of texts not yet stored in the context.
+
+        Repeats within texts are dropped too; pass a shared seen set to dedupe across calls.
+        """
+        seen = set() if seen is None else seen
+        candidates: Dict[str, int] = {}
+        for i, chunk in enumerate(texts):
+            digest = content_hash(chunk)
+            if digest not in seen and digest not in candidates:
+                candidates[digest] = i
+        seen.update(candidates)
+        if not candidates:
+            return []
+
+        stmt = select(DocumentModel.content_hash).where(
+            self._context_filter(context_id), DocumentModel.content_hash.in_(list(candidates))
+        )
+        async with get_session() as session:
+            stored = set((await session.execute(stmt)).scalars().all())
+        return sorted(i for digest, i in candidates.items() if digest not in stored)
+
+    async def insert_embeddings(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        context_id: Optional[str] = None,
+        mode: Optional[str] = None,
+    ) -> None:
+        """Store already embedded chunks, via binary COPY or ORM inserts."""
+        mode = (mode or self.settings.PGVECTOR_INGEST_MODE).lower()
+        await ensure_context_partition(context_id)
+        if mode == "copy":
+            await self._copy_rows(texts, metadatas, embeddings, context_id)
+        elif mode == "orm":
+            await self._insert_rows(texts, metadatas, embeddings, context_id)
+        else:
+            raise ValueError(f"Unsupported ingest mode: {mode}")
+        await bump_context_version(self.cache_service, context_id)
+
+    async def _insert_rows(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        context_id: Optional[str],
+    ) -> None:
+        """Insert one row per chunk, skipping chunks the context already holds."""
+        rows = [
+            {
+                "content": chunk,
+                "metadata_": json.dumps(metadata) if metadata else None,
+                "embedding": embedding,
+                "context_id": context_id,
+                "doc_id": metadata.get("doc_id"),
+                "content_hash": content_hash(chunk),
+            }
+            for chunk, metadata, embedding in zip(texts, metadatas, embeddings)
+        ]
+
+        async with get_session() as session:
+            await session.execute(insert(DocumentModel).on_conflict_do_nothing(), rows)
+            await session.commit()
+
+    async def _copy_rows(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: List[List[float]],
+        context_id: Optional[str],
+    ) -> None:
+        """
+        Stream chunks with binary COPY in batches of PGVECTOR_COPY_BATCH_SIZE, one transaction overall.
 
-        try:
-            documents = [
-                DocumentModel(
-                    content=text,
-                    metadata_=json.dumps(metadata) if metadata else None,
-                    embedding=embedding,
-                    context_id=context_id,
+        COPY cannot skip conflicting rows, so rows go through a temporary staging table
+        and are moved with INSERT ... ON CONFLICT DO NOTHING.
+        """
+        batch_size = self.settings.PGVECTOR_COPY_BATCH_SIZE
+        # metadata_ holds a JSON-encoded string, same as the ORM path writes it
+        records = [
+            (
+                chunk,
+                json.dumps(json.dumps(metadata)) if metadata else None,
+                np.asarray(embedding, dtype=np.float32),
+                context_id,
+                metadata.get("doc_id"),
+                content_hash(chunk),
+            )
+            for chunk, metadata, embedding in zip(texts, metadatas, embeddings)
+        ]
+        columns = ["content", "metadata_", "embedding", "context_id", "doc_id", "content_hash"]
+
+        async with get_raw_connection() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    "CREATE TEMP TABLE documents_staging (content text, metadata_ jsonb, embedding vector(1536), "
+                    "context_id varchar, doc_id varchar, content_hash varchar) ON COMMIT DROP"
+                )
+                for start in range(0, len(records), batch_size):
+                    await conn.copy_records_to_table(
+                        "documents_staging", records=records[start : start + batch_size], columns=columns
+                    )
+                await conn.execute(
+                    f"INSERT INTO {DocumentModel.__tablename__} ({', '.join(columns)}) "
+                    f"SELECT {', '.join(columns)} FROM documents_staging ON CONFLICT DO NOTHING"
                 )
-                for text, metadata, embedding in zip(texts, metadatas, embeddings)
-            ]
 
-            self.db.add_all(documents)
-            self.db.commit()
-        except Exception as e:
-            self.db.rollback()
-            raise e
-        finally:
-            self.db.close()
+    async def _apply_search_params(
+        self, session: AsyncSession, rows: int, ef_search: Optional[int] = None, probes: Optional[int] = None
+    ) -> None:
+        """Set the ANN recall knobs for the current transaction only; rows is what the vector scan must return."""
+        index_type = self.settings.PGVECTOR_INDEX_TYPE.lower()
+        if index_type == "hnsw":
+            # HNSW never returns more than ef_search rows, so keep it at least rows
+            value = max(ef_search or self.settings.PGVECTOR_HNSW_EF_SEARCH, rows)
+            await session.execute(text("SELECT set_config('hnsw.ef_search', :value, true)"), {"value": str(value)})
+        elif index_type == "ivfflat":
+            value = probes or self.settings.PGVECTOR_IVFFLAT_PROBES
+            await session.execute(text("SELECT set_config('ivfflat.probes', :value, true)"), {"value": str(value)})
+
+    def _vector_statement(self, query_embedding: List[float], k: int, context_id: Optional[str]) -> Select:
+        """Nearest neighbours by cosine distance."""
+        stmt = select(DocumentModel).order_by(DocumentModel.embedding.cosine_distance(query_embedding))
+        if context_id:
+            stmt = stmt.where(DocumentModel.context_id == context_id)
+        return stmt.limit(k)
+
+    def _hybrid_candidates(self, k: int) -> int:
+        """Rows each ranking of a hybrid search contributes."""
+        return max(self.settings.HYBRID_CANDIDATES, k)
+
+    def _hybrid_statement(self, query: str, query_embedding: List[float], k: int, context_id: Optional[str]) -> Select:
+        """
+        Full-text and vector rankings merged with reciprocal rank fusion in a single statement.
+
+        Each side contributes its top HYBRID_CANDIDATES rows; a row scores
+        sum(1 / (HYBRID_RRF_K + rank)) over the rankings it appears in.
+        """
+        candidates = self._hybrid_candidates(k)
+        rrf_k = self.settings.HYBRID_RRF_K
+        filters = [DocumentModel.context_id == context_id] if context_id else []
+
+        distance = DocumentModel.embedding.cosine_distance(query_embedding).label("distance")
+        vector_hits = select(DocumentModel.id, distance).where(*filters).order_by(distance).limit(candidates).subquery()
+        vector_ranked = select(
+            vector_hits.c.id, func.row_number().over(order_by=vector_hits.c.distance).label("rank")
+        ).subquery()
+
+        tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+        text_score = func.ts_rank_cd(DocumentModel.content_tsv, tsquery).label("text_score")
+        text_hits = (
+            select(DocumentModel.id, text_score)
+            .where(DocumentModel.content_tsv.op("@@")(tsquery), *filters)
+            .order_by(text_score.desc())
+            .limit(candidates)
+            .subquery()
+        )
+        text_ranked = select(
+            text_hits.c.id, func.row_number().over(order_by=text_hits.c.text_score.desc()).label("rank")
+        ).subquery()
+
+        fused = (
+            select(
+                func.coalesce(vector_ranked.c.id, text_ranked.c.id).label("id"),
+                (
+                    func.coalesce(literal(1.0) / (rrf_k + vector_ranked.c.rank), 0)
+                    + func.coalesce(literal(1.0) / (rrf_k + text_ranked.c.rank), 0)
+                ).label("score"),
+            )
+            .select_from(vector_ranked.join(text_ranked, vector_ranked.c.id == text_ranked.c.id, full=True))
+            .subquery()
+        )
+        return (
+            select(DocumentModel)
+            .join(fused, DocumentModel.id == fused.c.id)
+            .where(*filters)
+            .order_by(fused.c.score.desc(), DocumentModel.id)
+            .limit(k)
+        )
 
     async def similarity_search(
-        self, query: str, k: int = 4, context_id: Optional[str] = None
+        self,
+        query: str,
+        k: int = 4,
+        context_id: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        mode: Optional[str] = None,
     ) -> List[LangchainDocument]:
-        """Perform similarity search for the given query within a specific context."""
+        """
+        Perform similarity search for the given query within a specific context.
+
+        ef_search (HNSW) and probes (IVFFlat) trade latency for recall on this query only.
+        mode "hybrid" fuses full-text and vector rankings, which catches exact drug names
+        and codes that embeddings alone tend to miss.
+        """
         query_embedding = await self.embeddings.aembed_query(query)
+        context_id = context_id or self.default_context_id
 
-        try:
-            # Base query
-            query = self.db.query(DocumentModel).order_by(DocumentModel.embedding.cosine_distance(query_embedding))
+        mode = (mode or self.settings.RETRIEVAL_MODE).lower()
+        if mode == "hybrid":
+            stmt = self._hybrid_statement(query, query_embedding, k, context_id)
+            vector_rows = self._hybrid_candidates(k)
+        elif mode == "vector":
+            stmt = self._vector_statement(query_embedding, k, context_id)
+            vector_rows = k
+        else:
+            raise ValueError(f"Unsupported retrieval mode: {mode}")
 
-            # Add context filter if provided
-            context_id = context_id or self.default_context_id
-            if context_id:
-                query = query.filter(DocumentModel.context_id == context_id)
+        async with get_session() as session:
+            await self._apply_search_params(session, vector_rows, ef_search=ef_search, probes=probes)
+            results = (await session.execute(stmt)).scalars().all()
 
-            results = query.limit(k).all()
+        return [
+            LangchainDocument(page_content=doc.content, metadata=json.loads(doc.metadata_) if doc.metadata_ else {})
+            for doc in results
+        ]
 
-            return [
-                LangchainDocument(page_content=doc.content, metadata=json.loads(doc.metadata_) if doc.metadata_ else {})
-                for doc in results
-            ]
-        finally:
-            self.db.close()
+    async def delete_document(self, doc_id: str, context_id: Optional[str] = None) -> None:
+        """Delete the chunks of one document from a context."""
+        async with get_session() as session:
+            await session.execute(
+                delete(DocumentModel).where(self._context_filter(context_id), DocumentModel.doc_id == doc_id)
+            )
+            await session.commit()
+        await bump_context_version(self.cache_service, context_id)
 
     async def delete_documents(self, context_id: str) -> None:
-        """Delete all documents for a specific context ID."""
-        try:
-            self.db.query(DocumentModel).filter(DocumentModel.context_id == context_id).delete()
-            self.db.commit()
-        except Exception as e:
-            self.db.rollback()
-            raise e
-        finally:
-            self.db.close()
+        """
+        Delete all documents for a specific context ID.
+
+        With list partitioning the context's partition is dropped; the DELETE then only
+        touches rows that were stored outside it (and prunes to one partition for hash).
+        """
+        await drop_context_partition(context_id)
+        async with get_session() as session:
+            await session.execute(delete(DocumentModel).where(DocumentModel.context_id == context_id))
+            await session.commit()
+        await bump_context_version(self.cache_service, context_id)
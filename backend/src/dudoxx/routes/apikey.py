@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi_limiter.depends import RateLimiter
+from dudoxx.services.rate_limit_service import RateLimiter
 
 from dudoxx.exceptions.apikey_exceptions import APIKeyError, ApiKeyNotFound, APIKeyRevocationError, APIKeyCreationError
 from dudoxx.services.api_key_management_service import APIKeyManagerService, ApiKeyMiddleware
@@ -0,0 +1,14 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from dudoxx.services.api_key_management_service import ApiKeyMiddleware
+from dudoxx.services.redis_service import get_redis_stats
+
+router = APIRouter()
+
+
+@router.get("/cache/stats", dependencies=[Depends(ApiKeyMiddleware())])
+async def cache_stats() -> Dict[str, Any]:
+    """Redis connection pool usage and per-operation latencies of this process."""
+    return get_redis_stats()
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, UploadFile, File, BackgroundTasks, Depends, HTTPException, Request
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request
 import uuid
-from fastapi_limiter.depends import RateLimiter
+from dudoxx.services.rate_limit_service import RateLimiter
 
 from dudoxx.services.deepgrame_service import DeepgramService
 from dudoxx.schemas.deepgram import AudioTaskResponse, AudioTranscriptionResponse
 from dudoxx.services.api_key_management_service import ApiKeyMiddleware
+from dudoxx.services.service_registry import get_service
+from dudoxx.services.upload_service import get_settings, save_upload
+from dudoxx.services.job_queue_service import TRANSCRIBE_DEEPGRAM, get_job_queue
+from dudoxx.exceptions.upload_exceptions import UploadTooLargeError
 
 router = APIRouter()
 
@@ -13,22 +17,29 @@ router = APIRouter()
     "/transcribe/",
     dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=6, seconds=60))],
 )
-async def transcribe_audio(
-    background_tasks: BackgroundTasks,
-    audio: UploadFile = File(...),
-    service: DeepgramService = Depends(DeepgramService),
-) -> AudioTaskResponse:
+async def transcribe_audio(audio: UploadFile = File(...)) -> AudioTaskResponse:
     if audio.content_type not in ["audio/wav", "audio/mpeg", "audio/flac"]:
         raise HTTPException(status_code=400, detail="Unsupported file type. Please upload a WAV, MP3, or FLAC file.")
+    try:
+        upload = await save_upload(audio, get_settings().UPLOAD_DIR, get_settings().UPLOAD_MAX_AUDIO_BYTES)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     task_id = str(uuid.uuid4())
-    background_tasks.add_task(service.process_transcription, audio, task_id)
+    await get_job_queue().enqueue(
+        TRANSCRIBE_DEEPGRAM,
+        {"temp_file_path": upload.path, "task_id": task_id},
+        task_id=task_id,
+        pending_status={"status": "processing", "progress": 0},
+        failed_status={"status": "failed", "progress": 0},
+        files=[upload.path],
+    )
 
     return AudioTaskResponse(task_id=task_id, status="processing")
 
 
 @router.get("/transcription/{task_id}", dependencies=[Depends(ApiKeyMiddleware())])
 async def get_transcription(
-    task_id: str, service: DeepgramService = Depends(DeepgramService)
+    task_id: str, service: DeepgramService = Depends(get_service(DeepgramService))
 ) -> AudioTranscriptionResponse:
     result = await service.get_transcription_result(task_id)
     if result is None:
@@ -1,22 +1,72 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Optional
-from fastapi_limiter.depends import RateLimiter
+from fastapi.responses import StreamingResponse
+from functools import lru_cache
+from typing import AsyncIterator, Optional
+from dudoxx.services.rate_limit_service import RateLimiter
 
 from dudoxx.services.duckduckgo_service import DuckDuckGOService
 from dudoxx.services.api_key_management_service import ApiKeyMiddleware
-from dudoxx.schemas.duckduckgo import DrugInfo, DiseaseInfo
+from dudoxx.schemas.duckduckgo import DrugInfo, DiseaseInfo, DrugBatchRequest, DiseaseBatchRequest
+from dudoxx.services.service_registry import get_service
+from dudoxx.config import Settings
 
 
 router = APIRouter()
 
 
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+def _check_batch_size(names: list) -> None:
+    max_items = get_settings().DDG_BATCH_MAX_ITEMS
+    if len(names) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"At most {max_items} names per request"
+        )
+
+
+def ndjson_response(items: AsyncIterator) -> StreamingResponse:
+    """Stream pydantic models as newline-delimited JSON, one line each as soon as it is ready."""
+
+    async def body() -> AsyncIterator[str]:
+        async for item in items:
+            yield item.model_dump_json(exclude_none=True) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.post("/drug_info/batch", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))])
+async def drug_info_batch(
+    request: DrugBatchRequest, service: DuckDuckGOService = Depends(get_service(DuckDuckGOService))
+) -> StreamingResponse:
+    """
+    Look up several drugs in one request. Each line of the response is
+    {"name", "result"} or {"name", "error"}; cached drugs come first, the rest as they finish.
+    """
+    _check_batch_size(request.names)
+    return ndjson_response(service.drug_info_batch(request.names, request.include_interactions))
+
+
+@router.post(
+    "/disease_info/batch", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))]
+)
+async def disease_info_batch(
+    request: DiseaseBatchRequest, service: DuckDuckGOService = Depends(get_service(DuckDuckGOService))
+) -> StreamingResponse:
+    """Look up several diseases in one request, streamed as NDJSON like /drug_info/batch."""
+    _check_batch_size(request.names)
+    return ndjson_response(service.disease_info_batch(request.names, request.include_treatments))
+
+
 @router.get(
     "/drug_info/{drug_name}", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))]
 )
 async def drug_info(
     drug_name: str,
     include_interactions: Optional[bool] = False,
-    service: DuckDuckGOService = Depends(DuckDuckGOService),
+    service: DuckDuckGOService = Depends(get_service(DuckDuckGOService)),
 ) -> DrugInfo:
     try:
         return await service.drug_info(drug_name, include_interactions)
@@ -31,7 +81,7 @@ async def drug_info(
 async def disease_info(
     disease_name: str,
     include_treatments: Optional[bool] = False,
-    service: DuckDuckGOService = Depends(DuckDuckGOService),
+    service: DuckDuckGOService = Depends(get_service(DuckDuckGOService)),
 ) -> DiseaseInfo:
     try:
         return await service.disease_info(disease_name, include_treatments)
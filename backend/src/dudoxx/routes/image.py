@@ -1,17 +1,18 @@
 from fastapi import APIRouter, File, HTTPException, UploadFile, Depends, status
-from fastapi_limiter.depends import RateLimiter
+from dudoxx.services.rate_limit_service import RateLimiter
 
 from dudoxx.services.image_service import ImageService
 from dudoxx.schemas.image import ImageDescription
 from dudoxx.services.api_key_management_service import ApiKeyMiddleware
 from dudoxx.exceptions.image_exceptions import ErrorProcessingImage, ErrorEncodingImage
+from dudoxx.services.service_registry import get_service
 
 router = APIRouter()
 
 
 @router.post("/describe_image", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))])
 async def describe_image(
-    file: UploadFile = File(...), service: ImageService = Depends(ImageService)
+    file: UploadFile = File(...), service: ImageService = Depends(get_service(ImageService))
 ) -> ImageDescription:
     try:
         if file.content_type not in ["image/jpeg", "image/png"]:
@@ -1,15 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi_limiter.depends import RateLimiter
+from fastapi.responses import StreamingResponse
+from dudoxx.services.rate_limit_service import RateLimiter
 
 from dudoxx.services.rag_service import RAGService, RAGServiceError
 from dudoxx.schemas.rag import Query, EnhancedAnswer, StructuredAnswer
 from dudoxx.services.api_key_management_service import ApiKeyMiddleware
+from dudoxx.services.sse_service import sse_response
+from dudoxx.services.service_registry import get_service
 
 router = APIRouter()
 
 
 @router.post("/search", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))])
-async def search(query: Query, service: RAGService = Depends(RAGService)) -> dict:
+async def search(query: Query, service: RAGService = Depends(get_service(RAGService))) -> dict:
     try:
         await service.search_and_store(query.text)
         return {"message": "Search completed and results stored successfully"}
@@ -18,7 +21,7 @@ async def search(query: Query, service: RAGService = Depends(RAGService)) -> dic
 
 
 @router.post("/answer", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))])
-async def get_answer(query: Query, service: RAGService = Depends(RAGService)) -> EnhancedAnswer:
+async def get_answer(query: Query, service: RAGService = Depends(get_service(RAGService))) -> EnhancedAnswer:
     try:
         structured_answer: StructuredAnswer = await service.get_answer(query.text)
         return EnhancedAnswer(
@@ -31,7 +34,9 @@ async def get_answer(query: Query, service: RAGService = Depends(RAGService)) ->
 @router.post(
     "/conversational_answer", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))]
 )
-async def get_conversational_answer(query: Query, service: RAGService = Depends(RAGService)) -> EnhancedAnswer:
+async def get_conversational_answer(
+    query: Query, service: RAGService = Depends(get_service(RAGService))
+) -> EnhancedAnswer:
     try:
         response = await service.get_conversational_answer(query.text)
         return EnhancedAnswer(
@@ -39,3 +44,20 @@ async def get_conversational_answer(query: Query, service: RAGService = Depends(
         )
     except RAGServiceError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post("/answer/stream", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))])
+async def stream_answer(query: Query, service: RAGService = Depends(get_service(RAGService))) -> StreamingResponse:
+    """Stream the answer as server-sent events: sources, then tokens, then confidence."""
+    return sse_response(service.stream_answer(query.text))
+
+
+@router.post(
+    "/conversational_answer/stream",
+    dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))],
+)
+async def stream_conversational_answer(
+    query: Query, service: RAGService = Depends(get_service(RAGService))
+) -> StreamingResponse:
+    """Stream the conversational answer as server-sent events: sources, then tokens, then confidence."""
+    return sse_response(service.stream_conversational_answer(query.text))
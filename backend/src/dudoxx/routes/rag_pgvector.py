@@ -1,9 +1,14 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, BackgroundTasks, Header
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Header, Request
 from dudoxx.schemas.rag_pgvector import QuestionRequest, QuestionResponse, DocumentTaskResponse
 from dudoxx.services.rag_pgvector_service import RAGService
-import aiofiles
+from dudoxx.database.pgvector.database import get_pool_stats
+from dudoxx.services.sse_service import sse_response
+from dudoxx.services.upload_service import get_settings, save_upload
+from dudoxx.services.job_queue_service import INGEST_DOCUMENT, get_job_queue
+from dudoxx.exceptions.upload_exceptions import UploadTooLargeError
+from fastapi.responses import StreamingResponse
 import os
-from fastapi_limiter.depends import RateLimiter
+from dudoxx.services.rate_limit_service import RateLimiter
 import uuid
 from dudoxx.services.api_key_management_service import ApiKeyMiddleware
 from typing import Optional
@@ -20,11 +25,11 @@ async def get_context_id(x_context_id: Optional[str] = Header(None)) -> Optional
     return x_context_id
 
 
-async def get_rag_service(context_id: str = Depends(get_context_id)) -> RAGService:
+def get_rag_service(request: Request) -> RAGService:
     """
-    Dependency to get RAG service with context.
+    Dependency to get the app's shared RAG service; the context is passed to each call.
     """
-    return RAGService(default_context_id=context_id)
+    return request.app.state.services.get(RAGService)
 
 
 @router.post(
@@ -33,10 +38,8 @@ async def get_rag_service(context_id: str = Depends(get_context_id)) -> RAGServi
     response_model=DocumentTaskResponse,
 )
 async def upload_document(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     context_id: str = Depends(get_context_id),
-    service: RAGService = Depends(get_rag_service),
 ) -> DocumentTaskResponse:
     """
     Upload a PDF document for RAG processing within a specific context.
@@ -47,29 +50,33 @@ async def upload_document(
     if not context_id:
         raise HTTPException(status_code=400, detail="Context ID is required for document upload")
 
-    unique_filename = f"{context_id}_{uuid.uuid4()}_{file.filename}"
-    temp_file_path = os.path.join("temp", unique_filename)
-    os.makedirs("temp", exist_ok=True)
-
+    settings = get_settings()
     try:
-        async with aiofiles.open(temp_file_path, "wb") as out_file:
-            content = await file.read()
-            await out_file.write(content)
+        upload = await save_upload(file, settings.UPLOAD_DIR, settings.UPLOAD_MAX_PDF_BYTES, prefix=f"{context_id}_")
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
+    try:
         task_id = str(uuid.uuid4())
 
-        # Add context_id to the background task
-        background_tasks.add_task(service.process_document, temp_file_path, task_id, context_id)
-
-        # Initialize task status in cache with context information
-        await service.cache_service.set(task_id, {"status": "Ingesting", "progress": 0, "context_id": context_id})
+        # The hash computed while saving is the document ID, so ingestion need not re-read the file
+        await get_job_queue().enqueue(
+            INGEST_DOCUMENT,
+            {"file_path": upload.path, "task_id": task_id, "context_id": context_id, "doc_id": upload.sha256},
+            task_id=task_id,
+            pending_status={"status": "Ingesting", "progress": 0, "context_id": context_id},
+            failed_status={"status": "Failed", "progress": 100, "context_id": context_id},
+            files=[upload.path],
+        )
 
         return DocumentTaskResponse(task_id=task_id, status="Ingesting", progress=0, context_id=context_id)
 
     except Exception as e:
         # Clean up the file in case of error
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        if os.path.exists(upload.path):
+            os.remove(upload.path)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -83,7 +90,7 @@ async def get_document_status(
     Get the status of a document processing task within a context.
     """
     try:
-        task_data = await service.cache_service.get(task_id)
+        task_data = await service.task_status.get(task_id)
         if not task_data:
             raise HTTPException(status_code=404, detail="Task not found")
 
@@ -109,11 +116,38 @@ async def ask_question(
     Ask a question using the RAG system within a specific context.
     """
     try:
-        return await service.get_answer(question=request.question, context_id=context_id)
+        return await service.get_answer(
+            question=request.question,
+            context_id=context_id,
+            ef_search=request.ef_search,
+            probes=request.probes,
+            search_mode=request.search_mode,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post(
+    "/rag/question/stream", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))]
+)
+async def ask_question_stream(
+    request: QuestionRequest, context_id: str = Depends(get_context_id), service: RAGService = Depends(get_rag_service)
+) -> StreamingResponse:
+    """
+    Ask a question within a context and stream the answer as server-sent events:
+    sources first, then tokens as they are generated, then the confidence score.
+    """
+    return sse_response(
+        service.stream_answer(
+            question=request.question,
+            context_id=context_id,
+            ef_search=request.ef_search,
+            probes=request.probes,
+            search_mode=request.search_mode,
+        )
+    )
+
+
 @router.delete("/documents/context/{context_id}", dependencies=[Depends(ApiKeyMiddleware())])
 async def delete_context(context_id: str, service: RAGService = Depends(get_rag_service)) -> dict:
     """
@@ -124,3 +158,19 @@ async def delete_context(context_id: str, service: RAGService = Depends(get_rag_
         return {"message": f"Successfully deleted context: {context_id}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/documents/pool_stats", dependencies=[Depends(ApiKeyMiddleware())])
+async def pool_stats() -> dict:
+    """
+    Get connection pool size and wait-time statistics for the vector store.
+    """
+    return get_pool_stats()
+
+
+@router.get("/documents/embedding_cache_stats", dependencies=[Depends(ApiKeyMiddleware())])
+async def embedding_cache_stats(service: RAGService = Depends(get_rag_service)) -> dict:
+    """
+    Get hit/miss counters of the embedding cache used for ingestion and questions.
+    """
+    return service.vector_store.embeddings.cache.stats()
@@ -1,25 +1,31 @@
 # speech_router.py
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 import uuid
-from fastapi_limiter.depends import RateLimiter
+from dudoxx.services.rate_limit_service import RateLimiter
 
 from dudoxx.services.speech_service import SpeechService
 from dudoxx.schemas.speech import SpeechRequest, SpeechTaskResponse
 from dudoxx.services.api_key_management_service import ApiKeyMiddleware
+from dudoxx.services.service_registry import get_service
+from dudoxx.services.job_queue_service import GENERATE_SPEECH, get_job_queue
 
 router = APIRouter()
 
 
 @router.post("/generate_speech", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))])
-async def generate_speech(
-    request: SpeechRequest, background_tasks: BackgroundTasks, service: SpeechService = Depends(SpeechService)
-) -> SpeechTaskResponse:
+async def generate_speech(request: SpeechRequest) -> SpeechTaskResponse:
     """Initiate speech generation task"""
     task_id = str(uuid.uuid4())
 
-    # Add the generation task to background tasks
-    background_tasks.add_task(service.process_speech_generation, request.text, task_id, request.voice)
+    # Queue the generation for the job workers
+    await get_job_queue().enqueue(
+        GENERATE_SPEECH,
+        {"text": request.text, "task_id": task_id, "voice": request.voice},
+        task_id=task_id,
+        pending_status={"status": "processing", "progress": 0},
+        failed_status={"status": "failed", "progress": 0},
+    )
 
     return SpeechTaskResponse(task_id=task_id, status="processing", progress=0)
 
@@ -27,9 +33,11 @@ async def generate_speech(
 @router.get(
     "/speech_status/{task_id}", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))]
 )
-async def get_speech_status(task_id: str, service: SpeechService = Depends(SpeechService)) -> SpeechTaskResponse:
+async def get_speech_status(
+    task_id: str, service: SpeechService = Depends(get_service(SpeechService))
+) -> SpeechTaskResponse:
     """Check the status of a speech generation task"""
-    task_data = await service.cache_service.get(task_id)
+    task_data = await service.task_status.get(task_id)
 
     if not task_data:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -40,7 +48,7 @@ async def get_speech_status(task_id: str, service: SpeechService = Depends(Speec
 @router.get(
     "/download_speech/{task_id}", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))]
 )
-async def download_speech(task_id: str, service: SpeechService = Depends(SpeechService)):
+async def download_speech(task_id: str, service: SpeechService = Depends(get_service(SpeechService))):
     """Download the generated speech file"""
     file_path, content_type = await service.get_speech_file(task_id)
 
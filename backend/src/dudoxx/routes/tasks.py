@@ -0,0 +1,21 @@
+import uuid
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from dudoxx.services.api_key_management_service import ApiKeyMiddleware
+from dudoxx.services.job_queue_service import get_job_queue
+from dudoxx.services.sse_service import sse_response
+
+router = APIRouter()
+
+
+@router.get("/tasks/{task_id}/events", dependencies=[Depends(ApiKeyMiddleware())])
+async def task_events(task_id: uuid.UUID) -> StreamingResponse:
+    """
+    Stream a background task's progress as server-sent events: a "status" event with
+    the current status and one per update until the task completes or fails, and
+    "ping" events while it is idle. Replaces polling the per-service status routes.
+    """
+    # Typed as a UUID so the stream can only read task records, not arbitrary keys
+    return sse_response(get_job_queue().task_status.events(str(task_id)))
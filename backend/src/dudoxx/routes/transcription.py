@@ -1,25 +1,41 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Query, BackgroundTasks, Depends
+from fastapi import APIRouter, File, UploadFile, HTTPException, Query, Depends
 from fastapi.responses import JSONResponse
 import uuid
-from fastapi_limiter.depends import RateLimiter
+from dudoxx.services.rate_limit_service import RateLimiter
 
 from dudoxx.services.transcription_service import TranscriptionService
 from dudoxx.schemas.transcription import TranscriptionResponse, TaskResponse
 from dudoxx.services.api_key_management_service import ApiKeyMiddleware
+from dudoxx.services.service_registry import get_service
+from dudoxx.services.upload_service import get_settings, save_upload
+from dudoxx.services.job_queue_service import TRANSCRIBE_AUDIO, get_job_queue
+from dudoxx.exceptions.upload_exceptions import UploadTooLargeError
 
 router = APIRouter()
 
+SUPPORTED_AUDIO_TYPES = ["audio/mpeg", "audio/wav", "audio/x-m4a"]
+
 
 @router.post("/transcribe_audio", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))])
 async def transcribe_audio(
-    background_tasks: BackgroundTasks,
     audio: UploadFile = File(...),
     target_language: str = Query("en", description="ISO 639-1 code for the target language"),
-    service: TranscriptionService = Depends(TranscriptionService),
 ) -> TaskResponse:
+    if audio.content_type not in SUPPORTED_AUDIO_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported audio format")
+    try:
+        upload = await save_upload(audio, get_settings().UPLOAD_DIR, get_settings().UPLOAD_MAX_AUDIO_BYTES)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     task_id = str(uuid.uuid4())
-    await service.cache_service.set(task_id, {"status": "processing"})
-    background_tasks.add_task(service.process_audio, audio, target_language, task_id)
+    await get_job_queue().enqueue(
+        TRANSCRIBE_AUDIO,
+        {"file_path": upload.path, "target_language": target_language, "task_id": task_id},
+        task_id=task_id,
+        pending_status={"status": "processing"},
+        failed_status={"status": "failed"},
+        files=[upload.path],
+    )
     return TaskResponse(
         task_id=task_id,
         status="processing",
@@ -31,9 +47,9 @@ async def transcribe_audio(
     "/task_status/{task_id}", dependencies=[Depends(ApiKeyMiddleware()), Depends(RateLimiter(times=5, seconds=60))]
 )
 async def get_task_status(
-    task_id: str, service: TranscriptionService = Depends(TranscriptionService)
+    task_id: str, service: TranscriptionService = Depends(get_service(TranscriptionService))
 ) -> TranscriptionResponse:
-    task = await service.cache_service.get(task_id)
+    task = await service.task_status.get(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     if task["status"] == "processing":
@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
 
 class DrugInfo(BaseModel):
@@ -16,3 +16,27 @@ class DiseaseInfo(BaseModel):
     symptoms: str
     causes: str
     treatments: Optional[str] = None
+
+
+class DrugBatchRequest(BaseModel):
+    names: List[str] = Field(min_length=1)
+    include_interactions: bool = False
+
+
+class DiseaseBatchRequest(BaseModel):
+    names: List[str] = Field(min_length=1)
+    include_treatments: bool = False
+
+
+class DrugInfoBatchItem(BaseModel):
+    """One line of the NDJSON batch response: the result or the error for one name."""
+
+    name: str
+    result: Optional[DrugInfo] = None
+    error: Optional[str] = None
+
+
+class DiseaseInfoBatchItem(BaseModel):
+    name: str
+    result: Optional[DiseaseInfo] = None
+    error: Optional[str] = None
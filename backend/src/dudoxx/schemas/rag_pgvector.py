@@ -1,9 +1,14 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 
 class QuestionRequest(BaseModel):
     question: str
+    ef_search: Optional[int] = Field(default=None, ge=1, le=1000, description="HNSW candidate list size for this query")
+    probes: Optional[int] = Field(default=None, ge=1, description="IVFFlat lists to probe for this query")
+    search_mode: Optional[Literal["vector", "hybrid"]] = Field(
+        default=None, description="Vector-only or full-text + vector retrieval"
+    )
 
 
 class QuestionResponse(BaseModel):
@@ -11,6 +16,7 @@ class QuestionResponse(BaseModel):
     sources: List[str]
     confidence_score: float
     context_id: Optional[str] = None
+    cached: bool = False
 
 
 class DocumentTaskResponse(BaseModel):
@@ -0,0 +1,277 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import bindparam
+
+from dudoxx.config import Settings
+from dudoxx.database.sqlite.database import engine
+from dudoxx.database.sqlite.models import APIKey
+from dudoxx.services.redis_service import RedisCacheService, get_local_cache
+
+logger = logging.getLogger(__name__)
+
+REVOKED_CHANNEL = "apikey:revoked"
+
+# Caches a verified key unless its prefix was revoked since, which a verification that
+# read the database before the revocation would otherwise undo
+_STORE_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+def _verified_key(fingerprint: str) -> str:
+    return f"apikey:verified:{fingerprint}"
+
+
+def _prefix_key(prefix: str) -> str:
+    return f"apikey:fingerprints:{prefix}"
+
+
+def _revoked_key(prefix: str) -> str:
+    return f"apikey:revoked:{prefix}"
+
+
+@dataclass(frozen=True)
+class VerifiedApiKey:
+    """What requests authenticated with a key need to know about it."""
+
+    prefix: str
+    quota_tier: str
+
+
+class ApiKeyCache:
+    """
+    Recently verified API keys, so bcrypt runs once per key and TTL instead of per request.
+
+    Keys are held as HMAC-SHA256 fingerprints, never in plain text, in an in-process
+    LRU tier in front of Redis. Revoking a key drops its fingerprints from Redis and
+    tells every process to drop them locally; the short local TTL bounds how long a
+    process that missed the message keeps accepting the key.
+    """
+
+    def __init__(
+        self,
+        redis_cache: RedisCacheService,
+        secret: Optional[str],
+        expire: int,
+        local_expire: float,
+        max_local_entries: int,
+    ) -> None:
+        self.redis_cache = redis_cache
+        # Without a shared secret fingerprints differ per process, so only the local tier is used
+        self.shared = bool(secret)
+        self._secret = secret.encode() if secret else secrets.token_bytes(32)
+        self.expire = expire
+        self.local_expire = local_expire
+        self.max_local_entries = max_local_entries
+        # fingerprint -> (verified key, expiry on the monotonic clock)
+        self._local: "OrderedDict[str, Tuple[VerifiedApiKey, float]]" = OrderedDict()
+        # Bumped by every revocation seen, so verifications that raced one are not cached
+        self._revocations = 0
+        self._store = redis_cache.redis.register_script(_STORE_SCRIPT) if self.shared else None
+        self._task: Optional[asyncio.Task] = None
+
+    def fingerprint(self, api_key: str) -> str:
+        return hmac.new(self._secret, api_key.encode(), hashlib.sha256).hexdigest()
+
+    def _remember(self, fingerprint: str, key: VerifiedApiKey) -> None:
+        self._local[fingerprint] = (key, time.monotonic() + self.local_expire)
+        self._local.move_to_end(fingerprint)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    def generation(self) -> int:
+        """Take before verifying a key against the database and pass to set()."""
+        return self._revocations
+
+    def _forget(self, prefix: str) -> None:
+        self._revocations += 1
+        for fingerprint in [fp for fp, (key, _) in self._local.items() if key.prefix == prefix]:
+            del self._local[fingerprint]
+
+    async def get(self, api_key: str) -> Optional[VerifiedApiKey]:
+        """Return a recently verified key, or None if it must be verified."""
+        fingerprint = self.fingerprint(api_key)
+        entry = self._local.get(fingerprint)
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                self._local.move_to_end(fingerprint)
+                get_local_cache().record("api_key", hit=True)
+                return entry[0]
+            del self._local[fingerprint]
+        # Reported with the local tier's namespaces, though revocation keeps its own channel
+        get_local_cache().record("api_key", hit=False)
+
+        if not self.shared:
+            return None
+        try:
+            value = await self.redis_cache.redis.get(_verified_key(fingerprint))
+        except Exception as e:
+            logger.warning(f"API key cache lookup failed: {e}")
+            return None
+        if value is None:
+            return None
+        key = VerifiedApiKey(**json.loads(value))
+        self._remember(fingerprint, key)
+        return key
+
+    async def set(self, api_key: str, key: VerifiedApiKey, generation: Optional[int] = None) -> None:
+        """Record a key that passed verification, unless a revocation was seen since generation."""
+        if generation is not None and generation != self._revocations:
+            return
+        fingerprint = self.fingerprint(api_key)
+        self._remember(fingerprint, key)
+        if not self.shared:
+            return
+        try:
+            await self._store(
+                keys=[_verified_key(fingerprint), _prefix_key(key.prefix), _revoked_key(key.prefix)],
+                args=[fingerprint, json.dumps(asdict(key)), self.expire],
+            )
+        except Exception as e:
+            logger.warning(f"API key cache store failed: {e}")
+
+    async def invalidate(self, prefix: str) -> None:
+        """Forget every verified key with this prefix, here and in all other processes."""
+        self._forget(prefix)
+        try:
+            fingerprints = await self.redis_cache.redis.smembers(_prefix_key(prefix))
+            async with self.redis_cache.redis.pipeline(transaction=True) as pipe:
+                for fingerprint in fingerprints:
+                    pipe.delete(_verified_key(fingerprint.decode()))
+                pipe.delete(_prefix_key(prefix))
+                # Outlives any verification still in flight, which then cannot cache the key
+                pipe.set(_revoked_key(prefix), 1, ex=self.expire)
+                pipe.publish(REVOKED_CHANNEL, prefix)
+                await pipe.execute()
+        except Exception as e:
+            # Other processes still drop the key once their local entries expire
+            logger.error(f"API key cache invalidation of {prefix} failed: {e}")
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis_cache.redis.pubsub()
+            try:
+                await pubsub.subscribe(REVOKED_CHANNEL)
+                # Entries cached while unsubscribed may have missed a revocation
+                self._local.clear()
+                self._revocations += 1
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._forget(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("API key revocation listener failed, resubscribing")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        """Start following revocations made by other processes."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+
+
+class LastUsedRecorder:
+    """
+    Write-behind for api_keys.last_used: uses are aggregated in memory and the latest
+    time per key is written in one batch every interval, instead of a commit per request.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._pending: Dict[str, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def touch(self, prefix: str) -> None:
+        self._pending[prefix] = datetime.now(tz=timezone.utc)
+
+    def discard(self, prefix: str) -> None:
+        self._pending.pop(prefix, None)
+
+    @staticmethod
+    def _write(pending: Dict[str, datetime]) -> None:
+        table = APIKey.__table__
+        # Bind names must differ from the column names the statement sets
+        statement = table.update().where(table.c.key == bindparam("b_key")).values(last_used=bindparam("b_last_used"))
+        with engine.begin() as connection:
+            connection.execute(statement, [{"b_key": k, "b_last_used": t} for k, t in pending.items()])
+
+    async def flush(self) -> None:
+        """Write the pending timestamps; they are kept for the next flush if the write fails."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            await asyncio.to_thread(self._write, pending)
+        except Exception:
+            # Uses recorded meanwhile are newer than the ones that failed to write
+            self._pending = {**pending, **self._pending}
+            raise
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Flushing API key last_used timestamps failed")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final flush of API key last_used timestamps failed")
+
+
+@lru_cache()
+def get_api_key_cache() -> ApiKeyCache:
+    """Return the process-wide verified API key cache."""
+    settings = get_settings()
+    return ApiKeyCache(
+        redis_cache=RedisCacheService(),
+        secret=settings.API_KEY_CACHE_SECRET,
+        expire=settings.API_KEY_CACHE_TTL,
+        local_expire=settings.API_KEY_CACHE_LOCAL_TTL,
+        max_local_entries=settings.API_KEY_CACHE_LOCAL_SIZE,
+    )
+
+
+@lru_cache()
+def get_last_used_recorder() -> LastUsedRecorder:
+    """Return the process-wide last_used write-behind buffer."""
+    return LastUsedRecorder(interval=get_settings().API_KEY_LAST_USED_FLUSH_INTERVAL)
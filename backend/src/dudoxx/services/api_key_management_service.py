@@ -1,7 +1,7 @@
+import asyncio
 import secrets
 import string
-from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 from fastapi import Depends, Request, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
@@ -9,7 +9,7 @@ from passlib.hash import bcrypt
 from fastapi.security import APIKeyHeader
 
 
-from dudoxx.database.sqlite.database import get_db
+from dudoxx.database.sqlite.database import SessionLocal, get_db
 from dudoxx.database.sqlite.models import APIKey
 from dudoxx.exceptions.apikey_exceptions import (
     APIKeyCreationError,
@@ -18,6 +18,7 @@ from dudoxx.exceptions.apikey_exceptions import (
     ApiKeyNotFound,
 )
 from dudoxx.schemas.api_key import ApiKeyResponse
+from dudoxx.services.api_key_cache_service import VerifiedApiKey, get_api_key_cache, get_last_used_recorder
 
 
 class APIKeyManagerService:
@@ -41,17 +42,42 @@ class APIKeyManagerService:
             self.db.rollback()
             raise APIKeyCreationError(f"Failed to create API key: {str(e)}")
 
-    async def validate_api_key(self, api_key: str, db: Session) -> bool:
+    @staticmethod
+    def _verify(api_key: str, db: Optional[Session]) -> Optional[VerifiedApiKey]:
+        if db is None:
+            with SessionLocal() as session:
+                return APIKeyManagerService._verify(api_key, session)
         try:
             db_key = db.query(APIKey).filter(APIKey.key == api_key[:8]).first()
-            if db_key and bcrypt.verify(api_key, db_key.hashed_key):
-                db_key.last_used = datetime.now(tz=timezone.utc)
-                db.commit()
-                return True
-            return False
-        except SQLAlchemyError as e:
+        except SQLAlchemyError:
             db.rollback()
-            raise APIKeyValidationError(f"Failed to validate API key: {str(e)}") from e
+            raise
+        if db_key and bcrypt.verify(api_key, db_key.hashed_key):
+            return VerifiedApiKey(prefix=db_key.key, quota_tier=db_key.quota_tier)
+        return None
+
+    async def verify_api_key(self, api_key: str, db: Optional[Session] = None) -> Optional[VerifiedApiKey]:
+        """
+        Check a key, running bcrypt only for keys not verified within the cache TTL.
+        last_used is recorded in memory and written in batches.
+        """
+        cache = get_api_key_cache()
+        generation = cache.generation()
+        verified = await cache.get(api_key)
+        if verified is None:
+            try:
+                # bcrypt is deliberately slow, keep it off the event loop
+                verified = await asyncio.to_thread(self._verify, api_key, db)
+            except SQLAlchemyError as e:
+                raise APIKeyValidationError(f"Failed to validate API key: {str(e)}") from e
+            if verified is None:
+                return None
+            await cache.set(api_key, verified, generation)
+        get_last_used_recorder().touch(verified.prefix)
+        return verified
+
+    async def validate_api_key(self, api_key: str, db: Optional[Session] = None) -> bool:
+        return await self.verify_api_key(api_key, db) is not None
 
     async def list_api_keys(self) -> List[ApiKeyResponse]:
         try:
@@ -70,22 +96,26 @@ class APIKeyManagerService:
         except SQLAlchemyError as e:
             self.db.rollback()
             raise APIKeyRevocationError(f"Failed to revoke API key: {str(e)}") from e
+        get_last_used_recorder().discard(api_key[:8])
+        await get_api_key_cache().invalidate(api_key[:8])
 
 
 class ApiKeyMiddleware(APIKeyHeader):
     def __init__(self):
         super().__init__(name="X-API-Key", auto_error=False)
         self.api_key_manager = APIKeyManagerService()
-        self.db = next(get_db())
 
     async def __call__(self, request: Request):
         api_key = await super().__call__(request)
         if api_key is None:
             raise HTTPException(status_code=401, detail="API Key is missing")
         try:
-            if await self.api_key_manager.validate_api_key(api_key, self.db):
-                return api_key
-            else:
-                raise HTTPException(status_code=403, detail="Invalid API Key")
+            # Cache misses use a session of their own rather than one shared by all requests
+            verified = await self.api_key_manager.verify_api_key(api_key)
         except APIKeyValidationError as e:
             raise HTTPException(status_code=500, detail=f"API key validation error: {str(e)}")
+        if verified is None:
+            raise HTTPException(status_code=403, detail="Invalid API Key")
+        # Read by the rate limiter, which limits per key and quota tier
+        request.state.api_key = verified
+        return api_key
@@ -1,14 +1,12 @@
 # transcription_service.py
 import os
-import tempfile
 import aiofiles
 from typing import Optional
-from fastapi import HTTPException, UploadFile
-import uuid
+from fastapi import HTTPException
 from deepgram import DeepgramClient, PrerecordedOptions, DeepgramClientOptions
 
 from dudoxx.exceptions.deepgram_exceptions import handle_deepgram_api_error
-from dudoxx.services.redis_service import RedisCacheService
+from dudoxx.services.task_status_service import TaskStatusService
 
 
 class DeepgramService:
@@ -21,23 +19,19 @@ class DeepgramService:
             },
         )
         self.deepgram_client = DeepgramClient(api_key="No key", config=self.config)
-        self.cache_service = RedisCacheService()
+        self.task_status = TaskStatusService()
 
-    async def process_transcription(self, file: UploadFile, task_id: str, language: Optional[str] = None) -> None:
-        """Process audio transcription in background task"""
+    async def process_transcription(self, temp_file_path: str, task_id: str, language: Optional[str] = None) -> None:
+        """Process audio transcription as a queued job"""
         try:
             # Update initial status
-            await self.cache_service.set(task_id, {"status": "processing", "progress": 0})
-
-            # Save uploaded file temporarily
-            temp_file_path = os.path.join(tempfile.gettempdir(), f"{task_id}_{file.filename}")
-            await self._save_file_async(temp_file_path, file)
+            await self.task_status.set(task_id, {"status": "processing", "progress": 0})
 
             # Run the transcription
             transcription_result = await self._transcribe_audio(temp_file_path, language)
 
             # Update cache with success status and transcription result
-            await self.cache_service.set(
+            await self.task_status.set(
                 task_id,
                 {
                     "status": "completed",
@@ -47,16 +41,9 @@ class DeepgramService:
                 },
             )
 
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.remove(temp_file_path)
-
         except Exception as e:
-            # Update cache with error status
-            error_message = f"Transcription failed: {str(e)}"
-            await self.cache_service.set(task_id, {"status": "failed", "error": error_message, "progress": 0})
-            # Re-raise the exception for proper error handling
-            raise
+            # The job queue retries, marks the task failed once it gives up and removes the upload
+            raise Exception(f"Transcription failed: {str(e)}") from e
 
     @handle_deepgram_api_error
     async def _transcribe_audio(self, file_path: str, language: Optional[str] = None) -> dict:
@@ -90,19 +77,9 @@ class DeepgramService:
         except Exception as e:
             raise Exception(f"Deepgram API error: {str(e)}")
 
-    @staticmethod
-    async def _save_file_async(file_path: str, file: UploadFile) -> None:
-        """Save uploaded file in a non-blocking way"""
-        try:
-            async with aiofiles.open(file_path, "wb") as out_file:
-                content = await file.read()
-                await out_file.write(content)
-        except Exception as e:
-            raise Exception(f"Failed to save file: {str(e)}")
-
     async def get_transcription_result(self, task_id: str) -> dict:
         """Retrieve transcription result"""
-        task_data = await self.cache_service.get(task_id)
+        task_data = await self.task_status.get(task_id)
 
         if not task_data:
             raise HTTPException(status_code=404, detail="Task not found")
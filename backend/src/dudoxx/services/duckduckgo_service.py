@@ -1,56 +1,160 @@
-from typing import List, Dict, Optional
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Type
+import numpy as np
+from pydantic import BaseModel
+from langchain.schema import Document
 from langchain_openai import OpenAIEmbeddings
 from langchain.text_splitter import CharacterTextSplitter
 from langchain_openai import OpenAI
 from duckduckgo_search import DDGS
-from langchain_community.vectorstores import FAISS
 from langchain.prompts import PromptTemplate
 from langchain.chains.llm import LLMChain
 import json
 
+from dudoxx.config import Settings
 from dudoxx.exceptions.openai_exceptions import handle_openai_api_error
-from dudoxx.schemas.duckduckgo import DrugInfo, DiseaseInfo
+from dudoxx.schemas.duckduckgo import DrugInfo, DiseaseInfo, DrugInfoBatchItem, DiseaseInfoBatchItem
+from dudoxx.services.embedding_cache_service import CachedEmbeddings
 from dudoxx.services.redis_service import RedisCacheService
+from dudoxx.services.single_flight_cache_service import SingleFlightCache
+
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+def normalize_query(query: str) -> str:
+    """Case and whitespace variants of a query share one cached search."""
+    return " ".join(query.lower().split())
+
+
+@dataclass
+class SnippetIndex:
+    """The few snippets of one search with their unit-normalised embeddings, searched by brute force."""
+
+    documents: List[Document]
+    vectors: np.ndarray
+
+    @classmethod
+    def from_embeddings(cls, documents: List[Document], embeddings: List[List[float]]) -> "SnippetIndex":
+        if not documents:
+            return cls([], np.zeros((0, 0), dtype=np.float32))
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return cls(documents, vectors / np.where(norms == 0, 1, norms))
+
+    def search(self, query_vector: List[float], k: int) -> List[Document]:
+        """Return the k snippets most cosine-similar to the query, best first."""
+        if not self.documents:
+            return []
+        scores = self.vectors @ np.asarray(query_vector, dtype=np.float32)
+        k = min(k, len(self.documents))
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [self.documents[i] for i in top[np.argsort(-scores[top])]]
 
 
 class DuckDuckGOService:
     def __init__(self):
-        self.ddg_search = DDGS()
-        self.embeddings = OpenAIEmbeddings()
+        openai_embeddings = OpenAIEmbeddings()
+        # Related lookups return largely the same snippets, each is embedded once
+        self.embeddings = CachedEmbeddings(openai_embeddings, model=openai_embeddings.model)
         self.text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=0)
         self.llm = OpenAI(temperature=0)
         self.cache = RedisCacheService()
+        settings = get_settings()
+        # Concurrent misses of a drug or disease run the search and LLM pipeline once
+        self.info_cache = SingleFlightCache(
+            RedisCacheService(namespace="drug_info"),
+            soft_ttl=settings.DDG_INFO_SOFT_TTL,
+            hard_ttl=settings.DDG_INFO_HARD_TTL,
+            lock_ttl=settings.DDG_INFO_LOCK_TTL,
+            wait_timeout=settings.DDG_INFO_WAIT_TIMEOUT,
+        )
+
+    @staticmethod
+    def _search_sync(query: str, max_results: int) -> List[Dict[str, str]]:
+        # A client per search, since searches run concurrently in worker threads
+        return list(DDGS().text(query, max_results=max_results))
 
     async def _perform_search(self, query: str, max_results: int = 5) -> List[Dict[str, str]]:
-        search_results = list(self.ddg_search.text(query, max_results=max_results))
-        return [{"snippet": result["body"], "link": result["href"]} for result in search_results]
+        query = normalize_query(query)
+        digest = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        cache_key = f"ddg_search:{max_results}:{digest}"
+        cached_results = await self.cache.get(cache_key)
+        if cached_results is not None:
+            return cached_results["results"]
 
-    async def _create_vector_db(self, search_results: List[Dict[str, str]]) -> FAISS:
+        # duckduckgo_search is synchronous, keep it off the event loop
+        search_results = await asyncio.to_thread(self._search_sync, query, max_results)
+        results = [{"snippet": result["body"], "link": result["href"]} for result in search_results]
+        await self.cache.set(cache_key, {"results": results}, expire=get_settings().DDG_SEARCH_CACHE_TTL)
+        return results
+
+    def _snippet_documents(self, search_results: List[Dict[str, str]]) -> List[Document]:
         texts = [result["snippet"] for result in search_results]
         metadatas = [{"source": result["link"]} for result in search_results]
-        documents = self.text_splitter.create_documents(texts, metadatas=metadatas)
-        return FAISS.from_documents(documents, self.embeddings)
+        return self.text_splitter.create_documents(texts, metadatas=metadatas)
+
+    async def _index_snippets(self, search_results: List[Dict[str, str]]) -> SnippetIndex:
+        documents = self._snippet_documents(search_results)
+        embeddings = await self.embeddings.aembed_documents([doc.page_content for doc in documents])
+        return SnippetIndex.from_embeddings(documents, embeddings)
 
     @handle_openai_api_error
-    async def _generate_summary(self, query: str, vector_db: FAISS, prompt_template: str) -> str:
-        relevant_docs = vector_db.similarity_search(query, k=3)
+    async def _generate_summary(self, query: str, index: SnippetIndex, prompt_template: str) -> str:
+        relevant_docs = index.search(await self.embeddings.aembed_query(query), k=3)
         docs_page_content = " ".join([doc.page_content for doc in relevant_docs])
 
         prompt = PromptTemplate(template=prompt_template, input_variables=["query", "docs"])
         chain = LLMChain(llm=self.llm, prompt=prompt)
-        summary = chain.run(query=query, docs=docs_page_content)
+        summary = await chain.arun(query=query, docs=docs_page_content)
         return summary.strip()
 
     async def drug_info(self, drug_name: str, include_interactions: Optional[bool] = False) -> DrugInfo:
-        cache_key = f"drug_info:{drug_name}:{include_interactions}"
-        cached_response = await self.cache.get(cache_key)
+        response = await self.info_cache.get_or_compute(
+            f"drug_info:{drug_name}:{include_interactions}",
+            lambda: self._compute_drug_info(drug_name, include_interactions),
+        )
+        return self._to_drug_info(response, include_interactions)
 
-        if cached_response:
-            return DrugInfo(**cached_response)
+    async def drug_info_batch(
+        self, drug_names: List[str], include_interactions: bool = False
+    ) -> AsyncIterator[DrugInfoBatchItem]:
+        """Yield one item per distinct name, cache hits first and the rest as they complete."""
+        async for item in self._info_batch(
+            drug_names,
+            cache_key=lambda name: f"drug_info:{name}:{include_interactions}",
+            search_query=lambda name: f"{name} drug information",
+            compute=lambda name: self._compute_drug_info(name, include_interactions),
+            convert=lambda response: self._to_drug_info(response, include_interactions),
+            item_type=DrugInfoBatchItem,
+        ):
+            yield item
 
+    @staticmethod
+    def _to_drug_info(response: Dict[str, Any], include_interactions: bool) -> DrugInfo:
+        if response.get("error") and not include_interactions:
+            raise ValueError(response["error"])
+        return DrugInfo(
+            name=response["name"],
+            description=response.get("description"),
+            dosage=response.get("dosage"),
+            side_effects=response.get("side_effects"),
+            interactions=response.get("interactions") if include_interactions else None,
+        )
+
+    async def _compute_drug_info(self, drug_name: str, include_interactions: bool) -> Dict[str, Any]:
         query = f"{drug_name} drug information"
         search_results = await self._perform_search(query)
-        vector_db = await self._create_vector_db(search_results)
+        index = await self._index_snippets(search_results)
 
         prompt_template = """
         Provide a comprehensive summary of the drug {query}, including the following information:
@@ -63,7 +167,21 @@ class DuckDuckGOService:
 
         Format the summary as a JSON object with the keys: description, dosage, side_effects.
         """
-        summary = await self._generate_summary(query, vector_db, prompt_template)
+        interactions_query = f"{drug_name} drug interactions"
+        interactions_prompt = """
+        Summarize the drug interactions for {query} based on the following information:
+        {docs}
+
+        Provide the summary as a simple string.
+        """
+        # Both summaries only need the search results, so the LLM calls run concurrently
+        summary_task = self._generate_summary(query, index, prompt_template)
+        if include_interactions:
+            summary, interactions_summary = await asyncio.gather(
+                summary_task, self._generate_summary(interactions_query, index, interactions_prompt)
+            )
+        else:
+            summary = await summary_task
 
         try:
             response = json.loads(summary)
@@ -73,44 +191,44 @@ class DuckDuckGOService:
         response["name"] = drug_name
 
         if include_interactions:
-            interactions_query = f"{drug_name} drug interactions"
-            interactions_prompt = """
-            Summarize the drug interactions for {query} based on the following information:
-            {docs}
-
-            Provide the summary as a simple string.
-            """
-            interactions_summary = await self._generate_summary(interactions_query, vector_db, interactions_prompt)
             response["interactions"] = interactions_summary
-            await self.cache.set(cache_key, response)
-            return DrugInfo(
-                name=response["name"],
-                description=response.get("description"),
-                dosage=response.get("dosage"),
-                side_effects=response.get("side_effects"),
-                interactions=response.get("interactions"),
-            )
+        return response
 
-        await self.cache.set(cache_key, response)
-        if response.get("error"):
-            raise ValueError(response["error"])
-        return DrugInfo(
-            name=response["name"],
-            description=response.get("description"),
-            dosage=response.get("dosage"),
-            side_effects=response.get("side_effects"),
+    async def disease_info(self, disease_name: str, include_treatments: Optional[bool] = False) -> DiseaseInfo:
+        response = await self.info_cache.get_or_compute(
+            f"disease_info:{disease_name}:{include_treatments}",
+            lambda: self._compute_disease_info(disease_name, include_treatments),
         )
+        return self._to_disease_info(response, include_treatments)
 
-    async def disease_info(self, disease_name: str, include_treatments: Optional[bool] = False) -> DiseaseInfo:
-        cache_key = f"disease_info:{disease_name}:{include_treatments}"
-        cached_response = await self.cache.get(cache_key)
+    async def disease_info_batch(
+        self, disease_names: List[str], include_treatments: bool = False
+    ) -> AsyncIterator[DiseaseInfoBatchItem]:
+        """Yield one item per distinct name, cache hits first and the rest as they complete."""
+        async for item in self._info_batch(
+            disease_names,
+            cache_key=lambda name: f"disease_info:{name}:{include_treatments}",
+            search_query=lambda name: f"{name} disease information",
+            compute=lambda name: self._compute_disease_info(name, include_treatments),
+            convert=lambda response: self._to_disease_info(response, include_treatments),
+            item_type=DiseaseInfoBatchItem,
+        ):
+            yield item
 
-        if cached_response:
-            return DiseaseInfo(**cached_response)
+    @staticmethod
+    def _to_disease_info(response: Dict[str, Any], include_treatments: bool) -> DiseaseInfo:
+        return DiseaseInfo(
+            name=response["name"],
+            description=response.get("description"),
+            symptoms=response.get("symptoms"),
+            causes=response.get("causes"),
+            treatments=response.get("treatments") if include_treatments else None,
+        )
 
+    async def _compute_disease_info(self, disease_name: str, include_treatments: bool) -> Dict[str, Any]:
         query = f"{disease_name} disease information"
         search_results = await self._perform_search(query)
-        vector_db = await self._create_vector_db(search_results)
+        index = await self._index_snippets(search_results)
 
         prompt_template = """
         Provide a comprehensive summary of the disease {query}, including the following information:
@@ -123,7 +241,20 @@ class DuckDuckGOService:
 
         Format the summary as a JSON object with the keys: description, symptoms, causes.
         """
-        summary = await self._generate_summary(query, vector_db, prompt_template)
+        treatments_query = f"{disease_name} disease treatments"
+        treatments_prompt = """
+        Summarize the treatments for {query} based on the following information:
+        {docs}
+
+        Provide the summary as a simple string.
+        """
+        summary_task = self._generate_summary(query, index, prompt_template)
+        if include_treatments:
+            summary, treatments_summary = await asyncio.gather(
+                summary_task, self._generate_summary(treatments_query, index, treatments_prompt)
+            )
+        else:
+            summary = await summary_task
 
         try:
             response = json.loads(summary)
@@ -133,24 +264,73 @@ class DuckDuckGOService:
         response["name"] = disease_name
 
         if include_treatments:
-            treatments_query = f"{disease_name} disease treatments"
-            treatments_prompt = """
-            Summarize the treatments for {query} based on the following information:
-            {docs}
-
-            Provide the summary as a simple string.
-            """
-            treatments_summary = await self._generate_summary(treatments_query, vector_db, treatments_prompt)
             response["treatments"] = treatments_summary
+        return response
 
-        await self.cache.set(cache_key, response)  # Cache the response
-        return DiseaseInfo(
-            name=response["name"],
-            description=response.get("description"),
-            symptoms=response.get("symptoms"),
-            causes=response.get("causes"),
-            treatments=response.get("treatments") if include_treatments else None,
-        )
+    @staticmethod
+    def _batch_item(name: str, response: Dict[str, Any], convert: Callable, item_type: Type[BaseModel]) -> BaseModel:
+        try:
+            return item_type(name=name, result=convert(response))
+        except Exception as e:
+            return item_type(name=name, error=str(e))
+
+    async def _info_batch(
+        self,
+        names: List[str],
+        cache_key: Callable[[str], str],
+        search_query: Callable[[str], str],
+        compute: Callable[[str], Awaitable[Dict[str, Any]]],
+        convert: Callable[[Dict[str, Any]], BaseModel],
+        item_type: Type[BaseModel],
+    ) -> AsyncIterator[BaseModel]:
+        names = list(dict.fromkeys(names))
+        cached = await self.info_cache.peek_many([cache_key(name) for name in names])
+        misses = []
+        for name, response in zip(names, cached):
+            if response is None:
+                misses.append(name)
+            else:
+                yield self._batch_item(name, response, convert, item_type)
+        if not misses:
+            return
+
+        semaphore = asyncio.Semaphore(get_settings().DDG_BATCH_CONCURRENCY)
+
+        async def search(name: str) -> List[Dict[str, str]]:
+            async with semaphore:
+                return await self._perform_search(search_query(name))
+
+        # Embed the snippets of every missing name in one request; the per-name pipelines
+        # below then find their searches and embeddings cached
+        searches = await asyncio.gather(*(search(name) for name in misses), return_exceptions=True)
+        texts = [
+            doc.page_content
+            for results in searches
+            if not isinstance(results, BaseException)
+            for doc in self._snippet_documents(results)
+        ]
+        if texts:
+            try:
+                await self.embeddings.aembed_documents(texts)
+            except Exception as e:
+                logger.warning(f"Batch snippet embedding failed, embedding per name: {e}")
+
+        async def lookup(name: str) -> BaseModel:
+            async with semaphore:
+                try:
+                    response = await self.info_cache.get_or_compute(cache_key(name), lambda: compute(name))
+                except Exception as e:
+                    return item_type(name=name, error=str(e))
+            return self._batch_item(name, response, convert, item_type)
+
+        tasks = [asyncio.create_task(lookup(name)) for name in misses]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The client went away; stop the lookups not yet done
+            for task in tasks:
+                task.cancel()
 
     async def close(self) -> None:
         """Close the Redis connection."""
@@ -0,0 +1,148 @@
+import hashlib
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from dudoxx.config import Settings
+from dudoxx.services.redis_service import RedisCacheService
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache with an in-process LRU tier in front of Redis."""
+
+    def __init__(self, model: str, max_local_entries: int, expire: int, redis_cache: RedisCacheService) -> None:
+        self.model = model
+        self.max_local_entries = max_local_entries
+        self.expire = expire
+        self.redis_cache = redis_cache
+        self._local: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"embedding:{self.model}:{digest}"
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._local[key] = vector
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    async def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Look up embeddings for texts, returning None for each miss."""
+        keys = [self.key(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+
+        remote: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            vector = self._local.get(key)
+            if vector is not None:
+                self._local.move_to_end(key)
+                self.local_hits += 1
+                results[i] = vector
+            else:
+                remote.setdefault(key, []).append(i)
+
+        if remote:
+            try:
+                values = await self.redis_cache.mget_bytes(list(remote))
+            except Exception as e:
+                logger.warning(f"Embedding cache lookup failed: {e}")
+                values = [None] * len(remote)
+
+            for (key, positions), value in zip(remote.items(), values):
+                if value is None:
+                    self.misses += len(positions)
+                    continue
+                vector = np.frombuffer(value, dtype=np.float32)
+                self._remember(key, vector)
+                self.redis_hits += len(positions)
+                for i in positions:
+                    results[i] = vector
+
+        return [vector.tolist() if vector is not None else None for vector in results]
+
+    async def set_many(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """Store embeddings for texts in both tiers."""
+        mapping: Dict[str, bytes] = {}
+        for text, embedding in zip(texts, embeddings):
+            key = self.key(text)
+            vector = np.asarray(embedding, dtype=np.float32)
+            self._remember(key, vector)
+            mapping[key] = vector.tobytes()
+
+        try:
+            await self.redis_cache.mset_bytes(mapping, expire=self.expire)
+        except Exception as e:
+            logger.warning(f"Embedding cache store failed: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "model": self.model,
+            "local_entries": len(self._local),
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.local_hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+@lru_cache()
+def get_embedding_cache(model: str) -> EmbeddingCache:
+    """Return the process-wide embedding cache for a model."""
+    settings = get_settings()
+    return EmbeddingCache(
+        model=model,
+        max_local_entries=settings.EMBEDDING_CACHE_LOCAL_SIZE,
+        expire=settings.EMBEDDING_CACHE_TTL,
+        redis_cache=RedisCacheService(),
+    )
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends cache misses to the underlying model."""
+
+    def __init__(self, embeddings: Embeddings, model: str) -> None:
+        self.embeddings = embeddings
+        self.cache = get_embedding_cache(model)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        results = await self.cache.get_many(texts)
+
+        # Embed each distinct missing text once
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, results) if vector is None))
+        if missing:
+            embedded = await self.embeddings.aembed_documents(missing)
+            await self.cache.set_many(missing, embedded)
+            by_text = dict(zip(missing, embedded))
+            results = [vector if vector is not None else by_text[text] for text, vector in zip(texts, results)]
+
+        return results
+
+    async def aembed_query(self, text: str) -> List[float]:
+        (cached,) = await self.cache.get_many([text])
+        if cached is not None:
+            return cached
+        embedding = await self.embeddings.aembed_query(text)
+        await self.cache.set_many([text], [embedding])
+        return embedding
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
@@ -0,0 +1,245 @@
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import ResponseError
+
+from dudoxx.config import Settings
+from dudoxx.services.redis_service import RedisCacheService
+from dudoxx.services.task_status_service import TaskStatusService
+
+# Job types; dudoxx.worker maps each to the service method that runs it
+INGEST_DOCUMENT = "ingest_document"
+GENERATE_SPEECH = "generate_speech"
+TRANSCRIBE_AUDIO = "transcribe_audio"
+TRANSCRIBE_DEEPGRAM = "transcribe_deepgram"
+JOB_TYPES = (INGEST_DOCUMENT, GENERATE_SPEECH, TRANSCRIBE_AUDIO, TRANSCRIBE_DEEPGRAM)
+
+STREAM_PREFIX = "jobs"
+CONSUMER_GROUP = "workers"
+
+# Moves due retries of one job type from its delayed set back onto its stream atomically
+_PROMOTE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+    redis.call('XADD', KEYS[2], '*', 'job', member)
+end
+return #due
+"""
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+@dataclass
+class Job:
+    """A unit of background work and its delivery state."""
+
+    type: str
+    args: Dict[str, Any]
+    task_id: Optional[str] = None
+    # Task status written when the job is queued and again before each retry
+    pending_status: Optional[Dict[str, Any]] = None
+    # Task status written, with the error, once the job is dead-lettered
+    failed_status: Optional[Dict[str, Any]] = None
+    # Files the job owns, removed once it succeeds or is dead-lettered
+    files: List[str] = field(default_factory=list)
+    attempts: int = 0
+    job_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # Stream entry ID of the current delivery; not serialised
+    message_id: Optional[str] = None
+
+    def dumps(self) -> str:
+        data = asdict(self)
+        data.pop("message_id")
+        return json.dumps(data)
+
+    @classmethod
+    def loads(cls, message_id: Any, payload: Any) -> "Job":
+        if isinstance(message_id, bytes):
+            message_id = message_id.decode()
+        return cls(**json.loads(payload), message_id=message_id)
+
+
+class JobQueue:
+    """
+    Durable job queue on Redis Streams, one stream per job type.
+
+    Workers read through a consumer group, so each job is delivered to one consumer
+    and stays pending until acknowledged. A delivery idle for longer than the
+    visibility timeout (its worker died) is claimed by another consumer; running
+    jobs heartbeat to keep their claim. Failed jobs are retried with exponential
+    backoff through a delayed sorted set and dead-lettered after max_attempts.
+    The keys of a job type share a hash tag, so they stay on one cluster slot.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCacheService,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        visibility_timeout: float,
+    ) -> None:
+        self.cache = cache
+        self.redis = cache.redis
+        self.task_status = TaskStatusService()
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.visibility_timeout = visibility_timeout
+        self._promote = self.redis.register_script(_PROMOTE_SCRIPT)
+
+    @staticmethod
+    def stream(job_type: str) -> str:
+        return f"{STREAM_PREFIX}:{{{job_type}}}"
+
+    @staticmethod
+    def delayed(job_type: str) -> str:
+        return f"{STREAM_PREFIX}:{{{job_type}}}:delayed"
+
+    @staticmethod
+    def dead_letter_stream(job_type: str) -> str:
+        return f"{STREAM_PREFIX}:{{{job_type}}}:dead"
+
+    async def ensure_group(self, job_type: str) -> None:
+        try:
+            await self.redis.xgroup_create(self.stream(job_type), CONSUMER_GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def enqueue(
+        self,
+        job_type: str,
+        args: Dict[str, Any],
+        task_id: Optional[str] = None,
+        pending_status: Optional[Dict[str, Any]] = None,
+        failed_status: Optional[Dict[str, Any]] = None,
+        files: Optional[List[str]] = None,
+    ) -> Job:
+        """Queue a job and record its pending task status."""
+        job = Job(
+            type=job_type,
+            args=args,
+            task_id=task_id,
+            pending_status=pending_status,
+            failed_status=failed_status,
+            files=files or [],
+        )
+        if task_id and pending_status:
+            await self.task_status.set(task_id, pending_status)
+        message_id = await self.redis.xadd(self.stream(job_type), {"job": job.dumps()})
+        job.message_id = message_id.decode() if isinstance(message_id, bytes) else message_id
+        return job
+
+    async def read(self, job_type: str, consumer: str, block_ms: int = 5000) -> Optional[Job]:
+        """Return the next job for this consumer, preferring deliveries abandoned by dead workers."""
+        job = await self._reclaim(job_type, consumer)
+        if job is not None:
+            return job
+        response = await self.redis.xreadgroup(
+            CONSUMER_GROUP, consumer, {self.stream(job_type): ">"}, count=1, block=block_ms
+        )
+        if not response:
+            return None
+        message_id, fields = response[0][1][0]
+        return Job.loads(message_id, fields[b"job"])
+
+    async def _reclaim(self, job_type: str, consumer: str) -> Optional[Job]:
+        stream = self.stream(job_type)
+        result = await self.redis.xautoclaim(
+            stream, CONSUMER_GROUP, consumer, min_idle_time=int(self.visibility_timeout * 1000), count=1
+        )
+        for message_id, fields in result[1]:
+            if not fields:
+                # Entry deleted while pending
+                await self.redis.xack(stream, CONSUMER_GROUP, message_id)
+                continue
+            job = Job.loads(message_id, fields[b"job"])
+            # Deliveries that never finished count as failed attempts, so a job that
+            # crashes its worker every time is dead-lettered instead of looping
+            pending = await self.redis.xpending_range(stream, CONSUMER_GROUP, min=message_id, max=message_id, count=1)
+            job.attempts += pending[0]["times_delivered"] - 1 if pending else 0
+            if job.attempts >= self.max_attempts:
+                await self.dead_letter(job, "visibility timeout exceeded")
+                continue
+            return job
+        return None
+
+    async def heartbeat(self, job: Job, consumer: str) -> None:
+        """Reset the job's idle time so it is not claimed by another consumer."""
+        await self.redis.xclaim(
+            self.stream(job.type), CONSUMER_GROUP, consumer, min_idle_time=0, message_ids=[job.message_id], justid=True
+        )
+
+    def _remove(self, pipe: Any, job: Job) -> None:
+        pipe.xack(self.stream(job.type), CONSUMER_GROUP, job.message_id)
+        pipe.xdel(self.stream(job.type), job.message_id)
+
+    @staticmethod
+    def _remove_files(job: Job) -> None:
+        for path in job.files:
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def complete(self, job: Job) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            self._remove(pipe, job)
+            await pipe.execute()
+        self._remove_files(job)
+
+    async def fail(self, job: Job, error: str) -> bool:
+        """Schedule a retry with backoff, or dead-letter the job; returns whether it will be retried."""
+        job.attempts += 1
+        if job.attempts >= self.max_attempts:
+            await self.dead_letter(job, error)
+            return False
+
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (job.attempts - 1))
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.delayed(job.type), {job.dumps(): time.time() + delay})
+            self._remove(pipe, job)
+            await pipe.execute()
+        if job.task_id and job.pending_status:
+            await self.task_status.set(job.task_id, {**job.pending_status, "attempt": job.attempts + 1, "error": error})
+        return True
+
+    async def dead_letter(self, job: Job, error: str) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(self.dead_letter_stream(job.type), {"job": job.dumps(), "error": error, "failed_at": time.time()})
+            self._remove(pipe, job)
+            await pipe.execute()
+        self._remove_files(job)
+        # Only the queue knows a failure is final, so it alone marks the task failed
+        if job.task_id and job.failed_status:
+            await self.task_status.set(job.task_id, {**job.failed_status, "error": error})
+
+    async def promote_delayed(self, limit: int = 100) -> int:
+        """Move retries whose backoff has elapsed back onto their streams, up to limit per job type."""
+        promoted = 0
+        for job_type in JOB_TYPES:
+            promoted += await self._promote(
+                keys=[self.delayed(job_type), self.stream(job_type)], args=[time.time(), limit]
+            )
+        return promoted
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue."""
+    settings = get_settings()
+    return JobQueue(
+        cache=RedisCacheService(),
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        backoff_base=settings.JOB_BACKOFF_BASE,
+        backoff_max=settings.JOB_BACKOFF_MAX,
+        visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT,
+    )
@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from dudoxx.config import Settings
+from dudoxx.exceptions.pdf_exceptions import PdfConversionError, PdfConversionTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Set once per worker process by _init_worker
+_converter = None
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+def _init_worker() -> None:
+    """Load docling models once when a worker process starts."""
+    global _converter
+    from docling.document_converter import DocumentConverter
+
+    _converter = DocumentConverter()
+
+
+def _ping() -> bool:
+    return _converter is not None
+
+
+def _item_text(item, document) -> str:
+    text = getattr(item, "text", None)
+    if text is None and hasattr(item, "export_to_markdown"):
+        # Tables carry their content in cells rather than in text
+        text = item.export_to_markdown(doc=document)
+    return text or ""
+
+
+def _convert_pages(file_path: str, first_page: int, last_page: int) -> List[Tuple[int, List[Tuple[str, str]]]]:
+    """Convert a page range in the worker and return the (label, text) layout blocks of each page."""
+    document = _converter.convert(file_path, page_range=(first_page, last_page)).document
+    return [
+        (
+            page_no,
+            [
+                (str(item.label.value), _item_text(item, document))
+                for item, _ in document.iterate_items(page_no=page_no)
+            ],
+        )
+        for page_no in range(first_page, last_page + 1)
+        if page_no in document.pages
+    ]
+
+
+class PdfConversionPool:
+    """
+    Pool of long-lived processes, each holding a preloaded docling DocumentConverter.
+
+    Every convert_pages call is one task, so a worker is recycled after converting
+    max_batches_per_worker page windows, not documents. A stuck conversion cannot be
+    cancelled inside its process: on a timeout the pool is retired and new batches go
+    to a fresh, warmed pool. The retired pool keeps running the batches already sent
+    to it and its processes, the stuck one included, are killed once none is left.
+    Batches queued behind the stuck worker may time out as well, and fail with it.
+    """
+
+    def __init__(self, workers: int, job_timeout: float, max_batches_per_worker: int) -> None:
+        self.workers = workers
+        self.job_timeout = job_timeout
+        self.max_batches_per_worker = max_batches_per_worker
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[ProcessPoolExecutor, int] = {}
+        self._retired: Set[ProcessPoolExecutor] = set()
+        self._warming: Optional[asyncio.Task] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                max_tasks_per_child=self.max_batches_per_worker,
+            )
+        return self._executor
+
+    async def start(self) -> None:
+        """Spawn the workers and load their converters before the first upload arrives."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(self.workers)))
+        logger.info(f"PDF conversion pool started with {self.workers} workers")
+
+    async def convert_pages(
+        self, file_path: str, first_page: int, last_page: int
+    ) -> List[Tuple[int, List[Tuple[str, str]]]]:
+        """Convert a page range of a PDF in a worker process into per-page layout blocks."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        self._in_flight[executor] = self._in_flight.get(executor, 0) + 1
+        try:
+            future = loop.run_in_executor(executor, _convert_pages, file_path, first_page, last_page)
+            return await asyncio.wait_for(future, timeout=self.job_timeout)
+        except asyncio.TimeoutError:
+            self._retire(executor)
+            raise PdfConversionTimeoutError(
+                f"Converting pages {first_page}-{last_page} of {file_path} exceeded {self.job_timeout}s"
+            )
+        except Exception as e:
+            raise PdfConversionError(f"Error converting {file_path}: {str(e)}") from e
+        finally:
+            self._in_flight[executor] -= 1
+            if executor in self._retired and self._in_flight[executor] == 0:
+                self._terminate(executor)
+
+    def _retire(self, executor: ProcessPoolExecutor) -> None:
+        """Send new batches to a fresh pool, leaving executor to finish the batches it holds."""
+        if executor in self._retired:
+            return
+        self._retired.add(executor)
+        if self._executor is executor:
+            self._executor = None
+            self._warming = asyncio.create_task(self._warm())
+
+    async def _warm(self) -> None:
+        try:
+            await self.start()
+        except Exception as e:
+            logger.warning(f"Could not warm the replacement PDF conversion pool: {e}")
+
+    def _terminate(self, executor: ProcessPoolExecutor) -> None:
+        self._retired.discard(executor)
+        self._in_flight.pop(executor, None)
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._warming is not None:
+            self._warming.cancel()
+        for executor in list(self._retired):
+            self._terminate(executor)
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+@lru_cache()
+def get_pdf_conversion_pool() -> PdfConversionPool:
+    """Return the process-wide PDF conversion pool."""
+    settings = get_settings()
+    return PdfConversionPool(
+        workers=settings.PDF_WORKERS,
+        job_timeout=settings.PDF_JOB_TIMEOUT,
+        max_batches_per_worker=settings.PDF_WORKER_MAX_BATCHES,
+    )
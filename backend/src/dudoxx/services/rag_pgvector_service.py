@@ -1,10 +1,43 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from dudoxx.pgvector_rag.vector_store import VectorStore
 from dudoxx.pgvector_rag.rag import RAGSystem
+from dudoxx.pgvector_rag.chunking import BaseChunker, get_chunker
 from dudoxx.schemas.rag_pgvector import QuestionResponse
+from dudoxx.config import Settings
 import asyncio
-from docling.document_converter import DocumentConverter
-from dudoxx.services.redis_service import RedisCacheService
+import hashlib
+import logging
+from functools import lru_cache
+from PyPDF2 import PdfReader
+from dudoxx.services.pdf_conversion_service import get_pdf_conversion_pool
+from dudoxx.services.task_status_service import TaskStatusService
+from dudoxx.services.semantic_cache_service import get_context_version, get_semantic_answer_cache
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+class _IngestProgress:
+    """Counters shared by the ingestion pipeline stages."""
+
+    def __init__(self, total_pages: int) -> None:
+        self.total_pages = max(total_pages, 1)
+        self.pages_extracted = 0
+        self.chunks_produced = 0
+        self.chunks_stored = 0
+        self.chunks_skipped = 0
+
+    @property
+    def percent(self) -> int:
+        if not self.chunks_produced:
+            return 0
+        # Estimate the final chunk count from the pages extracted so far
+        estimated_chunks = self.chunks_produced * self.total_pages / max(self.pages_extracted, 1)
+        return min(99, int(100 * (self.chunks_stored + self.chunks_skipped) / estimated_chunks))
 
 
 class RAGService:
@@ -14,86 +47,279 @@ class RAGService:
         self.vector_store = VectorStore(default_context_id=default_context_id)
         self.rag_system = RAGSystem(self.vector_store)
         self._document_status = {}
-        self.cache_service = RedisCacheService()
-
-    async def process_document(self, file_path: str, task_id: str, context_id: Optional[str] = None) -> int:
+        self.cache_service = self.vector_store.cache_service
+        self.task_status = TaskStatusService()
+        self.pdf_pool = get_pdf_conversion_pool()
+        self.answer_cache = get_semantic_answer_cache()
+
+    async def process_document(
+        self, file_path: str, task_id: str, context_id: Optional[str] = None, doc_id: Optional[str] = None
+    ) -> str:
         """
         Process a PDF document and store it in the vector store with context isolation.
 
+        Documents and chunks the context already holds are skipped, so re-uploads cost no embeddings.
+
         Args:
             file_path: Path to the PDF file
             task_id: ID for tracking processing status
             context_id: ID for isolating the document in its own context
+            doc_id: sha256 of the file, if already computed while uploading
         Returns:
             document ID
         """
+        settings = get_settings()
         try:
-            await self.cache_service.set(task_id, {"status": "Ingesting", "progress": 0})
-
-            # Extract text from PDF
-            texts = await asyncio.to_thread(self._extract_text_from_pdf, file_path)
-
-            # Split text into chunks
-            chunks = await asyncio.to_thread(self._chunk_text, texts)
-            await self.cache_service.set(task_id, {"status": "vectorizing", "progress": 50})
-
-            # Generate document ID
-            doc_id = hash(f"{context_id}:{file_path}" if context_id else file_path)
-
-            # Create metadata with context information
-            metadatas = [
-                {
-                    "source": file_path,
-                    "chunk": i,
-                    "total_chunks": len(chunks),
-                    "doc_id": doc_id,
-                    "context_id": context_id,
-                }
-                for i in range(len(chunks))
-            ]
-
-            # Add to vector store with context isolation
-            await self.vector_store.add_documents(texts=chunks, metadatas=metadatas, context_id=context_id)
+            await self.task_status.set(task_id, {"status": "Ingesting", "progress": 0})
+
+            # The document ID is the content hash, stable across workers and restarts
+            doc_id = doc_id or await asyncio.to_thread(self._hash_file, file_path)
+            status_key = f"{context_id}:{doc_id}" if context_id else doc_id
+
+            if await self.vector_store.has_document(doc_id, context_id):
+                self._document_status[status_key] = "processed"
+                await self.task_status.set(
+                    task_id, {"status": "Completed", "progress": 100, "chunks_stored": 0, "duplicate": True}
+                )
+                return doc_id
+
+            total_pages = await asyncio.to_thread(self._count_pdf_pages, file_path)
+            progress = _IngestProgress(total_pages)
+            seen_hashes: set = set()
+            batches: asyncio.Queue = asyncio.Queue(maxsize=settings.INGEST_EMBED_CONCURRENCY * 2)
+
+            async def produce() -> None:
+                batch: List[Tuple[str, Dict[str, Any]]] = []
+                async for page_no, chunk in self._stream_chunks(file_path, total_pages, progress):
+                    metadata = {
+                        "source": file_path,
+                        "chunk": progress.chunks_produced,
+                        "page": page_no,
+                        "doc_id": doc_id,
+                        "context_id": context_id,
+                    }
+                    progress.chunks_produced += 1
+                    batch.append((chunk, metadata))
+                    if len(batch) >= settings.INGEST_EMBED_BATCH_SIZE:
+                        await batches.put(batch)
+                        batch = []
+                if batch:
+                    await batches.put(batch)
+                for _ in range(settings.INGEST_EMBED_CONCURRENCY):
+                    await batches.put(None)
+
+            async def consume() -> None:
+                while (batch := await batches.get()) is not None:
+                    new = await self.vector_store.filter_new_chunks(
+                        [chunk for chunk, _ in batch], context_id, seen=seen_hashes
+                    )
+                    texts = [batch[i][0] for i in new]
+                    metadatas = [batch[i][1] for i in new]
+                    if texts:
+                        embeddings = await self.vector_store.embeddings.aembed_documents(texts)
+                        # Each batch commits on its own, so it is searchable right away
+                        await self.vector_store.insert_embeddings(texts, metadatas, embeddings, context_id=context_id)
+                    progress.chunks_stored += len(texts)
+                    progress.chunks_skipped += len(batch) - len(texts)
+                    await self.task_status.set(
+                        task_id,
+                        {
+                            "status": "vectorizing",
+                            "progress": progress.percent,
+                            "chunks_stored": progress.chunks_stored,
+                            "context_id": context_id,
+                        },
+                    )
+
+            try:
+                async with asyncio.TaskGroup() as group:
+                    group.create_task(produce())
+                    for _ in range(settings.INGEST_EMBED_CONCURRENCY):
+                        group.create_task(consume())
+            except* Exception as errors:
+                raise errors.exceptions[0]
 
             # Store status with context
-            status_key = f"{context_id}:{doc_id}" if context_id else str(doc_id)
             self._document_status[status_key] = "processed"
 
-            await self.cache_service.set(task_id, {"status": "Completed", "progress": 100})
+            await self.task_status.set(
+                task_id,
+                {
+                    "status": "Completed",
+                    "progress": 100,
+                    "chunks_stored": progress.chunks_stored,
+                    "chunks_skipped": progress.chunks_skipped,
+                },
+            )
             return doc_id
 
         except Exception as e:
-            await self.cache_service.set(task_id, {"status": "Failed", "progress": 100, "error": str(e)})
+            # The job queue retries, and marks the task failed once it gives up
+            if doc_id:
+                # Remove a partial ingest so a retry is not skipped as a duplicate
+                await self.vector_store.delete_document(doc_id, context_id)
             raise Exception(f"Error processing document: {str(e)}")
 
-    async def get_answer(self, question: str, context_id: Optional[str] = None) -> QuestionResponse:
+    async def _stream_chunks(
+        self, file_path: str, total_pages: int, progress: _IngestProgress
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """Yield (page, chunk) pairs as page windows are extracted, carrying partial chunks across pages."""
+        settings = get_settings()
+        window = settings.INGEST_PAGE_WINDOW
+        chunker = self._get_chunker()
+        for first_page in range(1, total_pages + 1, window):
+            last_page = min(first_page + window - 1, total_pages)
+            pages = await self.pdf_pool.convert_pages(file_path, first_page, last_page)
+            for page_no, blocks in pages:
+                progress.pages_extracted += 1
+                for chunk in chunker.feed_blocks(blocks, page_no):
+                    yield (chunk.page, chunk.text)
+        for chunk in chunker.flush():
+            yield (chunk.page, chunk.text)
+
+    def _get_chunker(self) -> BaseChunker:
+        """Build the chunker configured by CHUNK_STRATEGY."""
+        settings = get_settings()
+        if settings.CHUNK_STRATEGY.lower() == "token":
+            return get_chunker(
+                "token", settings.CHUNK_TOKEN_SIZE, settings.CHUNK_TOKEN_OVERLAP, settings.CHUNK_ENCODING
+            )
+        return get_chunker(settings.CHUNK_STRATEGY, settings.CHUNK_SIZE, settings.CHUNK_OVERLAP)
+
+    async def get_answer(
+        self,
+        question: str,
+        context_id: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        search_mode: Optional[str] = None,
+    ) -> QuestionResponse:
         """
         Get an answer for a question using the RAG system within a specific context.
 
         Args:
             question: The question to answer
             context_id: Optional context to restrict the search
+            ef_search: Optional HNSW recall knob for this question
+            probes: Optional IVFFlat recall knob for this question
+            search_mode: Optional "vector" or "hybrid" retrieval for this question
         """
         try:
-            # Update RAG system with context
-            self.rag_system.context_id = context_id
+            cached, cache_entry = await self._lookup_answer(question, context_id)
+            if cached:
+                return cached
 
-            response = await self.rag_system.query(question)
+            response = await self.rag_system.query(
+                question, context_id=context_id, search_kwargs=self._search_kwargs(ef_search, probes, search_mode)
+            )
             sources = [doc.metadata.get("source") for doc in response["source_documents"]]
             confidence_score = await asyncio.to_thread(self._calculate_confidence_score, response, context_id)
 
-            return QuestionResponse(
+            answer = QuestionResponse(
                 answer=response["answer"], sources=sources, confidence_score=confidence_score, context_id=context_id
             )
+            await self._store_answer(question, context_id, cache_entry, answer)
+            return answer
 
         except Exception as e:
             raise Exception(f"Error getting answer: {str(e)}")
 
-    async def get_document_status(self, doc_id: int, context_id: Optional[str] = None) -> str:
+    async def stream_answer(
+        self,
+        question: str,
+        context_id: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        search_mode: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream an answer as (event, data) pairs: "sources" once retrieval is done, "token" for
+        each generated piece of the answer, and "done" with the confidence score.
+        """
+        try:
+            cached, cache_entry = await self._lookup_answer(question, context_id)
+            if cached:
+                yield "sources", cached.sources
+                yield "token", cached.answer
+                yield "done", cached.model_dump(include={"confidence_score", "context_id", "cached"})
+                return
+
+            documents: List[Any] = []
+            tokens: List[str] = []
+            async for event, data in self.rag_system.astream(
+                question, context_id=context_id, search_kwargs=self._search_kwargs(ef_search, probes, search_mode)
+            ):
+                if event == "documents":
+                    documents = data
+                    yield "sources", [doc.metadata.get("source") for doc in documents]
+                else:
+                    tokens.append(data)
+                    yield "token", data
+
+            response = {"answer": "".join(tokens), "source_documents": documents}
+            answer = QuestionResponse(
+                answer=response["answer"],
+                sources=[doc.metadata.get("source") for doc in documents],
+                confidence_score=self._calculate_confidence_score(response, context_id),
+                context_id=context_id,
+            )
+            await self._store_answer(question, context_id, cache_entry, answer)
+            yield "done", answer.model_dump(include={"confidence_score", "context_id", "cached"})
+        except Exception as e:
+            raise Exception(f"Error streaming answer: {str(e)}")
+
+    @staticmethod
+    def _search_kwargs(ef_search: Optional[int], probes: Optional[int], search_mode: Optional[str]) -> Dict[str, Any]:
+        search_kwargs = {"ef_search": ef_search, "probes": probes, "mode": search_mode}
+        return {k: v for k, v in search_kwargs.items() if v is not None}
+
+    async def _lookup_answer(
+        self, question: str, context_id: Optional[str]
+    ) -> Tuple[Optional[QuestionResponse], Optional[Tuple[int, List[float]]]]:
+        """
+        Look the question up in the semantic answer cache.
+
+        Returns the cached response, if any, and the (context version, question embedding)
+        to store a fresh answer under; the version is read before answering so a concurrent
+        ingest invalidates it.
+        """
+        if not context_id or not get_settings().SEMANTIC_CACHE_ENABLED:
+            return None, None
+        try:
+            version = await get_context_version(self.cache_service, context_id)
+            question_embedding = await self.vector_store.embeddings.aembed_query(question)
+            cached = await self.answer_cache.lookup(context_id, version, question_embedding)
+        except Exception as e:
+            # The cache only saves work; answer without it
+            logger.warning(f"Semantic cache unavailable, answering without it: {e}")
+            return None, None
+        if cached:
+            return QuestionResponse(**cached, context_id=context_id, cached=True), None
+        return None, (version, question_embedding)
+
+    async def _store_answer(
+        self,
+        question: str,
+        context_id: Optional[str],
+        cache_entry: Optional[Tuple[int, List[float]]],
+        answer: QuestionResponse,
+    ) -> None:
+        if cache_entry is None:
+            return
+        version, question_embedding = cache_entry
+        await self.answer_cache.store(
+            context_id,
+            version,
+            question,
+            question_embedding,
+            answer.model_dump(include={"answer", "sources", "confidence_score"}),
+        )
+
+    async def get_document_status(self, doc_id: str, context_id: Optional[str] = None) -> str:
         """
         Get the processing status of a document within a context.
         """
-        status_key = f"{context_id}:{doc_id}" if context_id else str(doc_id)
+        status_key = f"{context_id}:{doc_id}" if context_id else doc_id
         return self._document_status.get(status_key, "not_found")
 
     async def delete_context(self, context_id: str) -> None:
@@ -109,34 +335,17 @@ class RAGService:
         except Exception as e:
             raise Exception(f"Error deleting context: {str(e)}")
 
-    def _extract_text_from_pdf(self, file_path: str) -> str:
-        """Extract text from a PDF file."""
-        converter = DocumentConverter()
-        result = converter.convert(file_path)
-        return result.document.export_to_text()
-
-    def _chunk_text(self, text: str, chunk_size: int = 1000) -> List[str]:
-        """Split text into chunks of approximately equal size."""
-        words = text.split()
-        chunks = []
-        current_chunk = []
-        current_size = 0
-
-        for word in words:
-            word_size = len(word) + 1  # +1 for space
-            if current_size + word_size > chunk_size:
-                if current_chunk:  # Avoid empty chunks
-                    chunks.append(" ".join(current_chunk))
-                current_chunk = [word]
-                current_size = word_size
-            else:
-                current_chunk.append(word)
-                current_size += word_size
-
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
-
-        return chunks
+    def _hash_file(self, file_path: str, block_size: int = 1 << 20) -> str:
+        """sha256 of a file, read in blocks."""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            while block := file.read(block_size):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _count_pdf_pages(self, file_path: str) -> int:
+        """Count the pages of a PDF file without converting it."""
+        return len(PdfReader(file_path).pages)
 
     def _calculate_confidence_score(self, response: Dict[str, Any], context_id: Optional[str] = None) -> float:
         """
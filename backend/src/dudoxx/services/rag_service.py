@@ -1,7 +1,5 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Tuple
 from dotenv import load_dotenv
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain_openai import ChatOpenAI
 from langchain.chains.retrieval_qa.base import RetrievalQA
 from langchain.memory import ConversationBufferMemory
@@ -13,25 +11,48 @@ from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts import PromptTemplate
 from langchain.chains.conversational_retrieval.base import ConversationalRetrievalChain
 
-from langchain.schema import StrOutputParser
-from langchain.schema.runnable import RunnablePassthrough, RunnableSequence
-
 from dudoxx.schemas.rag import StructuredAnswer
 from dudoxx.exceptions.rag_exceprions import RAGServiceError
+from dudoxx.services.web_rag_store_service import get_web_rag_store
 
 load_dotenv()
 
+ANSWER_PROMPT = PromptTemplate(
+    template="Answer the following question based on the context provided. If you're not sure, say 'I don't know'.\n\nContext: {context}\n\nQuestion: {question}\n\nAnswer: ",
+    input_variables=["context", "question"],
+)
+
+CONVERSATIONAL_PROMPT = PromptTemplate(
+    template="Use the following pieces of context to answer the question at the end. If you don't know the answer, just say that you don't know, don't try to make up an answer.\n\nContext: {context}\n\nQuestion: {question}\n\nHelpful Answer:",
+    input_variables=["context", "question"],
+)
+
 
 class RAGService:
     def __init__(self) -> None:
         self.search = DuckDuckGoSearchAPIWrapper()
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-ada-002")
-        self.vector_store = FAISS.from_texts([""], self.embeddings)
+        self.vector_store = get_web_rag_store()
+        self.embeddings = self.vector_store.embeddings
         self.llm = ChatOpenAI(
             temperature=0, streaming=True, callback_manager=CallbackManager([StreamingStdOutCallbackHandler()])
         )
         self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
         self.output_parser = PydanticOutputParser(pydantic_object=StructuredAnswer)
+        # The retrievers search the shared store live, so the chains are built once and
+        # see everything search_and_store adds later
+        self.qa_chain = RetrievalQA.from_chain_type(
+            llm=self.llm,
+            chain_type="stuff",
+            retriever=self.vector_store.as_retriever(),
+            return_source_documents=True,
+            chain_type_kwargs={"prompt": ANSWER_PROMPT},
+        )
+        self.conversational_chain = ConversationalRetrievalChain.from_llm(
+            llm=self.llm,
+            retriever=self.vector_store.as_retriever(),
+            return_source_documents=True,
+            rephrase_question=True,
+        )
 
     async def search_and_store(self, query: str) -> None:
         try:
@@ -46,19 +67,7 @@ class RAGService:
 
     async def get_answer(self, query: str) -> StructuredAnswer:
         try:
-            qa_chain = RetrievalQA.from_chain_type(
-                llm=self.llm,
-                chain_type="stuff",
-                retriever=self.vector_store.as_retriever(),
-                return_source_documents=True,
-                chain_type_kwargs={
-                    "prompt": PromptTemplate(
-                        template="Answer the following question based on the context provided. If you're not sure, say 'I don't know'.\n\nContext: {context}\n\nQuestion: {question}\n\nAnswer: ",
-                        input_variables=["context", "question"],
-                    )
-                },
-            )
-            result = await qa_chain.ainvoke({"query": query})
+            result = await self.qa_chain.ainvoke({"query": query})
 
             sources = self._extract_sources(result.get("source_documents", []))
             answer = result.get("result", "I don't have an answer for that question.")
@@ -71,31 +80,10 @@ class RAGService:
 
     async def get_conversational_answer(self, query: str) -> Dict[str, Any]:
         try:
-            prompt = PromptTemplate(
-                template="Use the following pieces of context to answer the question at the end. If you don't know the answer, just say that you don't know, don't try to make up an answer.\n\nContext: {context}\n\nQuestion: {query}\n\nHelpful Answer:",
-                input_variables=["context", "query"],
-            )
-
-            history_aware_retriever = self.vector_store.as_retriever()
-
-            retrieval_chain = ConversationalRetrievalChain.from_llm(
-                llm=self.llm,
-                retriever=history_aware_retriever,
-                return_source_documents=True,
-                rephrase_question=True,
-            )
-
-            question_generator = RunnableSequence(
-                RunnablePassthrough(),
-                prompt,
-                self.llm,
-                StrOutputParser(),
-            )
-            result = await retrieval_chain.ainvoke(
+            result = await self.conversational_chain.ainvoke(
                 {
                     "question": query,
                     "chat_history": [],  # Add chat history here if available
-                    "question_generator": question_generator,
                 }
             )
 
@@ -106,6 +94,31 @@ class RAGService:
         except Exception as e:
             raise RAGServiceError(f"Error in get_conversational_answer: {str(e)}")
 
+    async def stream_answer(self, query: str, prompt: PromptTemplate = ANSWER_PROMPT) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream an answer as (event, data) pairs: the retrieved sources first, then each
+        token as the LLM produces it, then a final event with the confidence.
+        """
+        try:
+            documents = await self.vector_store.as_retriever().ainvoke(query)
+            sources = self._extract_sources(documents)
+            yield "sources", sources
+
+            context = "\n\n".join(doc.page_content for doc in documents)
+            answer = []
+            async for chunk in self.llm.astream(prompt.format(context=context, question=query)):
+                if chunk.content:
+                    answer.append(chunk.content)
+                    yield "token", chunk.content
+
+            yield "done", {"sources": sources, "confidence": self._calculate_confidence("".join(answer), sources)}
+        except Exception as e:
+            raise RAGServiceError(f"Error in stream_answer: {str(e)}")
+
+    def stream_conversational_answer(self, query: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Streaming variant of get_conversational_answer; without chat history the question is used as is."""
+        return self.stream_answer(query, prompt=CONVERSATIONAL_PROMPT)
+
     def _extract_sources(self, documents: List[Document]) -> List[str]:
         sources = []
         for doc in documents:
@@ -0,0 +1,165 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+
+from dudoxx.config import Settings
+from dudoxx.services.redis_service import RedisCacheService
+
+logger = logging.getLogger(__name__)
+
+# Sliding window counter: the previous window's count, weighted by how much of it
+# still overlaps the sliding window, plus the current window's count. Grants up to
+# ARGV[4] tokens at once, but a batch only while the key is under half its limit.
+_SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local requested = tonumber(ARGV[4])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local used = math.floor(previous * (window - elapsed) / window) + current
+if requested > 1 and used + requested > limit / 2 then
+    requested = 1
+end
+if used + requested > limit then
+    return {0, limit - used}
+end
+redis.call('INCRBY', KEYS[1], requested)
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {requested, limit - used - requested}
+"""
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+@dataclass
+class _Lease:
+    """Tokens granted by Redis that this process hands out without asking again."""
+
+    tokens: int
+    remaining: int  # remaining in Redis after the grant, for the headers
+    expires_at: float  # end of the window the tokens were counted in
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: float  # seconds until the current window ends
+
+
+class RateLimitStore:
+    """
+    Per-identity sliding window limits, checked atomically in Redis by one script.
+
+    While a key is well under its limit, Redis grants a batch of tokens that this
+    process then spends locally, so most requests of a busy key cost no round trip.
+    A batch is local_share of the limit, rounded up, and never less than two tokens.
+    Granted tokens count against the limit as soon as they are leased, so the limit
+    is never exceeded; unspent ones expire with their window.
+    """
+
+    def __init__(self, redis_cache: RedisCacheService, local_share: float, max_local_entries: int = 10000) -> None:
+        self.redis_cache = redis_cache
+        self.local_share = local_share
+        self.max_local_entries = max_local_entries
+        self._script = redis_cache.redis.register_script(_SLIDING_WINDOW_SCRIPT)
+        self._leases: Dict[str, _Lease] = {}
+
+    def _take_local(self, key: str, now: float) -> Optional[_Lease]:
+        lease = self._leases.get(key)
+        if lease is None or lease.tokens <= 0 or lease.expires_at <= now:
+            return None
+        lease.tokens -= 1
+        return lease
+
+    def _prune(self, now: float) -> None:
+        if len(self._leases) > self.max_local_entries:
+            self._leases = {key: lease for key, lease in self._leases.items() if lease.expires_at > now}
+
+    async def hit(self, key: str, limit: int, window: float) -> RateLimitResult:
+        now = time.time()
+        window_ms = int(window * 1000)
+        now_ms = int(now * 1000)
+        index, elapsed_ms = divmod(now_ms, window_ms)
+        window_end = (index + 1) * window_ms / 1000
+
+        lease = self._take_local(key, now)
+        if lease is not None:
+            return RateLimitResult(True, limit, lease.remaining + lease.tokens, window_end - now)
+
+        # At least two, so the 5 per minute limits of most routes lease one token too
+        batch = max(2, math.ceil(limit * self.local_share))
+        granted, remaining = await self._script(
+            keys=[f"ratelimit:{{{key}}}:{index}", f"ratelimit:{{{key}}}:{index - 1}"],
+            args=[limit, window_ms, elapsed_ms, batch],
+        )
+        if not granted:
+            return RateLimitResult(False, limit, max(0, remaining), window_end - now)
+        if granted > 1:
+            self._prune(now)
+            self._leases[key] = _Lease(tokens=granted - 1, remaining=remaining, expires_at=window_end)
+        return RateLimitResult(True, limit, remaining + granted - 1, window_end - now)
+
+
+@lru_cache()
+def get_rate_limit_store() -> RateLimitStore:
+    """Return the process-wide rate limit store."""
+    return RateLimitStore(redis_cache=RedisCacheService(), local_share=get_settings().RATE_LIMIT_LOCAL_SHARE)
+
+
+class RateLimiter:
+    """
+    Route dependency allowing `times` requests per `seconds` for each API key, scaled
+    by the key's quota tier. Requests without a verified key are limited per client
+    address. List it after ApiKeyMiddleware, which identifies the key.
+    """
+
+    def __init__(self, times: int, seconds: float) -> None:
+        self.times = times
+        self.seconds = seconds
+
+    def _identity(self, request: Request) -> Tuple[str, str]:
+        verified = getattr(request.state, "api_key", None)
+        if verified is not None:
+            return f"key:{verified.prefix}", verified.quota_tier
+        host = request.client.host if request.client else "unknown"
+        return f"ip:{host}", "standard"
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        identity, tier = self._identity(request)
+        multiplier = get_settings().RATE_LIMIT_TIERS.get(tier, 1.0)
+        if multiplier <= 0:
+            return
+        limit = max(1, int(self.times * multiplier))
+        route = request.scope.get("route")
+        key = f"{identity}:{request.method}:{route.path if route else request.url.path}"
+
+        try:
+            result = await get_rate_limit_store().hit(key, limit, self.seconds)
+        except Exception as e:
+            # Redis being unavailable should not take every route down with it
+            logger.warning(f"Rate limit check failed, allowing request: {e}")
+            return
+
+        headers = {
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": str(result.remaining),
+            "X-RateLimit-Reset": str(math.ceil(result.reset)),
+        }
+        if not result.allowed:
+            raise HTTPException(
+                status_code=429,
+                detail="Too Many Requests",
+                headers={**headers, "Retry-After": str(math.ceil(result.reset))},
+            )
+        response.headers.update(headers)
@@ -1,33 +1,381 @@
 import redis.asyncio as redis
-import json
-from typing import Optional
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 import os
+import msgpack
+import orjson
+import zstandard
 from dotenv import load_dotenv
 
+from dudoxx.config import Settings
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 redis_host = os.getenv("DDX_MMRAG_REDIS_HOST")
 redis_port = os.getenv("DDX_MMRAG_REDIS_PORT")
 redis_dns = f"redis://{redis_host}:{redis_port}"
 
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Approximate per-entry cost of the local tier beyond the value and key bytes
+_ENTRY_OVERHEAD = 200
+
+# First byte of an encoded value. JSON written before values carried a header
+# starts with a printable character or whitespace, never with one of these.
+_ORJSON = 0x01
+_MSGPACK = 0x02
+_ZSTD = 0x10
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+class RedisCodec:
+    """
+    Serialises cached values with orjson or msgpack behind a one-byte header, compressing
+    those above a size threshold with zstd. Decoding follows the header, so processes
+    configured differently read each other's values.
+    """
+
+    def __init__(self, serializer: str, compression_threshold: int, compression_level: int) -> None:
+        self.format = _MSGPACK if serializer == "msgpack" else _ORJSON
+        self.compression_threshold = compression_threshold
+        self._compressor = zstandard.ZstdCompressor(level=compression_level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def encode(self, value: Any) -> bytes:
+        data = msgpack.packb(value) if self.format == _MSGPACK else orjson.dumps(value)
+        header = self.format
+        if 0 < self.compression_threshold <= len(data):
+            data = self._compressor.compress(data)
+            header |= _ZSTD
+        return bytes([header]) + data
+
+    def decode(self, data: bytes) -> Any:
+        header = data[0]
+        if header & ~_ZSTD not in (_ORJSON, _MSGPACK):
+            # Plain JSON from before values carried a header
+            return orjson.loads(data)
+        payload = data[1:]
+        if header & _ZSTD:
+            payload = self._decompressor.decompress(payload)
+        if header & ~_ZSTD == _MSGPACK:
+            return msgpack.unpackb(payload)
+        return orjson.loads(payload)
+
+
+class RedisStats:
+    """Call counts and latencies of the RedisCacheService helpers, per operation."""
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = {}
+        self.total: Dict[str, float] = {}
+        self.max: Dict[str, float] = {}
+
+    def record(self, operation: str, seconds: float) -> None:
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        self.total[operation] = self.total.get(operation, 0.0) + seconds
+        self.max[operation] = max(self.max.get(operation, 0.0), seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            operation: {
+                "calls": calls,
+                "avg_ms": round(self.total[operation] / calls * 1000, 3),
+                "max_ms": round(self.max[operation] * 1000, 3),
+            }
+            for operation, calls in self.calls.items()
+        }
+
+
+redis_stats = RedisStats()
+
+
+class LocalCacheTier:
+    """
+    In-process LRU of raw values read through RedisCacheService clients that have a
+    namespace, bounded by a byte budget.
+
+    Writes through those clients publish the key on INVALIDATION_CHANNEL, and every
+    subscribed process drops its copy when the message arrives. Entries are served
+    only while this process is subscribed, and expire after ttl in case a message is
+    lost while resubscribing. Hits and misses are counted per namespace.
+    """
+
+    def __init__(self, redis_url: str, enabled: bool, max_bytes: int, ttl: float) -> None:
+        self.redis_url = redis_url
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.bytes = 0
+        # Bumped by every invalidation, so a read that raced one is not stored
+        self.epoch = 0
+        self.subscribed = False
+        # key -> (raw value, size in bytes, expiry on the monotonic clock)
+        self._entries: "OrderedDict[str, Tuple[bytes, int, float]]" = OrderedDict()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, namespace: str, hit: bool) -> None:
+        counts = self._hits if hit else self._misses
+        counts[namespace] = counts.get(namespace, 0) + 1
+
+    def lookup(self, namespace: str, key: str) -> Optional[bytes]:
+        if not self.subscribed:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] <= time.monotonic():
+            self._drop(key)
+            entry = None
+        self.record(namespace, entry is not None)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def store(self, key: str, value: bytes, epoch: int) -> None:
+        size = len(value) + len(key) + _ENTRY_OVERHEAD
+        if not self.subscribed or epoch != self.epoch or size > self.max_bytes:
+            return
+        self._drop(key)
+        self._entries[key] = (value, size, time.monotonic() + self.ttl)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def invalidate(self, key: str) -> None:
+        self.epoch += 1
+        self._drop(key)
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self._entries.clear()
+        self.bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        namespaces = {}
+        for namespace in sorted(set(self._hits) | set(self._misses)):
+            hits, misses = self._hits.get(namespace, 0), self._misses.get(namespace, 0)
+            namespaces[namespace] = {"hits": hits, "misses": misses, "hit_ratio": round(hits / (hits + misses), 4)}
+        return {
+            "enabled": self.enabled,
+            "subscribed": self.subscribed,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "namespaces": namespaces,
+        }
+
+    async def _listen(self) -> None:
+        client = redis.Redis(connection_pool=get_connection_pool(self.redis_url))
+        while True:
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Writes made while unsubscribed were not seen
+                self.clear()
+                self.subscribed = True
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.invalidate(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Local cache invalidation listener failed, resubscribing")
+                await asyncio.sleep(1)
+            finally:
+                self.subscribed = False
+                self.clear()
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        """Start serving local entries, following invalidations from every process."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+
+
+_pools: Dict[str, redis.ConnectionPool] = {}
+
+
+def get_connection_pool(redis_url: str = redis_dns) -> redis.ConnectionPool:
+    """The process-wide connection pool for a Redis URL, shared by every client."""
+    pool = _pools.get(redis_url)
+    if pool is None:
+        pool = _pools[redis_url] = redis.ConnectionPool.from_url(
+            redis_url, max_connections=get_settings().REDIS_MAX_CONNECTIONS
+        )
+    return pool
+
+
+@lru_cache()
+def get_codec() -> RedisCodec:
+    settings = get_settings()
+    return RedisCodec(
+        serializer=settings.REDIS_SERIALIZER,
+        compression_threshold=settings.REDIS_COMPRESSION_THRESHOLD,
+        compression_level=settings.REDIS_COMPRESSION_LEVEL,
+    )
+
+
+@lru_cache()
+def get_local_cache() -> LocalCacheTier:
+    """Return the process-wide local tier in front of Redis."""
+    settings = get_settings()
+    return LocalCacheTier(
+        redis_url=redis_dns,
+        enabled=settings.REDIS_LOCAL_CACHE_ENABLED,
+        max_bytes=settings.REDIS_LOCAL_CACHE_MAX_BYTES,
+        ttl=settings.REDIS_LOCAL_CACHE_TTL,
+    )
+
+
+def get_redis_stats(redis_url: str = redis_dns) -> Dict[str, Any]:
+    """Return connection pool usage, per-operation latencies and local tier hit ratios."""
+    pool = get_connection_pool(redis_url)
+    # redis-py exposes no public counters; None where a release renamed these internals
+    in_use = getattr(pool, "_in_use_connections", None)
+    idle = getattr(pool, "_available_connections", None)
+    return {
+        "max_connections": pool.max_connections,
+        "created_connections": getattr(pool, "_created_connections", None),
+        "in_use_connections": len(in_use) if in_use is not None else None,
+        "idle_connections": len(idle) if idle is not None else None,
+        "operations": redis_stats.snapshot(),
+        "local_cache": get_local_cache().snapshot(),
+    }
+
+
+async def close_connection_pools() -> None:
+    """Disconnect every pooled connection; call once at process shutdown."""
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.disconnect()
+
 
 class RedisCacheService:
-    def __init__(self, redis_url: str = redis_dns) -> None:
-        self.redis = redis.from_url(redis_url)
+    def __init__(self, redis_url: str = redis_dns, namespace: Optional[str] = None) -> None:
+        # A client over the shared pool is cheap; connections are reused across clients
+        self.redis = redis.Redis(connection_pool=get_connection_pool(redis_url))
+        self.codec = get_codec()
+        # Clients with a namespace read through the local tier and publish their writes
+        self.namespace = namespace
+        self.local = get_local_cache() if namespace else None
+
+    def encode(self, value: Any) -> bytes:
+        return self.codec.encode(value)
+
+    def decode(self, data: Optional[bytes]) -> Optional[Any]:
+        return self.codec.decode(data) if data else None
+
+    def publish_invalidation(self, pipe: Any, key: str) -> None:
+        """Queue on pipe the message that makes every process drop its local copy of key."""
+        if self.local is not None:
+            self.local.invalidate(key)
+            pipe.publish(INVALIDATION_CHANNEL, key)
 
     async def set(self, key: str, value: dict, expire: int = 3600) -> None:
         """Set a value in the Redis cache."""
-        await self.redis.set(key, json.dumps(value), ex=expire)
+        if self.local is not None:
+            await self.mset_bytes({key: self.encode(value)}, expire=expire)
+            return
+        start = time.perf_counter()
+        await self.redis.set(key, self.encode(value), ex=expire)
+        redis_stats.record("set", time.perf_counter() - start)
 
     async def get(self, key: str) -> Optional[dict]:
         """Get a value from the Redis cache."""
-        cached_value = await self.redis.get(key)
-        return json.loads(cached_value) if cached_value else None
+        if self.local is None:
+            start = time.perf_counter()
+            cached_value = await self.redis.get(key)
+            redis_stats.record("get", time.perf_counter() - start)
+            return self.decode(cached_value)
+        return self.decode((await self.mget_bytes([key]))[0])
+
+    async def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round trip, None for each missing key."""
+        return [self.decode(value) for value in await self.mget_bytes(keys)]
+
+    async def mset(self, mapping: Dict[str, Any], expire: int = 3600) -> None:
+        """Set several values with an expiry in one pipelined round trip."""
+        await self.mset_bytes({key: self.encode(value) for key, value in mapping.items()}, expire=expire)
+
+    async def mget_bytes(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Get several raw values in at most one round trip, local entries first."""
+        if not keys:
+            return []
+        values = [self.local.lookup(self.namespace, key) if self.local else None for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if not missing:
+            return values
+        epoch = self.local.epoch if self.local else 0
+        start = time.perf_counter()
+        fetched = await self.redis.mget([keys[i] for i in missing])
+        redis_stats.record("mget" if len(missing) > 1 else "get", time.perf_counter() - start)
+        for i, value in zip(missing, fetched):
+            values[i] = value
+            if self.local is not None and value is not None:
+                self.local.store(keys[i], value, epoch)
+        return values
+
+    async def mset_bytes(self, mapping: Dict[str, bytes], expire: int = 3600) -> None:
+        """Set several raw values with an expiry in one pipelined round trip."""
+        if not mapping:
+            return
+        async with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ex=expire)
+                self.publish_invalidation(pipe, key)
+
+    def pipeline(self, transaction: bool = False) -> "_TimedPipeline":
+        """Pipeline whose queued commands are sent in one round trip when the block exits."""
+        return _TimedPipeline(self.redis.pipeline(transaction=transaction))
 
     async def delete(self, key: str) -> None:
         """Delete a key from the Redis cache."""
-        await self.redis.delete(key)
+        async with self.pipeline() as pipe:
+            pipe.delete(key)
+            self.publish_invalidation(pipe, key)
 
     async def close(self) -> None:
-        """Close the Redis connection."""
-        await self.redis.close()
+        """Release this client; the shared pool stays open for the other clients."""
+        await self.redis.aclose()
+
+
+class _TimedPipeline:
+    """Pipeline context that executes on exit and records the round trip."""
+
+    def __init__(self, pipe: Any) -> None:
+        self.pipe = pipe
+
+    async def __aenter__(self) -> Any:
+        return self.pipe
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            if exc_type is None and len(self.pipe):
+                start = time.perf_counter()
+                await self.pipe.execute()
+                redis_stats.record("pipeline", time.perf_counter() - start)
+        finally:
+            await self.pipe.reset()
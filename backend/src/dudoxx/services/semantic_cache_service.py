@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dudoxx.config import Settings
+from dudoxx.services.redis_service import RedisCacheService
+
+logger = logging.getLogger(__name__)
+
+# The vectors of the most recently cached questions, in one round trip
+_RECENT_VECTORS_SCRIPT = """
+local fields = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #fields == 0 then
+    return {{}, {}}
+end
+return {fields, redis.call('HMGET', KEYS[2], unpack(fields))}
+"""
+
+# Move a question to the front of the recent list and drop whatever falls off its end
+# from both hashes, so the three keys always hold the same scan_entries questions
+_STORE_SCRIPT = """
+local limit = tonumber(ARGV[4])
+redis.call('LREM', KEYS[1], 0, ARGV[1])
+redis.call('LPUSH', KEYS[1], ARGV[1])
+redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[3])
+local dropped = redis.call('LRANGE', KEYS[1], limit, -1)
+if #dropped > 0 then
+    redis.call('LTRIM', KEYS[1], 0, limit - 1)
+    redis.call('HDEL', KEYS[2], unpack(dropped))
+    redis.call('HDEL', KEYS[3], unpack(dropped))
+end
+for _, key in ipairs(KEYS) do
+    redis.call('EXPIRE', key, ARGV[5])
+end
+"""
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+def _version_key(context_id: str) -> str:
+    return f"rag:context_version:{context_id}"
+
+
+async def get_context_version(cache: RedisCacheService, context_id: str) -> int:
+    """Current document version of a context; bumped whenever its documents change."""
+    value = await cache.redis.get(_version_key(context_id))
+    return int(value) if value else 0
+
+
+async def bump_context_version(cache: RedisCacheService, context_id: Optional[str]) -> None:
+    """Invalidate every cached answer of a context by moving it to a new version."""
+    if not context_id:
+        return
+    try:
+        await cache.redis.incr(_version_key(context_id))
+    except Exception as e:
+        logger.warning(f"Could not bump version of context {context_id}: {e}")
+
+
+class SemanticAnswerCache:
+    """
+    Per-context cache of answers, looked up by cosine similarity of the question embedding.
+
+    Entries live in two Redis hashes per (context, version): float32 question vectors and
+    JSON answers, plus a list of question fields, newest first. Only the scan_entries newest
+    questions are kept, so a lookup costs one bounded comparison and the oldest question is
+    evicted from all three keys when a new one is stored. Adding or deleting documents bumps the context version, so older entries are never
+    read again and expire with their TTL.
+    """
+
+    def __init__(self, threshold: float, expire: int, scan_entries: int, cache: RedisCacheService) -> None:
+        self.threshold = threshold
+        self.expire = expire
+        self.scan_entries = scan_entries
+        self.cache = cache
+        self._recent_vectors = cache.redis.register_script(_RECENT_VECTORS_SCRIPT)
+        self._store = cache.redis.register_script(_STORE_SCRIPT)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _keys(context_id: str, version: int) -> Tuple[str, str, str]:
+        prefix = f"rag:answer_cache:{context_id}:v{version}"
+        return f"{prefix}:vectors", f"{prefix}:answers", f"{prefix}:recent"
+
+    async def lookup(self, context_id: str, version: int, question_embedding: List[float]) -> Optional[Dict[str, Any]]:
+        """Return the cached answer of the most similar question above the threshold."""
+        vectors_key, answers_key, recent_key = self._keys(context_id, version)
+        try:
+            fields, vectors = await self._recent_vectors(keys=[recent_key, vectors_key], args=[self.scan_entries])
+            stored = [(field, vector) for field, vector in zip(fields, vectors) if vector is not None]
+            if not stored:
+                self.misses += 1
+                return None
+
+            fields = [field for field, _ in stored]
+            matrix = np.stack([np.frombuffer(vector, dtype=np.float32) for _, vector in stored])
+            query = np.asarray(question_embedding, dtype=np.float32)
+            scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query) + 1e-12)
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            answer = await self.cache.redis.hget(answers_key, fields[best])
+            if answer is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return json.loads(answer)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+    async def store(
+        self, context_id: str, version: int, question: str, question_embedding: List[float], answer: Dict[str, Any]
+    ) -> None:
+        """Cache an answer for a question under the context version it was computed against."""
+        vectors_key, answers_key, recent_key = self._keys(context_id, version)
+        field = hashlib.sha256(question.encode("utf-8")).hexdigest()
+        try:
+            await self._store(
+                keys=[recent_key, vectors_key, answers_key],
+                args=[
+                    field,
+                    np.asarray(question_embedding, dtype=np.float32).tobytes(),
+                    json.dumps(answer),
+                    self.scan_entries,
+                    self.expire,
+                ],
+            )
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {e}")
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+@lru_cache()
+def get_semantic_answer_cache() -> SemanticAnswerCache:
+    """Return the process-wide semantic answer cache."""
+    settings = get_settings()
+    return SemanticAnswerCache(
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        expire=settings.SEMANTIC_CACHE_TTL,
+        scan_entries=settings.SEMANTIC_CACHE_SCAN_ENTRIES,
+        cache=RedisCacheService(),
+    )
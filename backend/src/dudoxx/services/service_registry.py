@@ -0,0 +1,48 @@
+from typing import Any, Callable, Dict, Iterable, Type, TypeVar
+from fastapi import Request
+from dudoxx.services.redis_service import RedisCacheService
+
+T = TypeVar("T")
+
+
+class ServiceRegistry:
+    """
+    Services shared by every request of a worker.
+
+    Constructing a service builds its OpenAI, Deepgram, DuckDuckGo and Redis clients
+    (and for the RAG services their chains), so the app builds each one once in its
+    lifespan and routes receive the shared instance through get_service().
+    """
+
+    def __init__(self) -> None:
+        self._services: Dict[type, Any] = {}
+
+    def start(self, service_types: Iterable[type]) -> None:
+        """Construct the given services up front so configuration errors surface at startup."""
+        for service_type in service_types:
+            self.get(service_type)
+
+    def get(self, service_type: Type[T]) -> T:
+        """Return the shared instance, constructing it on first use."""
+        service = self._services.get(service_type)
+        if service is None:
+            service = self._services[service_type] = service_type()
+        return service
+
+    async def close(self) -> None:
+        """Close the Redis clients the services hold and forget the instances."""
+        for service in self._services.values():
+            # Services may share one client, so close each only once
+            clients = {id(value): value for value in vars(service).values() if isinstance(value, RedisCacheService)}
+            for client in clients.values():
+                await client.close()
+        self._services.clear()
+
+
+def get_service(service_type: Type[T]) -> Callable[[Request], T]:
+    """FastAPI dependency returning the app's shared instance of service_type."""
+
+    def dependency(request: Request) -> T:
+        return request.app.state.services.get(service_type)
+
+    return dependency
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import secrets
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from dudoxx.services.redis_service import RedisCacheService
+
+logger = logging.getLogger(__name__)
+
+# Deletes the lock only while it still holds our token, so an expired lease taken
+# over by another worker is not released by the previous holder
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+def _done_channel(key: str) -> str:
+    return f"computed:{key}"
+
+
+class SingleFlightCache:
+    """
+    Cache for expensive values that computes each missing key once across all workers,
+    and refreshes expired keys without making anyone wait.
+
+    Entries are fresh for soft_ttl and kept for hard_ttl. A fresh entry is returned as
+    is. A stale one is returned too, while one worker, the holder of the key's Redis
+    lease, recomputes it in the background. On a miss the lease holder computes the
+    value and the other requests, in any worker, wait for it to be published instead
+    of running the computation themselves. Requests for the same key within one
+    process share a single call either way.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCacheService,
+        soft_ttl: float,
+        hard_ttl: int,
+        lock_ttl: float,
+        wait_timeout: float,
+    ) -> None:
+        self.cache = cache
+        self.soft_ttl = soft_ttl
+        self.hard_ttl = hard_ttl
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self._release = cache.redis.register_script(_RELEASE_SCRIPT)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refreshes: Set[asyncio.Task] = set()
+
+    async def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = await self.cache.get(key)
+        # Values cached before entries carried a freshness time count as misses
+        return entry if entry and "value" in entry else None
+
+    async def peek_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Fresh values of keys in one round trip, None for missing or stale ones."""
+        entries = await self.cache.mget(keys)
+        now = time.time()
+        return [
+            entry["value"] if entry and "value" in entry and entry["fresh_until"] > now else None for entry in entries
+        ]
+
+    async def _acquire(self, key: str) -> Optional[str]:
+        token = secrets.token_hex(16)
+        acquired = await self.cache.redis.set(_lock_key(key), token, nx=True, px=int(self.lock_ttl * 1000))
+        return token if acquired else None
+
+    async def _compute_and_store(self, key: str, token: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await compute()
+            entry = {"value": value, "fresh_until": time.time() + self.soft_ttl}
+            await self.cache.set(key, entry, expire=self.hard_ttl)
+            await self.cache.redis.publish(_done_channel(key), "1")
+            return value
+        finally:
+            await self._release(keys=[_lock_key(key)], args=[token])
+
+    async def _refresh(self, key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+        token = await self._acquire(key)
+        if token is None:
+            # Another worker is already refreshing
+            return
+        try:
+            await self._compute_and_store(key, token, compute)
+        except Exception:
+            logger.exception(f"Background refresh of {key} failed, serving the stale value")
+
+    async def _wait_for_leader(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        deadline = time.monotonic() + self.wait_timeout
+        pubsub = self.cache.redis.pubsub()
+        try:
+            # Subscribe before checking again, so a value published in between is not missed
+            await pubsub.subscribe(_done_channel(key))
+            while True:
+                entry = await self._read(key)
+                if entry is not None:
+                    return entry["value"]
+                token = await self._acquire(key)
+                if token is not None:
+                    # The previous holder failed or its lease ran out
+                    return await self._compute_and_store(key, token, compute)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Timed out waiting for {key} to be computed")
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=min(remaining, 1.0))
+        finally:
+            await pubsub.aclose()
+
+    async def _load(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        entry = await self._read(key)
+        if entry is not None:
+            if entry["fresh_until"] <= time.time():
+                task = asyncio.create_task(self._refresh(key, compute))
+                self._refreshes.add(task)
+                task.add_done_callback(self._refreshes.discard)
+            return entry["value"]
+
+        token = await self._acquire(key)
+        if token is not None:
+            return await self._compute_and_store(key, token, compute)
+        return await self._wait_for_leader(key, compute)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value of key, computing it with compute() at most once across workers."""
+        task = self._inflight.get(key)
+        if task is None:
+            # A task of its own, so a disconnecting client does not cancel it for the others
+            task = asyncio.create_task(self._load(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
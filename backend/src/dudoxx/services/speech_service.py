@@ -1,18 +1,24 @@
 # speech_service.py
 import os
-import tempfile
 import asyncio
+from functools import lru_cache
 from typing import Optional, Tuple
 from fastapi import HTTPException
 from openai import OpenAI
 from dudoxx.exceptions.openai_exceptions import handle_openai_api_error
-from dudoxx.services.redis_service import RedisCacheService
+from dudoxx.services.task_status_service import TaskStatusService
+from dudoxx.config import Settings
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
 
 
 class SpeechService:
     def __init__(self):
         self.openai_client = OpenAI()
-        self.cache_service = RedisCacheService()
+        self.task_status = TaskStatusService()
         self.SUPPORTED_VOICES = ["alloy", "echo", "fable", "onyx", "nova", "shimmer"]
         self.DEFAULT_VOICE = "nova"
 
@@ -20,27 +26,28 @@ class SpeechService:
         """Process speech generation in background task"""
         try:
             # Update initial status
-            await self.cache_service.set(task_id, {"status": "processing", "progress": 0})
+            await self.task_status.set(task_id, {"status": "processing", "progress": 0})
 
             # Run the synchronous OpenAI call in a thread pool
             speech_data = await self._generate_speech_sync(text, voice)
 
-            # Create temporary file path
-            temp_file_path = os.path.join(tempfile.gettempdir(), f"{task_id}.mp3")
+            # Written to shared storage, the API serves it from there
+            output_dir = get_settings().SPEECH_OUTPUT_DIR
+            os.makedirs(output_dir, exist_ok=True)
+            temp_file_path = os.path.join(output_dir, f"{task_id}.mp3")
 
             # Write file in a non-blocking way
             await self._write_file_async(temp_file_path, speech_data)
 
             # Update cache with success status and file location
-            await self.cache_service.set(
+            await self.task_status.set(
                 task_id,
                 {"status": "completed", "file_path": temp_file_path, "content_type": "audio/mpeg", "progress": 100},
             )
 
         except Exception as e:
-            # Update cache with error status
-            error_message = f"Speech generation failed: {str(e)}"
-            await self.cache_service.set(task_id, {"status": "failed", "error": error_message, "progress": 0})
+            # The job queue retries, and marks the task failed once it gives up
+            raise Exception(f"Speech generation failed: {str(e)}") from e
 
     async def _generate_speech_sync(self, text: str, voice: Optional[str] = None) -> bytes:
         """Generate speech using OpenAI's API in a non-blocking way"""
@@ -79,7 +86,7 @@ class SpeechService:
 
     async def get_speech_file(self, task_id: str) -> Tuple[str, str]:
         """Retrieve generated speech file details"""
-        task_data = await self.cache_service.get(task_id)
+        task_data = await self.task_status.get(task_id)
 
         if not task_data:
             raise HTTPException(status_code=404, detail="Task not found")
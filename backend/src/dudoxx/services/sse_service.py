@@ -0,0 +1,27 @@
+import json
+from typing import Any, AsyncIterator, Tuple
+
+from fastapi.responses import StreamingResponse
+
+
+def format_sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(events: AsyncIterator[Tuple[str, Any]]) -> StreamingResponse:
+    """Stream (event, data) pairs as text/event-stream, reporting failures as an error event."""
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for event, data in events:
+                yield format_sse_event(event, data)
+        except Exception as e:
+            yield format_sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # Disable proxy buffering (nginx) so tokens reach the client as they are generated
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
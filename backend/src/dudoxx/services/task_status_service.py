@@ -0,0 +1,63 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from dudoxx.services.redis_service import RedisCacheService
+
+# Statuses after which a task no longer changes; services differ in capitalisation
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+def task_channel(task_id: str) -> str:
+    return f"task:{task_id}:events"
+
+
+def is_terminal(status: Dict[str, Any]) -> bool:
+    return str(status.get("status", "")).lower() in TERMINAL_STATUSES
+
+
+class TaskStatusService:
+    """Task status records in Redis; every update is also published on the task's channel."""
+
+    def __init__(self, expire: int = 3600) -> None:
+        # Status polls are served from the local tier between updates
+        self.cache = RedisCacheService(namespace="task_status")
+        self.expire = expire
+
+    async def set(self, task_id: str, status: Dict[str, Any]) -> None:
+        """Store the task's status and notify its subscribers in one round trip."""
+        async with self.cache.pipeline() as pipe:
+            pipe.set(task_id, self.cache.encode(status), ex=self.expire)
+            self.cache.publish_invalidation(pipe, task_id)
+            pipe.publish(task_channel(task_id), json.dumps(status))
+
+    async def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return await self.cache.get(task_id)
+
+    async def events(
+        self, task_id: str, timeout: float = 3600, keepalive: float = 15
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Yield ("status", status) for the current status and each update until the task
+        finishes, with ("ping", {}) every keepalive seconds without updates.
+        """
+        pubsub = self.cache.redis.pubsub()
+        # Subscribe before reading the current status so no update falls in between
+        await pubsub.subscribe(task_channel(task_id))
+        try:
+            status = await self.get(task_id)
+            if status is None:
+                yield "error", {"detail": "Task not found"}
+                return
+            yield "status", status
+
+            deadline = asyncio.get_running_loop().time() + timeout
+            while not is_terminal(status) and asyncio.get_running_loop().time() < deadline:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive)
+                if message is None:
+                    yield "ping", {}
+                    continue
+                status = json.loads(message["data"])
+                yield "status", status
+        finally:
+            await pubsub.aclose()
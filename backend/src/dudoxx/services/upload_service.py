@@ -0,0 +1,138 @@
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
+
+import aiofiles
+from fastapi import UploadFile
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from dudoxx.config import Settings
+from dudoxx.exceptions.upload_exceptions import UploadTooLargeError
+
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+@dataclass
+class StoredUpload:
+    """An upload written to disk and the sha256 of its content."""
+
+    path: str
+    size: int
+    sha256: str
+    filename: str
+
+
+async def save_upload(
+    file: UploadFile,
+    directory: str,
+    max_bytes: int,
+    prefix: str = "",
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> StoredUpload:
+    """
+    Copy an upload to a unique file in directory in fixed-size chunks, hashing it on the way.
+
+    Raises UploadTooLargeError, and removes the partial file, once more than max_bytes arrive.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLargeError(f"{file.filename} is larger than {max_bytes} bytes")
+
+    filename = os.path.basename(file.filename or "upload")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{prefix}{uuid.uuid4()}_{filename}")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(path, "wb") as out_file:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"{filename} is larger than {max_bytes} bytes")
+                digest.update(chunk)
+                await out_file.write(chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return StoredUpload(path=path, size=size, sha256=digest.hexdigest(), filename=filename)
+
+
+class UploadLimitMiddleware:
+    """
+    Rejects request bodies over a per-path limit with 413 before they are buffered.
+
+    The declared Content-Length is checked up front; bodies without one (chunked
+    transfer) are counted as they arrive and cut off at the limit, so an oversized
+    upload never reaches the multipart parser's spool file in full.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]) -> None:
+        self.app = app
+        self.limits = limits
+
+    @staticmethod
+    def _too_large(limit: int) -> JSONResponse:
+        return JSONResponse({"detail": f"Request body is larger than {limit} bytes"}, status_code=413)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit: Optional[int] = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                declared = -1
+            if declared < 0:
+                response = JSONResponse({"detail": "Invalid Content-Length header"}, status_code=400)
+                await response(scope, receive, send)
+                return
+            if declared > limit:
+                await self._too_large(limit)(scope, receive, send)
+                return
+
+        received = 0
+        exceeded = False
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Look like a client disconnect so the app stops reading
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def limited_send(message: Message) -> None:
+            nonlocal started
+            if exceeded:
+                # Replace whatever error the app produced for the cut-off body
+                if message["type"] == "http.response.start" and not started:
+                    started = True
+                    await self._too_large(limit)(scope, receive, send)
+                return
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded and not started:
+            await self._too_large(limit)(scope, receive, send)
@@ -0,0 +1,272 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import Any, List, Optional, Set, Tuple
+
+import numpy as np
+from langchain.schema import Document
+from langchain.schema.retriever import BaseRetriever
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+from pydantic import Field
+
+from dudoxx.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    return Settings()
+
+
+def _document_key(document: Document) -> str:
+    source = document.metadata.get("source", "") if isinstance(document.metadata, dict) else ""
+    return hashlib.sha256(f"{source}\n{document.page_content}".encode("utf-8")).hexdigest()
+
+
+class WebRAGRetriever(BaseRetriever):
+    """Retriever over the persistent web-search FAISS store."""
+
+    store: Any = Field(default=None, description="PersistentFaissStore instance")
+    k: int = 4
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    async def _aget_relevant_documents(self, query: str) -> List[Document]:
+        return await self.store.asimilarity_search(query, k=self.k)
+
+    def _get_relevant_documents(self, query: str) -> List[Document]:
+        return asyncio.run(self._aget_relevant_documents(query))
+
+
+class PersistentFaissStore:
+    """
+    Process-wide FAISS index of web-search snippets, persisted under index_dir.
+
+    Each snapshot is a version of three files (FAISS index, raw vectors, documents)
+    and a CURRENT file names the live one. Snapshots are loaded with IO_FLAG_MMAP,
+    so the inverted lists of an IVF snapshot stay in the shared page cache rather than
+    in each worker's memory. Added documents go to a small in-memory delta that is
+    searched next to the snapshot until snapshot() merges it into the latest version
+    on disk; other workers pick that version up on their next snapshot() call.
+    """
+
+    def __init__(
+        self,
+        index_dir: str,
+        embeddings: Embeddings,
+        snapshot_interval: float,
+        use_mmap: bool = True,
+        ivf_min_vectors: int = 10000,
+        nprobe: int = 16,
+    ) -> None:
+        self.index_dir = index_dir
+        self.embeddings = embeddings
+        self.snapshot_interval = snapshot_interval
+        self.use_mmap = use_mmap
+        self.ivf_min_vectors = ivf_min_vectors
+        self.nprobe = nprobe
+        self._version: Optional[str] = None
+        self._index: Any = None
+        self._documents: List[Document] = []
+        self._delta_vectors: Optional[np.ndarray] = None
+        self._delta_documents: List[Document] = []
+        self._keys: Set[str] = set()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    def _current_version(self) -> Optional[str]:
+        try:
+            with open(self._path("CURRENT")) as current:
+                return current.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _read_documents(self, version: str) -> List[Document]:
+        with open(self._path(f"documents-{version}.json")) as f:
+            return [Document(page_content=doc["page_content"], metadata=doc["metadata"]) for doc in json.load(f)]
+
+    def _load(self, version: str) -> Tuple[Any, List[Document], Set[str]]:
+        import faiss
+
+        index = faiss.read_index(self._path(f"index-{version}.faiss"), faiss.IO_FLAG_MMAP if self.use_mmap else 0)
+        if hasattr(index, "nprobe"):
+            index.nprobe = self.nprobe
+        documents = self._read_documents(version)
+        return index, documents, {_document_key(doc) for doc in documents}
+
+    def _build_index(self, vectors: np.ndarray) -> Any:
+        import faiss
+
+        dimensions = vectors.shape[1]
+        if len(vectors) < self.ivf_min_vectors:
+            index = faiss.IndexFlatL2(dimensions)
+        else:
+            # Only IVF inverted lists are memory-mapped by IO_FLAG_MMAP; small snapshots stay flat
+            index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dimensions), dimensions, int(4 * np.sqrt(len(vectors))))
+            index.train(vectors)
+        index.add(vectors)
+        return index
+
+    def _write_snapshot(self, vectors: np.ndarray, documents: List[Document]) -> Optional[str]:
+        """Merge the delta into the latest version on disk and make the result current."""
+        import faiss
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(self._path(".lock"), "w") as lock_file:
+            # Serialises writers across worker processes
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            previous = self._current_version()
+            if previous:
+                base_vectors = np.load(self._path(f"vectors-{previous}.npy"), mmap_mode="r")
+                base_documents = self._read_documents(previous)
+            else:
+                base_vectors = np.empty((0, vectors.shape[1]), dtype=np.float32)
+                base_documents = []
+
+            # Another worker may already have stored the same snippets
+            known = {_document_key(doc) for doc in base_documents}
+            fresh = [i for i, doc in enumerate(documents) if _document_key(doc) not in known]
+            if not fresh:
+                return previous
+
+            all_vectors = np.vstack([base_vectors, vectors[fresh]])
+            all_documents = base_documents + [documents[i] for i in fresh]
+            version = str(time.time_ns())
+            faiss.write_index(self._build_index(all_vectors), self._path(f"index-{version}.faiss"))
+            np.save(self._path(f"vectors-{version}.npy"), all_vectors)
+            with open(self._path(f"documents-{version}.json"), "w") as f:
+                json.dump([{"page_content": doc.page_content, "metadata": doc.metadata} for doc in all_documents], f)
+
+            with open(self._path("CURRENT.tmp"), "w") as current:
+                current.write(version)
+            os.replace(self._path("CURRENT.tmp"), self._path("CURRENT"))
+            self._remove_versions(keep={version, previous})
+            return version
+
+    def _remove_versions(self, keep: Set[Optional[str]]) -> None:
+        # Workers still mapping an unlinked file keep reading it until they remap
+        for name in os.listdir(self.index_dir):
+            prefix, _, rest = name.partition("-")
+            if prefix in ("index", "vectors", "documents") and rest.split(".")[0] not in keep:
+                os.remove(self._path(name))
+
+    async def aadd_documents(self, documents: List[Document]) -> int:
+        """Embed and add documents not stored yet; returns how many were added."""
+        new = []
+        for document in documents:
+            key = _document_key(document)
+            if key not in self._keys:
+                self._keys.add(key)
+                new.append(document)
+        if not new:
+            return 0
+
+        try:
+            vectors = np.asarray(
+                await self.embeddings.aembed_documents([doc.page_content for doc in new]), dtype=np.float32
+            )
+        except Exception:
+            self._keys.difference_update(_document_key(doc) for doc in new)
+            raise
+        self._delta_vectors = vectors if self._delta_vectors is None else np.vstack([self._delta_vectors, vectors])
+        self._delta_documents.extend(new)
+        return len(new)
+
+    async def asimilarity_search(self, query: str, k: int = 4) -> List[Document]:
+        """Return the k documents nearest to the query across the snapshot and the delta."""
+        vector = np.asarray([await self.embeddings.aembed_query(query)], dtype=np.float32)
+        hits: List[Tuple[float, Document]] = []
+
+        index, documents = self._index, self._documents
+        if index is not None and index.ntotal:
+            # Searching a memory-mapped index can fault pages in from disk
+            distances, ids = await asyncio.to_thread(index.search, vector, k)
+            hits.extend((float(d), documents[i]) for d, i in zip(distances[0], ids[0]) if i >= 0)
+
+        if self._delta_documents:
+            distances = ((self._delta_vectors - vector) ** 2).sum(axis=1)
+            hits.extend((float(distances[i]), self._delta_documents[i]) for i in np.argsort(distances)[:k])
+
+        hits.sort(key=lambda hit: hit[0])
+        return [document for _, document in hits[:k]]
+
+    def as_retriever(self, k: int = 4) -> WebRAGRetriever:
+        return WebRAGRetriever(store=self, k=k)
+
+    async def snapshot(self) -> None:
+        """Persist the pending delta, then switch to the latest version on disk."""
+        async with self._lock:
+            count = len(self._delta_documents)
+            if count:
+                version = await asyncio.to_thread(
+                    self._write_snapshot, self._delta_vectors[:count], self._delta_documents[:count]
+                )
+            else:
+                version = self._current_version()
+            if not version:
+                return
+            if version == self._version:
+                # Nothing new was written, as the loaded snapshot already holds these snippets
+                self._drop_delta(count)
+                return
+
+            index, documents, keys = await asyncio.to_thread(self._load, version)
+            # Swap in the new version and drop the merged delta without yielding in between
+            self._drop_delta(count)
+            self._index, self._documents, self._version = index, documents, version
+            self._keys = keys | {_document_key(doc) for doc in self._delta_documents}
+
+    def _drop_delta(self, count: int) -> None:
+        """Drop the first count delta entries, once they are in the snapshot on disk."""
+        if count:
+            self._delta_vectors = self._delta_vectors[count:]
+            self._delta_documents = self._delta_documents[count:]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.snapshot()
+            except Exception:
+                logger.exception("Snapshotting the web RAG index failed")
+
+    async def start(self) -> None:
+        """Map the current snapshot and start periodic snapshotting."""
+        await self.snapshot()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop periodic snapshotting and persist what is still pending."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+        try:
+            await self.snapshot()
+        except Exception:
+            logger.exception("Final snapshot of the web RAG index failed")
+
+
+@lru_cache()
+def get_web_rag_store() -> PersistentFaissStore:
+    """Return the process-wide web-search FAISS store."""
+    settings = get_settings()
+    return PersistentFaissStore(
+        index_dir=settings.WEB_RAG_INDEX_DIR,
+        embeddings=OpenAIEmbeddings(model="text-embedding-ada-002"),
+        snapshot_interval=settings.WEB_RAG_SNAPSHOT_INTERVAL,
+        use_mmap=settings.WEB_RAG_MMAP,
+        ivf_min_vectors=settings.WEB_RAG_IVF_MIN_VECTORS,
+        nprobe=settings.WEB_RAG_NPROBE,
+    )
@@ -0,0 +1,119 @@
+"""
+Background job worker: python -m dudoxx.worker
+
+Runs the jobs the API queues on Redis Streams, with JOB_CONCURRENCY consumers
+per job type. Start as many workers as the load needs; each job is delivered
+to one of them.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+from typing import Dict, List, Tuple
+
+from dudoxx.config import Settings
+from dudoxx.database.pgvector.database import close_pgvector, setup_pgvector
+from dudoxx.services import job_queue_service
+from dudoxx.services.deepgrame_service import DeepgramService
+from dudoxx.services.job_queue_service import Job, JobQueue, get_job_queue
+from dudoxx.services.pdf_conversion_service import get_pdf_conversion_pool
+from dudoxx.services.rag_pgvector_service import RAGService
+from dudoxx.services.redis_service import close_connection_pools
+from dudoxx.services.service_registry import ServiceRegistry
+from dudoxx.services.speech_service import SpeechService
+from dudoxx.services.transcription_service import TranscriptionService
+
+logger = logging.getLogger(__name__)
+
+# Job type -> (service, method called with the job's args)
+JOB_HANDLERS: Dict[str, Tuple[type, str]] = {
+    job_queue_service.INGEST_DOCUMENT: (RAGService, "process_document"),
+    job_queue_service.GENERATE_SPEECH: (SpeechService, "process_speech_generation"),
+    job_queue_service.TRANSCRIBE_AUDIO: (TranscriptionService, "process_audio"),
+    job_queue_service.TRANSCRIBE_DEEPGRAM: (DeepgramService, "process_transcription"),
+}
+
+
+async def _heartbeat(queue: JobQueue, job: Job, consumer: str) -> None:
+    while True:
+        await asyncio.sleep(queue.visibility_timeout / 3)
+        try:
+            await queue.heartbeat(job, consumer)
+        except Exception:
+            # A missed beat only matters if the visibility timeout passes without another one
+            logger.exception(f"Heartbeat of job {job.job_id} failed")
+
+
+async def run_job(queue: JobQueue, services: ServiceRegistry, job: Job, consumer: str) -> None:
+    service_type, method = JOB_HANDLERS[job.type]
+    heartbeat = asyncio.create_task(_heartbeat(queue, job, consumer))
+    try:
+        await getattr(services.get(service_type), method)(**job.args)
+    except Exception as e:
+        retrying = await queue.fail(job, str(e))
+        outcome = "retrying" if retrying else "dead-lettered"
+        logger.exception(f"Job {job.job_id} ({job.type}) failed on attempt {job.attempts}, {outcome}")
+    else:
+        await queue.complete(job)
+    finally:
+        heartbeat.cancel()
+
+
+async def consume(queue: JobQueue, services: ServiceRegistry, job_type: str, consumer: str) -> None:
+    """Run jobs of one type one at a time; the number of these loops bounds the type's concurrency."""
+    while True:
+        try:
+            job = await queue.read(job_type, consumer)
+            if job is not None:
+                await run_job(queue, services, job, consumer)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Redis unavailable and the like; back off instead of spinning
+            logger.exception(f"Reading {job_type} jobs failed")
+            await asyncio.sleep(5)
+
+
+async def promote_retries(queue: JobQueue, interval: float = 1.0) -> None:
+    while True:
+        try:
+            await queue.promote_delayed()
+        except Exception:
+            logger.exception("Promoting delayed jobs failed")
+        await asyncio.sleep(interval)
+
+
+async def main() -> None:
+    settings = Settings()
+    await setup_pgvector()
+    await get_pdf_conversion_pool().start()
+    services = ServiceRegistry()
+    services.start({service_type for service_type, _ in JOB_HANDLERS.values()})
+    queue = get_job_queue()
+
+    name = f"{socket.gethostname()}-{os.getpid()}"
+    tasks: List[asyncio.Task] = [asyncio.create_task(promote_retries(queue))]
+    for job_type in JOB_HANDLERS:
+        await queue.ensure_group(job_type)
+        for i in range(settings.JOB_CONCURRENCY.get(job_type, 1)):
+            tasks.append(asyncio.create_task(consume(queue, services, job_type, f"{name}-{job_type}-{i}")))
+    logger.info(f"Worker {name} running {len(tasks) - 1} consumers")
+
+    # Jobs interrupted by shutdown stay pending and are reclaimed after the visibility timeout
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, lambda: [task.cancel() for task in tasks])
+    try:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        await services.close()
+        await get_pdf_conversion_pool().close()
+        await close_pgvector()
+        await close_connection_pools()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
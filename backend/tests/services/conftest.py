@@ -1,10 +1,12 @@
 import pytest
 import os
 import hashlib
+import fakeredis
 from sqlalchemy.orm import Session
 from contextlib import suppress
 
 from dudoxx.database.sqlite.database import get_db
+from dudoxx.services.redis_service import RedisCacheService, get_codec
 from dudoxx.services.api_key_management_service import APIKeyManagerService
 from dudoxx.exceptions.apikey_exceptions import APIKeyCreationError
 
@@ -14,6 +16,32 @@ def database() -> Session:
     return next(get_db())
 
 
+@pytest.fixture
+def fake_redis_cache() -> RedisCacheService:
+    """A RedisCacheService over an in-memory fake redis that also runs Lua scripts."""
+    cache = RedisCacheService.__new__(RedisCacheService)
+    cache.redis = fakeredis.FakeAsyncRedis()
+    cache.codec = get_codec()
+    cache.namespace = None
+    cache.local = None
+    return cache
+
+
+class FakeEmbeddings:
+    """Embeds a text as [len(text), 1.0] and records every text it was asked to embed."""
+
+    def __init__(self):
+        self.embedded = []
+
+    async def aembed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    async def aembed_query(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), 1.0]
+
+
 def current_test() -> str:
     return os.environ["PYTEST_CURRENT_TEST"]
 
@@ -0,0 +1,63 @@
+import pytest
+
+from dudoxx.services.api_key_cache_service import ApiKeyCache, VerifiedApiKey
+
+
+def verified(api_key, quota_tier="standard"):
+    return VerifiedApiKey(prefix=api_key[:8], quota_tier=quota_tier)
+
+
+def local_cache(local_expire=30.0, max_local_entries=100):
+    # Without a shared secret only the in-process tier is used
+    return ApiKeyCache(
+        redis_cache=None, secret="", expire=300, local_expire=local_expire, max_local_entries=max_local_entries
+    )
+
+
+class TestApiKeyCache:
+    @pytest.mark.asyncio
+    async def test_should_return_prefix_of_verified_key(self):
+        cache = local_cache()
+
+        await cache.set("dud-abcdefgh", verified("dud-abcdefgh"))
+
+        assert await cache.get("dud-abcdefgh") == VerifiedApiKey("dud-abcd", "standard")
+        assert await cache.get("dud-abcdzzzz") is None
+
+    @pytest.mark.asyncio
+    async def test_should_not_hold_keys_in_plain_text(self):
+        cache = local_cache()
+
+        await cache.set("dud-abcdefgh", verified("dud-abcdefgh"))
+
+        assert "dud-abcdefgh" not in cache._local
+        assert cache.fingerprint("dud-abcdefgh") in cache._local
+
+    @pytest.mark.asyncio
+    async def test_should_expire_local_entries(self):
+        cache = local_cache(local_expire=0)
+
+        await cache.set("dud-abcdefgh", verified("dud-abcdefgh"))
+
+        assert await cache.get("dud-abcdefgh") is None
+
+    @pytest.mark.asyncio
+    async def test_should_forget_keys_of_revoked_prefix(self):
+        cache = local_cache()
+        await cache.set("dud-abcdefgh", verified("dud-abcdefgh"))
+        await cache.set("dud-wxyzefgh", verified("dud-wxyzefgh"))
+
+        cache._forget("dud-abcd")
+
+        assert await cache.get("dud-abcdefgh") is None
+        assert (await cache.get("dud-wxyzefgh")).prefix == "dud-wxyz"
+
+    @pytest.mark.asyncio
+    async def test_should_not_cache_a_key_verified_before_a_revocation(self):
+        cache = local_cache()
+        generation = cache.generation()
+
+        cache._forget("dud-abcd")
+        await cache.set("dud-abcdefgh", verified("dud-abcdefgh"), generation)
+
+        assert await cache.get("dud-abcdefgh") is None
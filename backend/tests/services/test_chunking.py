@@ -0,0 +1,82 @@
+import pytest
+
+from dudoxx.pgvector_rag.chunking import CharacterChunker, StructureChunker, TokenChunker, get_chunker
+
+
+class FakeEncoding:
+    """One token per character, enough to check the token windows."""
+
+    def encode(self, text, disallowed_special=()):
+        return [ord(c) for c in text]
+
+    def decode(self, tokens):
+        return "".join(chr(t) for t in tokens)
+
+
+class TestCharacterChunker:
+    def test_should_keep_every_word_within_chunk_size(self):
+        words = [f"word{i}" for i in range(500)]
+        chunks = CharacterChunker(chunk_size=60).chunk(" ".join(words))
+
+        assert all(len(chunk) <= 60 for chunk in chunks)
+        assert " ".join(chunks).split() == words
+
+    def test_should_overlap_on_word_boundaries(self):
+        chunks = CharacterChunker(chunk_size=30, overlap=10).chunk(" ".join(f"w{i:02d}" for i in range(30)))
+
+        for previous, current in zip(chunks, chunks[1:]):
+            assert current.split()[0] in previous.split()
+            assert previous.split()[-1] in current.split()
+
+    def test_should_report_the_page_a_chunk_starts_on(self):
+        chunker = CharacterChunker(chunk_size=20)
+        chunks = [*chunker.feed("alpha beta gamma delta", 1), *chunker.feed("epsilon zeta", 2), *chunker.flush()]
+
+        assert [(chunk.text, chunk.page) for chunk in chunks] == [("alpha beta gamma", 1), ("delta epsilon zeta", 1)]
+
+
+class TestTokenChunker:
+    def test_should_window_tokens_with_overlap(self):
+        chunks = TokenChunker(chunk_size=4, overlap=1, encoding=FakeEncoding()).chunk("abcdefghij")
+
+        assert chunks == ["abcd", "defg", "ghij"]
+
+
+class TestStructureChunker:
+    def test_should_start_a_chunk_at_each_heading(self):
+        chunker = StructureChunker(chunk_size=200)
+        blocks = [
+            ("section_header", "Dosage"),
+            ("text", "One tablet daily."),
+            ("section_header", "Side effects"),
+            ("text", "Nausea."),
+            ("list_item", "Headache."),
+        ]
+        chunks = [chunk.text for chunk in (*chunker.feed_blocks(blocks, 1), *chunker.flush())]
+
+        assert chunks == ["Dosage\n\nOne tablet daily.", "Side effects\n\nNausea.\n\nHeadache."]
+
+    def test_should_keep_overlapping_chunks_within_chunk_size(self):
+        chunker = StructureChunker(chunk_size=50, overlap=20)
+        paragraphs = ["Take with food.", "Avoid alcohol while taking it.", "Store below 25 C.", "Keep from children."]
+        blocks = [("section_header", "Dosage"), *(("text", paragraph) for paragraph in paragraphs * 3)]
+        chunks = [chunk.text for chunk in (*chunker.feed_blocks(blocks, 1), *chunker.flush())]
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 50 for chunk in chunks)
+        assert all(chunk.startswith("Dosage\n\n") for chunk in chunks)
+
+    def test_should_split_headings_longer_than_chunk_size(self):
+        chunker = StructureChunker(chunk_size=40, overlap=10)
+        heading = "Contraindications and warnings for patients with renal or hepatic impairment"
+        blocks = [("section_header", heading), ("text", "Reduce the dose."), ("text", "Monitor levels weekly.")]
+        chunks = [chunk.text for chunk in (*chunker.feed_blocks(blocks, 1), *chunker.flush())]
+
+        assert all(len(chunk) <= 40 for chunk in chunks)
+        assert " ".join(chunks).count("Reduce the dose.") == 1
+        assert "hepatic" in " ".join(chunks)
+
+
+def test_should_reject_unknown_strategy():
+    with pytest.raises(ValueError):
+        get_chunker("sentences", 100)
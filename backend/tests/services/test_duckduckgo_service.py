@@ -1,5 +1,34 @@
-import pytest
+from langchain.schema import Document
 
+from dudoxx.services.duckduckgo_service import SnippetIndex, normalize_query
 
-class Test:
-    pass
+
+def snippets(*texts):
+    return [Document(page_content=text, metadata={"source": f"https://example.com/{text}"}) for text in texts]
+
+
+class TestNormalizeQuery:
+    def test_should_ignore_case_and_whitespace(self):
+        assert normalize_query("  Ibuprofen   DRUG\tinformation ") == "ibuprofen drug information"
+
+
+class TestSnippetIndex:
+    def test_should_return_most_similar_snippets_first(self):
+        index = SnippetIndex.from_embeddings(snippets("a", "b", "c"), [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+
+        results = index.search([0.0, 2.0], k=2)
+
+        assert [doc.page_content for doc in results] == ["b", "c"]
+
+    def test_should_rank_by_direction_not_length(self):
+        index = SnippetIndex.from_embeddings(snippets("long", "aligned"), [[10.0, 1.0], [0.1, 0.1]])
+
+        results = index.search([1.0, 1.0], k=1)
+
+        assert [doc.page_content for doc in results] == ["aligned"]
+
+    def test_should_return_fewer_than_k_when_index_is_small(self):
+        index = SnippetIndex.from_embeddings(snippets("a"), [[1.0, 0.0]])
+
+        assert len(index.search([1.0, 0.0], k=3)) == 1
+        assert SnippetIndex.from_embeddings([], []).search([1.0, 0.0], k=3) == []
@@ -0,0 +1,54 @@
+import pytest
+
+from dudoxx.services.embedding_cache_service import EmbeddingCache, CachedEmbeddings
+from conftest import FakeEmbeddings
+
+
+class FakeRedisCache:
+    def __init__(self):
+        self.values = {}
+
+    async def mget_bytes(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def mset_bytes(self, mapping, expire=3600):
+        self.values.update(mapping)
+
+
+def cached_embeddings(redis_cache, max_local_entries=10):
+    embeddings = CachedEmbeddings.__new__(CachedEmbeddings)
+    embeddings.embeddings = FakeEmbeddings()
+    embeddings.cache = EmbeddingCache("test-model", max_local_entries, 60, redis_cache)
+    return embeddings
+
+
+class TestEmbeddingCache:
+    @pytest.mark.asyncio
+    async def test_should_only_embed_distinct_misses(self):
+        embeddings = cached_embeddings(FakeRedisCache())
+
+        first = await embeddings.aembed_documents(["a", "bb", "a"])
+        second = await embeddings.aembed_documents(["bb", "ccc"])
+
+        assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+        assert second == [[2.0, 1.0], [3.0, 1.0]]
+        assert embeddings.embeddings.embedded == ["a", "bb", "ccc"]
+        assert embeddings.cache.stats()["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_should_fall_back_to_redis_tier(self):
+        redis_cache = FakeRedisCache()
+        await cached_embeddings(redis_cache).aembed_documents(["question"])
+
+        embeddings = cached_embeddings(redis_cache)
+        assert await embeddings.aembed_query("question") == [8.0, 1.0]
+        assert embeddings.embeddings.embedded == []
+        assert embeddings.cache.stats()["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_should_evict_least_recently_used(self):
+        embeddings = cached_embeddings(FakeRedisCache(), max_local_entries=2)
+        await embeddings.aembed_documents(["a", "bb", "ccc"])
+
+        assert embeddings.cache.key("a") not in embeddings.cache._local
+        assert len(embeddings.cache._local) == 2
@@ -0,0 +1,109 @@
+import time
+
+import pytest
+
+from dudoxx.services.job_queue_service import INGEST_DOCUMENT, JobQueue
+
+
+class FakeTaskStatus:
+    def __init__(self):
+        self.statuses = {}
+
+    async def set(self, task_id, status):
+        self.statuses[task_id] = status
+
+
+async def job_queue(redis_cache, max_attempts=3, visibility_timeout=600.0):
+    queue = JobQueue(
+        cache=redis_cache,
+        max_attempts=max_attempts,
+        backoff_base=5.0,
+        backoff_max=300.0,
+        visibility_timeout=visibility_timeout,
+    )
+    queue.task_status = FakeTaskStatus()
+    await queue.ensure_group(INGEST_DOCUMENT)
+    return queue
+
+
+async def make_due(queue, job_type=INGEST_DOCUMENT):
+    delayed = queue.delayed(job_type)
+    for member in await queue.redis.zrange(delayed, 0, -1):
+        await queue.redis.zadd(delayed, {member: time.time() - 1})
+
+
+class TestJobQueue:
+    @pytest.mark.asyncio
+    async def test_should_deliver_job_once_and_remove_it_when_complete(self, fake_redis_cache):
+        queue = await job_queue(fake_redis_cache)
+        await queue.enqueue(INGEST_DOCUMENT, {"doc": 1}, task_id="task", pending_status={"status": "pending"})
+
+        job = await queue.read(INGEST_DOCUMENT, "first", block_ms=10)
+        assert await queue.read(INGEST_DOCUMENT, "second", block_ms=10) is None
+        await queue.complete(job)
+
+        assert job.args == {"doc": 1}
+        assert queue.task_status.statuses["task"] == {"status": "pending"}
+        assert await queue.redis.xlen(queue.stream(INGEST_DOCUMENT)) == 0
+
+    @pytest.mark.asyncio
+    async def test_should_retry_failed_job_after_backoff(self, fake_redis_cache):
+        queue = await job_queue(fake_redis_cache)
+        await queue.enqueue(INGEST_DOCUMENT, {}, task_id="task", pending_status={"status": "pending"})
+        job = await queue.read(INGEST_DOCUMENT, "worker", block_ms=10)
+
+        assert await queue.fail(job, "boom")
+        assert await queue.promote_delayed() == 0
+        (member, due), *_ = await queue.redis.zrange(queue.delayed(INGEST_DOCUMENT), 0, -1, withscores=True)
+        assert 4 < due - time.time() <= 5
+        assert queue.task_status.statuses["task"] == {"status": "pending", "attempt": 2, "error": "boom"}
+
+        await make_due(queue)
+        assert await queue.promote_delayed() == 1
+        retried = await queue.read(INGEST_DOCUMENT, "worker", block_ms=10)
+        assert (retried.job_id, retried.attempts) == (job.job_id, 1)
+
+    @pytest.mark.asyncio
+    async def test_should_dead_letter_after_max_attempts(self, fake_redis_cache, tmp_path):
+        queue = await job_queue(fake_redis_cache)
+        upload = tmp_path / "upload.pdf"
+        upload.write_bytes(b"%PDF")
+        await queue.enqueue(
+            INGEST_DOCUMENT, {}, task_id="task", failed_status={"status": "failed"}, files=[str(upload)]
+        )
+
+        for attempt in range(3):
+            job = await queue.read(INGEST_DOCUMENT, "worker", block_ms=10)
+            retrying = await queue.fail(job, f"error {attempt}")
+            await make_due(queue)
+            await queue.promote_delayed()
+
+        assert not retrying
+        assert await queue.read(INGEST_DOCUMENT, "worker", block_ms=10) is None
+        dead = await queue.redis.xrange(queue.dead_letter_stream(INGEST_DOCUMENT))
+        assert [fields[b"error"] for _, fields in dead] == [b"error 2"]
+        assert queue.task_status.statuses["task"] == {"status": "failed", "error": "error 2"}
+        assert not upload.exists()
+
+    @pytest.mark.asyncio
+    async def test_should_reclaim_job_of_a_dead_worker(self, fake_redis_cache):
+        queue = await job_queue(fake_redis_cache, visibility_timeout=0.0)
+        await queue.enqueue(INGEST_DOCUMENT, {"doc": 1})
+
+        abandoned = await queue.read(INGEST_DOCUMENT, "dead-worker", block_ms=10)
+        reclaimed = await queue.read(INGEST_DOCUMENT, "live-worker", block_ms=10)
+
+        assert reclaimed.message_id == abandoned.message_id
+        assert reclaimed.attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_should_dead_letter_job_that_keeps_killing_workers(self, fake_redis_cache):
+        queue = await job_queue(fake_redis_cache, max_attempts=2, visibility_timeout=0.0)
+        await queue.enqueue(INGEST_DOCUMENT, {})
+
+        await queue.read(INGEST_DOCUMENT, "first", block_ms=10)
+        await queue.read(INGEST_DOCUMENT, "second", block_ms=10)
+
+        assert await queue.read(INGEST_DOCUMENT, "third", block_ms=10) is None
+        dead = await queue.redis.xrange(queue.dead_letter_stream(INGEST_DOCUMENT))
+        assert [fields[b"error"] for _, fields in dead] == [b"visibility timeout exceeded"]
@@ -0,0 +1,47 @@
+import pytest
+from langchain.schema import Document
+
+from dudoxx.services.rag_pgvector_service import RAGService
+
+
+class FakeRAGSystem:
+    """Answers from the documents of the context it is asked about, like the retriever does."""
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.queried_contexts = []
+
+    async def query(self, question, context_id=None, search_kwargs=None):
+        self.queried_contexts.append(context_id)
+        documents = [doc for doc in self.documents if doc.metadata["context_id"] == context_id]
+        return {"answer": " ".join(doc.page_content for doc in documents), "source_documents": documents}
+
+
+def document(text, context_id):
+    return Document(page_content=text, metadata={"source": f"{context_id}.pdf", "context_id": context_id})
+
+
+def rag_service(rag_system):
+    # Shared across requests like the app's instance, so it has no default context
+    service = RAGService.__new__(RAGService)
+    service.rag_system = rag_system
+
+    async def no_cached_answer(question, context_id):
+        return None, None
+
+    service._lookup_answer = no_cached_answer
+    return service
+
+
+class TestGetAnswer:
+    @pytest.mark.asyncio
+    async def test_should_only_retrieve_from_the_requested_context(self):
+        rag_system = FakeRAGSystem([document("tenant a notes", "context-a"), document("tenant b notes", "context-b")])
+        service = rag_service(rag_system)
+
+        answer_a = await service.get_answer("notes?", context_id="context-a")
+        answer_b = await service.get_answer("notes?", context_id="context-b")
+
+        assert rag_system.queried_contexts == ["context-a", "context-b"]
+        assert answer_a.sources == ["context-a.pdf"] and answer_a.answer == "tenant a notes"
+        assert answer_b.sources == ["context-b.pdf"] and answer_b.answer == "tenant b notes"
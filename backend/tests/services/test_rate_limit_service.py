@@ -0,0 +1,126 @@
+import pytest
+from fastapi import HTTPException, Response
+from starlette.requests import Request
+
+from dudoxx.services import rate_limit_service
+from dudoxx.services.api_key_cache_service import VerifiedApiKey
+from dudoxx.services.rate_limit_service import RateLimiter, RateLimitStore
+
+
+def request(api_key=None, path="/rag/question"):
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [],
+        "query_string": b"",
+        "client": ("10.0.0.1", 1234),
+        "state": {"api_key": api_key} if api_key else {},
+    }
+    return Request(scope)
+
+
+@pytest.fixture
+def store(fake_redis_cache, monkeypatch):
+    limit_store = RateLimitStore(fake_redis_cache, local_share=0.1)
+    monkeypatch.setattr(rate_limit_service, "get_rate_limit_store", lambda: limit_store)
+    return limit_store
+
+
+async def redis_count(store):
+    keys = await store.redis_cache.redis.keys("ratelimit:*")
+    return sum([int(await store.redis_cache.redis.get(key)) for key in keys])
+
+
+class TestRateLimitStore:
+    @pytest.mark.asyncio
+    async def test_should_lease_tokens_for_small_limits(self, store):
+        first = await store.hit("key", 5, 60)
+        second = await store.hit("key", 5, 60)
+
+        assert (first.allowed, second.allowed) == (True, True)
+        assert (first.remaining, second.remaining) == (4, 3)
+        assert await redis_count(store) == 2
+        assert store._leases["key"].tokens == 0
+
+    @pytest.mark.asyncio
+    async def test_should_never_exceed_limit_across_processes(self, store, fake_redis_cache):
+        other = RateLimitStore(fake_redis_cache, local_share=0.1)
+
+        results = [await limit_store.hit("key", 5, 60) for limit_store in [store, other] * 4]
+
+        assert sum(result.allowed for result in results) == 5
+        assert await redis_count(store) == 5
+        assert results[-1].remaining == 0
+
+    @pytest.mark.asyncio
+    async def test_should_limit_keys_independently(self, store):
+        for _ in range(3):
+            await store.hit("first", 3, 60)
+
+        assert not (await store.hit("first", 3, 60)).allowed
+        assert (await store.hit("second", 3, 60)).allowed
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_should_set_rate_limit_headers(self, store):
+        response = Response()
+
+        await RateLimiter(times=5, seconds=60)(request(), response)
+
+        assert response.headers["X-RateLimit-Limit"] == "5"
+        assert response.headers["X-RateLimit-Remaining"] == "4"
+        assert 0 < int(response.headers["X-RateLimit-Reset"]) <= 60
+
+    @pytest.mark.asyncio
+    async def test_should_answer_429_over_the_limit(self, store):
+        limiter = RateLimiter(times=2, seconds=60)
+        for _ in range(2):
+            await limiter(request(), Response())
+
+        with pytest.raises(HTTPException) as error:
+            await limiter(request(), Response())
+
+        assert error.value.status_code == 429
+        assert error.value.headers["X-RateLimit-Remaining"] == "0"
+        assert int(error.value.headers["Retry-After"]) > 0
+
+    @pytest.mark.asyncio
+    async def test_should_scale_limit_by_quota_tier(self, store):
+        response = Response()
+
+        await RateLimiter(times=5, seconds=60)(request(VerifiedApiKey("dud-abcd", "premium")), response)
+
+        assert response.headers["X-RateLimit-Limit"] == "50"
+
+    @pytest.mark.asyncio
+    async def test_should_not_limit_unlimited_tier(self, store):
+        limiter = RateLimiter(times=1, seconds=60)
+        for _ in range(3):
+            response = Response()
+            await limiter(request(VerifiedApiKey("dud-abcd", "unlimited")), response)
+
+        assert "X-RateLimit-Limit" not in response.headers
+        assert await redis_count(store) == 0
+
+    @pytest.mark.asyncio
+    async def test_should_limit_each_api_key_separately(self, store):
+        limiter = RateLimiter(times=1, seconds=60)
+        await limiter(request(VerifiedApiKey("dud-abcd", "standard")), Response())
+
+        await limiter(request(VerifiedApiKey("dud-wxyz", "standard")), Response())
+        with pytest.raises(HTTPException):
+            await limiter(request(VerifiedApiKey("dud-abcd", "standard")), Response())
+
+    @pytest.mark.asyncio
+    async def test_should_allow_requests_when_redis_fails(self, store, monkeypatch):
+        async def unavailable(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        monkeypatch.setattr(store, "hit", unavailable)
+        response = Response()
+
+        await RateLimiter(times=1, seconds=60)(request(), response)
+
+        assert "X-RateLimit-Limit" not in response.headers
@@ -0,0 +1,83 @@
+import json
+
+from dudoxx.services.redis_service import LocalCacheTier, RedisCodec
+
+
+class TestRedisCodec:
+    def test_should_round_trip_values(self):
+        codec = RedisCodec(serializer="orjson", compression_threshold=1024, compression_level=3)
+        value = {"status": "Processing", "progress": 40, "items": [1.5, None, "x"]}
+
+        assert codec.decode(codec.encode(value)) == value
+
+    def test_should_read_plain_json_written_before_the_header(self):
+        codec = RedisCodec(serializer="orjson", compression_threshold=1024, compression_level=3)
+
+        assert codec.decode(json.dumps({"status": "completed"}).encode()) == {"status": "completed"}
+        assert codec.decode(b" [1, 2]") == [1, 2]
+
+    def test_should_compress_large_values(self):
+        codec = RedisCodec(serializer="orjson", compression_threshold=64, compression_level=3)
+        value = {"summary": "ibuprofen " * 200}
+
+        encoded = codec.encode(value)
+
+        assert codec.decode(encoded) == value
+        assert len(encoded) < len(json.dumps(value))
+
+    def test_should_read_values_of_processes_using_the_other_serializer(self):
+        msgpack_codec = RedisCodec(serializer="msgpack", compression_threshold=64, compression_level=3)
+        orjson_codec = RedisCodec(serializer="orjson", compression_threshold=0, compression_level=3)
+        small, large = {"status": "completed"}, {"summary": "ibuprofen " * 200}
+
+        assert orjson_codec.decode(msgpack_codec.encode(small)) == small
+        assert orjson_codec.decode(msgpack_codec.encode(large)) == large
+        assert msgpack_codec.decode(orjson_codec.encode(large)) == large
+
+
+def subscribed_tier(max_bytes=1024 * 1024, ttl=10.0):
+    tier = LocalCacheTier(redis_url="redis://localhost:6379", enabled=True, max_bytes=max_bytes, ttl=ttl)
+    # As once the invalidation listener has subscribed
+    tier.subscribed = True
+    return tier
+
+
+class TestLocalCacheTier:
+    def test_should_serve_stored_values_and_count_hits_per_namespace(self):
+        tier = subscribed_tier()
+
+        assert tier.lookup("task_status", "task-1") is None
+        tier.store("task-1", b"value", tier.epoch)
+
+        assert tier.lookup("task_status", "task-1") == b"value"
+        assert tier.snapshot()["namespaces"]["task_status"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+    def test_should_drop_invalidated_keys_and_reads_that_raced_them(self):
+        tier = subscribed_tier()
+        tier.store("task-1", b"old", tier.epoch)
+        epoch = tier.epoch
+
+        tier.invalidate("task-1")
+        tier.store("task-1", b"old", epoch)
+
+        assert tier.lookup("task_status", "task-1") is None
+
+    def test_should_evict_least_recently_used_entries_over_the_budget(self):
+        tier = subscribed_tier(max_bytes=3 * (300 + 200 + 5))
+        for key in ("key-1", "key-2", "key-3"):
+            tier.store(key, b"x" * 300, tier.epoch)
+        tier.lookup("drug_info", "key-1")
+
+        tier.store("key-4", b"x" * 300, tier.epoch)
+
+        assert tier.lookup("drug_info", "key-2") is None
+        assert tier.lookup("drug_info", "key-1") is not None
+        assert tier.bytes <= tier.max_bytes
+
+    def test_should_not_serve_entries_while_unsubscribed(self):
+        tier = subscribed_tier()
+        tier.store("task-1", b"value", tier.epoch)
+
+        tier.subscribed = False
+
+        assert tier.lookup("task_status", "task-1") is None
@@ -0,0 +1,66 @@
+import pytest
+
+from dudoxx.services.semantic_cache_service import SemanticAnswerCache, bump_context_version, get_context_version
+
+
+def answer_cache(redis_cache, scan_entries=4, threshold=0.95):
+    return SemanticAnswerCache(threshold=threshold, expire=60, scan_entries=scan_entries, cache=redis_cache)
+
+
+class TestSemanticAnswerCache:
+    @pytest.mark.asyncio
+    async def test_should_return_answer_of_similar_question(self, fake_redis_cache):
+        cache = answer_cache(fake_redis_cache)
+
+        await cache.store("ctx", 0, "what is rag?", [1.0, 0.0], {"answer": "retrieval"})
+
+        assert await cache.lookup("ctx", 0, [0.99, 0.05]) == {"answer": "retrieval"}
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_should_miss_below_threshold(self, fake_redis_cache):
+        cache = answer_cache(fake_redis_cache)
+
+        await cache.store("ctx", 0, "what is rag?", [1.0, 0.0], {"answer": "retrieval"})
+
+        assert await cache.lookup("ctx", 0, [0.5, 0.5]) is None
+        assert await cache.lookup("other", 0, [1.0, 0.0]) is None
+        assert cache.stats()["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_should_not_return_answers_of_older_context_version(self, fake_redis_cache):
+        cache = answer_cache(fake_redis_cache)
+        version = await get_context_version(fake_redis_cache, "ctx")
+        await cache.store("ctx", version, "what is rag?", [1.0, 0.0], {"answer": "retrieval"})
+
+        await bump_context_version(fake_redis_cache, "ctx")
+
+        assert await get_context_version(fake_redis_cache, "ctx") == version + 1
+        assert await cache.lookup("ctx", version + 1, [1.0, 0.0]) is None
+
+    @pytest.mark.asyncio
+    async def test_should_evict_oldest_question_from_every_key(self, fake_redis_cache):
+        cache = answer_cache(fake_redis_cache, scan_entries=2)
+        vectors_key, answers_key, recent_key = cache._keys("ctx", 0)
+
+        await cache.store("ctx", 0, "first", [1.0, 0.0], {"answer": 1})
+        await cache.store("ctx", 0, "second", [0.0, 1.0], {"answer": 2})
+        await cache.store("ctx", 0, "third", [-1.0, 0.0], {"answer": 3})
+
+        assert await fake_redis_cache.redis.llen(recent_key) == 2
+        assert await fake_redis_cache.redis.hlen(vectors_key) == 2
+        assert await fake_redis_cache.redis.hlen(answers_key) == 2
+        assert await cache.lookup("ctx", 0, [1.0, 0.0]) is None
+        assert await cache.lookup("ctx", 0, [-1.0, 0.0]) == {"answer": 3}
+
+    @pytest.mark.asyncio
+    async def test_should_keep_one_list_entry_per_question(self, fake_redis_cache):
+        cache = answer_cache(fake_redis_cache, scan_entries=2)
+        _, _, recent_key = cache._keys("ctx", 0)
+
+        await cache.store("ctx", 0, "first", [1.0, 0.0], {"answer": 1})
+        await cache.store("ctx", 0, "second", [0.0, 1.0], {"answer": 2})
+        await cache.store("ctx", 0, "first", [1.0, 0.0], {"answer": 1})
+
+        assert await fake_redis_cache.redis.llen(recent_key) == 2
+        assert await cache.lookup("ctx", 0, [0.0, 1.0]) == {"answer": 2}
@@ -0,0 +1,89 @@
+import asyncio
+import time
+
+import pytest
+
+from dudoxx.services.single_flight_cache_service import SingleFlightCache
+
+
+def single_flight(redis_cache, soft_ttl=60.0):
+    return SingleFlightCache(redis_cache, soft_ttl=soft_ttl, hard_ttl=600, lock_ttl=10.0, wait_timeout=5.0)
+
+
+class Computation:
+    """Counts its calls and returns value once released, or raises error."""
+
+    def __init__(self, value=None, error=None):
+        self.value = value
+        self.error = error
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class TestSingleFlightCache:
+    @pytest.mark.asyncio
+    async def test_should_compute_once_for_concurrent_requests_of_all_workers(self, fake_redis_cache):
+        # Two caches over one Redis stand for two worker processes
+        workers = [single_flight(fake_redis_cache), single_flight(fake_redis_cache)]
+        compute = Computation(value={"drug": "ibuprofen"})
+
+        requests = [asyncio.create_task(worker.get_or_compute("drug:ibuprofen", compute)) for worker in workers * 3]
+        await asyncio.sleep(0.05)
+        compute.release.set()
+
+        assert await asyncio.gather(*requests) == [{"drug": "ibuprofen"}] * 6
+        assert compute.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_should_let_a_waiter_compute_after_the_leader_fails(self, fake_redis_cache):
+        leader, waiter = single_flight(fake_redis_cache), single_flight(fake_redis_cache)
+        failing = Computation(error=RuntimeError("upstream down"))
+        working = Computation(value="value")
+        working.release.set()
+
+        leading = asyncio.create_task(leader.get_or_compute("key", failing))
+        await asyncio.sleep(0.05)
+        waiting = asyncio.create_task(waiter.get_or_compute("key", working))
+        await asyncio.sleep(0.05)
+        failing.release.set()
+
+        with pytest.raises(RuntimeError):
+            await leading
+        assert await waiting == "value"
+        assert (failing.calls, working.calls) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_should_serve_stale_value_while_one_worker_refreshes(self, fake_redis_cache):
+        workers = [single_flight(fake_redis_cache, soft_ttl=0.0), single_flight(fake_redis_cache, soft_ttl=0.0)]
+        await fake_redis_cache.set("key", {"value": "stale", "fresh_until": time.time() - 1}, expire=600)
+        compute = Computation(value="fresh")
+
+        served = [await worker.get_or_compute("key", compute) for worker in workers]
+        await asyncio.sleep(0.05)
+        compute.release.set()
+        await asyncio.gather(*[refresh for worker in workers for refresh in worker._refreshes])
+
+        assert served == ["stale", "stale"]
+        assert compute.calls == 1
+        assert (await fake_redis_cache.get("key"))["value"] == "fresh"
+
+    @pytest.mark.asyncio
+    async def test_should_peek_fresh_values_only(self, fake_redis_cache):
+        cache = single_flight(fake_redis_cache)
+        now = time.time()
+        await fake_redis_cache.mset(
+            {
+                "fresh": {"value": 1, "fresh_until": now + 60},
+                "stale": {"value": 2, "fresh_until": now - 1},
+                "legacy": {"drug": "ibuprofen"},
+            }
+        )
+
+        assert await cache.peek_many(["fresh", "stale", "legacy", "missing"]) == [1, None, None, None]
@@ -0,0 +1,54 @@
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+
+from dudoxx.exceptions.upload_exceptions import UploadTooLargeError
+from dudoxx.services.upload_service import UploadLimitMiddleware, save_upload
+
+
+class TestSaveUpload:
+    @pytest.mark.asyncio
+    async def test_should_stream_to_disk_and_hash(self, tmp_path):
+        content = b"%PDF-1.4 " * 1000
+        upload = UploadFile(io.BytesIO(content), filename="../report.pdf")
+
+        stored = await save_upload(upload, str(tmp_path), max_bytes=len(content), chunk_size=1024)
+
+        assert stored.sha256 == hashlib.sha256(content).hexdigest()
+        assert stored.size == len(content)
+        assert os.path.dirname(stored.path) == str(tmp_path)
+        assert stored.path.endswith("_report.pdf")
+        with open(stored.path, "rb") as f:
+            assert f.read() == content
+
+    @pytest.mark.asyncio
+    async def test_should_reject_and_remove_oversized_upload(self, tmp_path):
+        upload = UploadFile(io.BytesIO(b"x" * 5000), filename="audio.wav")
+
+        with pytest.raises(UploadTooLargeError):
+            await save_upload(upload, str(tmp_path), max_bytes=4096, chunk_size=1024)
+
+        assert os.listdir(tmp_path) == []
+
+
+class TestUploadLimitMiddleware:
+    @pytest.mark.asyncio
+    async def test_should_reject_non_numeric_content_length(self):
+        async def app(scope, receive, send):
+            raise AssertionError("the request should not reach the app")
+
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "path": "/upload", "headers": [(b"content-length", b"abc")]}
+        await UploadLimitMiddleware(app, {"/upload": 100})(scope, receive, send)
+
+        assert sent[0]["status"] == 400
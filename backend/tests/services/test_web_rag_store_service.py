@@ -0,0 +1,74 @@
+import pytest
+from langchain.schema import Document
+
+from dudoxx.services.web_rag_store_service import PersistentFaissStore
+from conftest import FakeEmbeddings
+
+
+def store(tmp_path):
+    return PersistentFaissStore(str(tmp_path), FakeEmbeddings(), snapshot_interval=60, use_mmap=False)
+
+
+def snippet(text):
+    return Document(page_content=text, metadata={"source": f"https://example.com/{text}"})
+
+
+class TestPersistentFaissStore:
+    @pytest.mark.asyncio
+    async def test_should_search_delta_before_snapshot(self, tmp_path):
+        web_store = store(tmp_path)
+
+        await web_store.aadd_documents([snippet("a"), snippet("bbbb")])
+        results = await web_store.asimilarity_search("bbb", k=1)
+
+        assert [doc.page_content for doc in results] == ["bbbb"]
+
+    @pytest.mark.asyncio
+    async def test_should_skip_documents_already_stored(self, tmp_path):
+        web_store = store(tmp_path)
+
+        added = await web_store.aadd_documents([snippet("a"), snippet("a")])
+        await web_store.snapshot()
+        added_again = await web_store.aadd_documents([snippet("a")])
+
+        assert (added, added_again) == (1, 0)
+        assert web_store.embeddings.embedded == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_should_load_snapshot_in_another_process(self, tmp_path):
+        writer, reader = store(tmp_path), store(tmp_path)
+
+        await writer.aadd_documents([snippet("a"), snippet("bbbb")])
+        await writer.snapshot()
+        await reader.start()
+        await reader.close()
+
+        results = await reader.asimilarity_search("bbb", k=2)
+        assert [doc.page_content for doc in results] == ["bbbb", "a"]
+        assert results[0].metadata == {"source": "https://example.com/bbbb"}
+
+    @pytest.mark.asyncio
+    async def test_should_merge_snapshots_of_several_writers(self, tmp_path):
+        first, second = store(tmp_path), store(tmp_path)
+
+        await first.aadd_documents([snippet("a")])
+        await second.aadd_documents([snippet("bb"), snippet("a")])
+        await first.snapshot()
+        await second.snapshot()
+
+        assert [doc.page_content for doc in second._documents] == ["a", "bb"]
+        assert second._delta_documents == []
+
+    @pytest.mark.asyncio
+    async def test_should_drop_delta_already_in_the_loaded_snapshot(self, tmp_path):
+        first, second = store(tmp_path), store(tmp_path)
+        await second.aadd_documents([snippet("a")])
+        await first.aadd_documents([snippet("a")])
+        await first.snapshot()
+        # As if second had loaded that version while its own write was in flight
+        second._version = second._current_version()
+
+        await second.snapshot()
+
+        assert second._delta_documents == []
+        assert len(second._delta_vectors) == 0
@@ -215,26 +215,18 @@ function checkSpeechStatus(taskId) {
   statusDiv.style.display = "block";
   const apiKeyInputvoice = document.getElementById("apiKeyInputvoice");
 
-  fetch(`${url}api/v1/speech_status/${taskId}`, {
-    method: "GET",
-    headers: {
-      Accept: "application/json",
-      "X-API-Key": apiKeyInputvoice.value,
-    },
-  })
-    .then(handleErrors)
-    .then((response) => response.json())
-    .then((data) => {
-      console.log("Speech status:", data);
-      statusDiv.innerHTML = `<p> Progress: ${data.progress}%</p>
+  watchTaskEvents(`${url}api/v1`, taskId, apiKeyInputvoice.value, (data) => {
+    console.log("Speech status:", data);
+    statusDiv.innerHTML = `<p> Progress: ${data.progress}%</p>
       <p><strong>Status :</strong> ${data.status} </p>
       `;
-
+  })
+    .then((data) => {
       if (data.status === "completed") {
         swal("Success", "Speech generation completed successfully!", "success");
         downloadAudioFile(taskId);
       } else {
-        setTimeout(() => checkSpeechStatus(taskId), 3000);
+        swal("Error", `Speech generation failed. ${data.error || ""}`, "error");
       }
     })
     .catch((error) => {
@@ -396,16 +388,11 @@ function checkTaskStatus(taskId) {
   translationResultDiv.style.display = "block";
   const apiKeyInputaudio = document.getElementById("apiKeyInputaudio");
 
-  fetch(`${url}api/v1/task_status/${taskId}`, {
-    method: "GET",
-    headers: {
-      "X-API-Key": apiKeyInputaudio.value,
-    },
+  watchTaskEvents(`${url}api/v1`, taskId, apiKeyInputaudio.value, (data) => {
+    taskStatusDiv.innerHTML = `<p><strong>Status:</strong> ${data.status}</p>`;
   })
-    .then(handleErrors)
-    .then((response) => response.json())
     .then((data) => {
-      // Check if the task is completed and display the results
+      // The completed status carries the results
       if (data.transcription != undefined) {
         swal("Success", "Audio translation completed successfully!", "success");
         taskStatusDiv.innerHTML = `
@@ -417,8 +404,7 @@ function checkTaskStatus(taskId) {
       <p><strong>Translation:</strong> ${data.translation}</p>
     `;
       } else {
-        // Continue polling until the task is completed
-        setTimeout(() => checkTaskStatus(taskId), 3000);
+        swal("Error", `Audio translation failed. ${data.error || ""}`, "error");
       }
     })
     .catch((error) => {
@@ -0,0 +1,55 @@
+// Follows a background task's progress from GET /api/v1/tasks/{taskId}/events.
+// EventSource cannot send the X-API-Key header, so the stream is read with fetch
+// and parsed here. Calls onStatus(status) for every update and resolves with the
+// final status once the task completes or fails.
+async function watchTaskEvents(apiBaseUrl, taskId, apiKey, onStatus) {
+  const response = await fetch(`${apiBaseUrl}/tasks/${taskId}/events`, {
+    headers: {
+      Accept: "text/event-stream",
+      "X-API-Key": apiKey,
+    },
+  });
+  if (!response.ok) {
+    if (response.status === 429) {
+      throw new Error("Too many requests. Please try again later.");
+    }
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let last = null;
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+
+      let event = "message";
+      const data = [];
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event:")) event = line.slice(6).trim();
+        else if (line.startsWith("data:")) data.push(line.slice(5).trim());
+      }
+
+      if (event === "status") {
+        last = JSON.parse(data.join("\n"));
+        onStatus(last);
+      } else if (event === "error") {
+        throw new Error(JSON.parse(data.join("\n")).detail || "Task failed");
+      }
+    }
+  }
+
+  if (last === null) {
+    throw new Error("Task stream closed without a status");
+  }
+  return last;
+}